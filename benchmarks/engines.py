@@ -0,0 +1,113 @@
+"""Parity check and timing of the merge engines (pandas vs polars).
+
+Merges the same input with every engine and compares the results: the merged
+DataFrames must be identical (values, dtypes, column order) and so must the
+quality profiles, apart from stage timings. Without an input folder, a messy
+synthetic export set is generated (blank and whitespace URLs, Unicode
+whitespace, mixed-case sources, owned handles written as @Handle.Name, text
+engagement values, mixed date formats, keyword lists with empty items).
+
+    python benchmarks/engines.py                     # synthetic, 200,000 rows
+    python benchmarks/engines.py --rows 2000000
+    python benchmarks/engines.py path/to/raw_data --engines pandas,polars
+
+Exits 1 when an engine's result differs from the first engine's.
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd  # noqa: E402
+
+from src.constants import BRAND_JSON_FILENAME, OWNED_ACCOUNTS  # noqa: E402
+from src.quarterly_csv_merger import merge_data  # noqa: E402
+from src.quarterly_csv_merger.engines import ENGINES  # noqa: E402
+
+
+def write_synthetic(folder: Path, rows: int, seed: int = 0) -> None:
+    """Write messy exports of about rows rows in total (one per country keyword)."""
+    rng = random.Random(seed)
+    with open(ROOT / BRAND_JSON_FILENAME, encoding="utf-8") as f:
+        aliases = [a for brand, kws in json.load(f).items() for a in [brand, *kws]][:200]
+    names = ["ID_x", "sg brand", " th-foo", "MY", "xid_", "", "foo,MY bar", "id　x", "\x1cTH_a", "Brand ID-x"]
+    urls = ["http://x/{}", "", "  ", "　", "\x1f", "https://y/{}?utm=1"]
+    sources = ["facebook.com", "Instagram", "TWITTER", "", "news site", "blog", "  Twitter  ", "NEWS"]
+    handles = ["@" + OWNED_ACCOUNTS[0].upper(), OWNED_ACCOUNTS[1], " ajaib.INVESTASI ", "someone", "", "@@x"]
+    dates = ["01-Jan-2024 09:15AM", "2024-02-03 10:00:00", "", "not a date", "03/04/2024", "15-Mar-2024"]
+    likes = ["1", "2", "", "7"]
+    shares = [" 12 ", "1e3", "abc", "", "3", "-2"]
+    for code in ("ID", "SG", "TH", "MY"):
+        n = rows // 4
+        df = pd.DataFrame(
+            {
+                "Date": [rng.choice(dates) for _ in range(n)],
+                "Headline": [f"h{i}\nline" for i in range(n)],
+                "URL": [rng.choice(urls).format(i) for i in range(n)],
+                "Source": [rng.choice(sources) for _ in range(n)],
+                "Influencer": [rng.choice(handles) for _ in range(n)],
+                "Input Name": [rng.choice(names) for _ in range(n)],
+                "Keywords": [
+                    ",".join(rng.choice(aliases + ["", " ", "nothing"]) for _ in range(rng.randint(0, 3)))
+                    for _ in range(n)
+                ],
+                "Reach": [rng.randint(0, 10_000) for _ in range(n)],
+                "likes": [rng.choice(likes) for _ in range(n)],
+                "shares": [rng.choice(shares) for _ in range(n)],
+            }
+        )
+        df.to_csv(folder / f"{code}_synthetic.csv", index=False)
+
+
+def _comparable(profile: dict) -> dict:
+    """Quality profile without timings."""
+    profile = json.loads(json.dumps(profile))
+    for stage in profile.get("stages", []):
+        stage.pop("seconds", None)
+    return profile
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check that the merge engines give identical results and time them.")
+    parser.add_argument("input", nargs="?", help="Input file or folder (default: synthetic exports)")
+    parser.add_argument("--rows", type=int, default=200_000, help="Synthetic rows in total (default: 200,000)")
+    parser.add_argument("--engines", default=",".join(ENGINES), help=f"Comma-separated engines (default: {','.join(ENGINES)})")
+    args = parser.parse_args()
+
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = args.input
+        if input_path is None:
+            write_synthetic(Path(tmp), args.rows)
+            input_path = tmp
+        reference = None
+        failed = False
+        for engine in engines:
+            started = time.perf_counter()
+            df = merge_data(input_path, base_dir=str(ROOT), profile=True, engine=engine)
+            seconds = time.perf_counter() - started
+            status = "reference"
+            if reference is None:
+                reference = df
+            else:
+                try:
+                    pd.testing.assert_frame_equal(reference, df)
+                    if _comparable(reference.attrs.get("quality", {})) != _comparable(df.attrs.get("quality", {})):
+                        raise AssertionError("quality profiles differ")
+                    status = "identical"
+                except AssertionError as e:
+                    failed = True
+                    status = f"DIFFERS: {str(e).splitlines()[0]}"
+            print(f"{engine:8} {seconds:8.2f} s  {len(df):>10,} rows  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Timing of the pipelined ingest against a sequential read-then-parse loop.
+
+Runs process_file over the same sources one after another, then through
+ingest.pipelined_ingest (read-ahead threads plus concurrent parsing), and checks
+that both give identical frames. Without an input folder, copies of the messy
+synthetic exports of benchmarks/engines.py are generated. --cold drops the input
+files from the page cache before each run, so reads come from disk.
+
+    python benchmarks/ingest.py                         # synthetic, 4 x 50,000 rows x 2 copies
+    python benchmarks/ingest.py --rows 200000 --copies 6 --cold
+    python benchmarks/ingest.py path/to/raw_data --repeat 3
+
+Parsing side by side only pays off with more than one core; on one core the
+pipeline can at best hide read time behind parsing.
+Exits 1 when the pipelined frames differ from the sequential ones.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd  # noqa: E402
+
+from engines import write_synthetic  # noqa: E402
+from src.constants import BRAND_JSON_FILENAME  # noqa: E402
+from src.quarterly_csv_merger.ingest import pipelined_ingest, process_file  # noqa: E402
+from src.quarterly_csv_merger.pipeline import resolve_input_files  # noqa: E402
+
+
+def _drop_page_cache(files: list) -> None:
+    """Evict local input files from the page cache (Linux; other sources are left alone)."""
+    for path in files:
+        if not isinstance(path, (str, Path)):
+            continue
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time pipelined against sequential ingest and check they agree.")
+    parser.add_argument("input", nargs="?", help="Input file or folder (default: synthetic exports)")
+    parser.add_argument("--rows", type=int, default=200_000, help="Synthetic rows per copy (default: 200,000)")
+    parser.add_argument("--copies", type=int, default=2, help="Synthetic export sets, 4 files each (default: 2)")
+    parser.add_argument("--repeat", type=int, default=2, help="Runs of each mode, alternating (default: 2)")
+    parser.add_argument("--cold", action="store_true", help="Drop the inputs from the page cache before each run")
+    args = parser.parse_args()
+    if args.cold and not hasattr(os, "posix_fadvise"):
+        parser.error("--cold needs os.posix_fadvise (Linux).")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = Path(tmp) / "base"
+        (base_dir / BRAND_JSON_FILENAME).parent.mkdir(parents=True)
+        shutil.copyfile(ROOT / BRAND_JSON_FILENAME, base_dir / BRAND_JSON_FILENAME)
+        input_path = args.input
+        if input_path is None:
+            input_path = Path(tmp) / "input"
+            for copy in range(args.copies):
+                folder = input_path / f"copy{copy}"
+                folder.mkdir(parents=True)
+                write_synthetic(folder, args.rows, seed=copy)
+        sources = resolve_input_files(str(input_path), str(base_dir))
+        names = [None] * len(sources)
+
+        def sequential() -> list:
+            """Frames in source order; None for a source that fails (merge_sources skips it)."""
+            frames = []
+            for source in sources:
+                try:
+                    frames.append(process_file(source, base_dir=str(base_dir)))
+                except Exception:
+                    frames.append(None)
+            return frames
+
+        def pipelined() -> list:
+            process = lambda i, source, name: process_file(source, base_dir=str(base_dir), name=name)  # noqa: E731
+            return [df for _, df, _ in pipelined_ingest(sources, names, process)]
+
+        # Learn the reader profiles first, so no run pays for detection the others skip.
+        reference = sequential()
+        rows = sum(len(df) for df in reference if df is not None)
+        print(f"{len(sources)} sources, {rows:,} rows, {os.cpu_count()} CPU(s)")
+        timings: dict[str, list[float]] = {"sequential": [], "pipelined": []}
+        failed = False
+        for _ in range(args.repeat):
+            for mode, run in (("sequential", sequential), ("pipelined", pipelined)):
+                if args.cold:
+                    _drop_page_cache(sources)
+                started = time.perf_counter()
+                frames = run()
+                timings[mode].append(time.perf_counter() - started)
+                if mode == "pipelined":
+                    try:
+                        for expected, df in zip(reference, frames, strict=True):
+                            if expected is None or df is None:
+                                assert expected is df, "a source failed in one mode only"
+                            else:
+                                pd.testing.assert_frame_equal(expected, df)
+                    except (AssertionError, ValueError) as e:
+                        failed = True
+                        print(f"DIFFERS: {str(e).splitlines()[0]}")
+        best = {mode: min(seconds) for mode, seconds in timings.items()}
+        for mode, seconds in timings.items():
+            print(f"{mode:10} best {best[mode]:8.2f} s  runs {', '.join(f'{s:.2f}' for s in seconds)}")
+        print(f"speedup    {best['sequential'] / best['pipelined']:.2f}x")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Parity check and timing of the out-of-core (DuckDB) merge against the pandas merge.
+
+Writes the output of run_merge_and_save and of run_out_of_core_and_save for the
+same input into two scratch folders (each with a copy of brand.json) and
+compares data.csv and data.rollup.csv byte for byte. Without an input folder,
+the messy synthetic exports of benchmarks/engines.py are generated.
+
+    python benchmarks/out_of_core.py                        # synthetic, 200,000 rows
+    python benchmarks/out_of_core.py --rows 2000000 --memory-limit 1GB
+    python benchmarks/out_of_core.py path/to/raw_data
+
+Exits 1 when the outputs differ.
+"""
+
+import argparse
+import filecmp
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from engines import write_synthetic  # noqa: E402
+
+from src.constants import BRAND_JSON_FILENAME  # noqa: E402
+from src.quarterly_csv_merger import run_merge_and_save, run_out_of_core_and_save  # noqa: E402
+from src.quarterly_csv_merger.output import ROLLUP_FILENAME  # noqa: E402
+
+
+def _base_dir(folder: Path) -> str:
+    """Scratch base folder with the repository's brand.json."""
+    brand_json = folder / BRAND_JSON_FILENAME
+    brand_json.parent.mkdir(parents=True)
+    shutil.copyfile(ROOT / BRAND_JSON_FILENAME, brand_json)
+    return str(folder)
+
+
+def _same(a: Path, b: Path) -> bool:
+    return a.exists() == b.exists() and (not a.exists() or filecmp.cmp(a, b, shallow=False))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check that the out-of-core merge writes the pandas merge's output and time both.")
+    parser.add_argument("input", nargs="?", help="Input file or folder (default: synthetic exports)")
+    parser.add_argument("--rows", type=int, default=200_000, help="Synthetic rows in total (default: 200,000)")
+    parser.add_argument("--memory-limit", help="DuckDB memory limit, e.g. 1GB (default: DuckDB's)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        input_path = args.input
+        if input_path is None:
+            (tmp / "input").mkdir()
+            write_synthetic(tmp / "input", args.rows)
+            input_path = str(tmp / "input")
+        in_memory, out_of_core = _base_dir(tmp / "pandas"), _base_dir(tmp / "duckdb")
+
+        started = time.perf_counter()
+        expected = run_merge_and_save(input_path, base_dir=in_memory)
+        print(f"pandas   {time.perf_counter() - started:8.2f} s")
+        started = time.perf_counter()
+        path, summary = run_out_of_core_and_save(input_path, base_dir=out_of_core, memory_limit=args.memory_limit)
+        print(f"duckdb   {time.perf_counter() - started:8.2f} s  {summary['rows']:>10,} rows")
+
+        if (expected is None) != (path is None):
+            print("DIFFERS: only one merge kept rows")
+            return 1
+        if expected is None:
+            return 0
+        failed = False
+        for name in (expected.name, ROLLUP_FILENAME):
+            same = _same(expected.parent / name, path.parent / name)
+            failed = failed or not same
+            print(f"{name:20} {'identical' if same else 'DIFFERS'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
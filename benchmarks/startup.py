@@ -0,0 +1,128 @@
+"""Cold-start import benchmark for the app and CLI entry points.
+
+Each target is imported in a fresh interpreter under ``python -X importtime``;
+the median import time (interpreter startup excluded) is checked against the
+target's budget, and heavy modules the target must not load (e.g. pandas for
+the app shell) are reported. Every run is appended to
+benchmarks/startup_history.jsonl so regressions show up over time.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 10 --no-record
+
+Exits 1 when a target is over budget or loads a forbidden module.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+HISTORY_PATH = Path(__file__).resolve().parent / "startup_history.jsonl"
+MARKER = "--startup-bench--"
+
+# module -> (import-time budget in ms, modules it must not load)
+STARTUP_BUDGETS: dict[str, tuple[float, tuple[str, ...]]] = {
+    "app": (600.0, ("pandas", "numpy", "openpyxl", "pyarrow")),
+    "brand_editor": (50.0, ("pandas", "numpy", "streamlit")),
+    "quarterly_csv_merger": (50.0, ("pandas", "numpy")),
+    "quarterly_csv_merger.service": (100.0, ("pandas", "numpy")),
+    "quarterly_csv_merger.pipeline": (900.0, ("streamlit", "openpyxl", "sqlite3")),
+    "annual_csv_merger": (600.0, ("streamlit",)),
+    "results": (700.0, ("streamlit",)),
+}
+
+
+def measure(module: str) -> tuple[float, float, list[str]]:
+    """Import module in a fresh interpreter; return (import ms, wall ms, loaded modules)."""
+    code = (
+        f"import sys; sys.stderr.write({MARKER!r} + '\\n'); import {module}; "
+        "import json; print(json.dumps(sorted(sys.modules)))"
+    )
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    import_us = 0
+    after_marker = False
+    for line in proc.stderr.splitlines():
+        if line == MARKER:
+            after_marker = True
+            continue
+        if not after_marker or not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|", 2)
+        # Top-level entries have a single space before the name; nested ones are indented.
+        if not name[1:].startswith(" "):
+            import_us += int(cumulative)
+    return import_us / 1000, wall_ms, json.loads(proc.stdout.splitlines()[-1])
+
+
+def _git_commit() -> str | None:
+    """Return the current commit (short hash), or None outside a git checkout."""
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return proc.stdout.strip() or None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the app and CLI modules.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target (median is kept)")
+    parser.add_argument("--no-record", action="store_true", help=f"Do not append the run to {HISTORY_PATH.name}")
+    parser.add_argument("targets", nargs="*", help=f"Modules to measure (default: {', '.join(STARTUP_BUDGETS)})")
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+    for module in args.targets or list(STARTUP_BUDGETS):
+        budget, forbidden = STARTUP_BUDGETS.get(module, (None, ()))
+        runs = [measure(module) for _ in range(max(1, args.repeat))]
+        import_ms = statistics.median(r[0] for r in runs)
+        wall_ms = statistics.median(r[1] for r in runs)
+        loaded = [m for m in forbidden if m in runs[0][2]]
+        over = budget is not None and import_ms > budget
+        failed = failed or over or bool(loaded)
+        status = "OVER BUDGET" if over else "ok"
+        if loaded:
+            status += f", loads {', '.join(loaded)}"
+        limit = f"{budget:,.0f}" if budget is not None else "-"
+        print(f"{module:32} {import_ms:8.1f} ms import {wall_ms:8.1f} ms wall  (budget {limit} ms)  {status}")
+        results[module] = {
+            "import_ms": round(import_ms, 1),
+            "wall_ms": round(wall_ms, 1),
+            "budget_ms": budget,
+            "forbidden_loaded": loaded,
+        }
+
+    if not args.no_record:
+        record = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(HISTORY_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"Recorded in {HISTORY_PATH}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
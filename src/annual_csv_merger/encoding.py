@@ -4,13 +4,20 @@ try:
     from ..constants import COMMON_ENCODINGS
 except ImportError:
     from constants import COMMON_ENCODINGS
+try:
+    from ..reader import TableSource, read_head, source_name
+    from ..reader.profiles import get_profile, header_fingerprint
+    from ..reader.transcode import decode_head, sniff_encoding
+except ImportError:
+    from reader import TableSource, read_head, source_name
+    from reader.profiles import get_profile, header_fingerprint
+    from reader.transcode import decode_head, sniff_encoding
 
 
-def detect_encoding_from_bom(path: str) -> str | None:
+def detect_encoding_from_bom(source: TableSource) -> str | None:
     """Detect encoding from BOM (first few bytes). Returns None if no BOM."""
     try:
-        with open(path, "rb") as f:
-            raw = f.read(4)
+        raw = read_head(source, 4)
         if raw.startswith(b"\xef\xbb\xbf"):
             return "utf-8-sig"
         if raw.startswith(b"\xff\xfe\x00\x00"):
@@ -26,34 +33,41 @@ def detect_encoding_from_bom(path: str) -> str | None:
         return None
 
 
-def detect_csv_encoding(path: str, sample_size: int = 65536) -> tuple[str, float]:
+def detect_csv_encoding(
+    source: TableSource,
+    sample_size: int = 65536,
+    name: str | None = None,
+) -> tuple[str, float]:
     """
-    Detect encoding of a text/CSV file. Tries BOM first, then common encodings.
+    Detect encoding of a text/CSV file. Tries BOM first, then a learned reader
+    profile for the header, then the UTF-16/UTF-32 byte pattern, then common encodings.
     Returns (encoding_name, confidence 0–1). For CSV we also need to decode without error.
     """
-    path_lower = path.lower()
+    path_lower = source_name(source, name).lower()
     if not path_lower.endswith(".csv"):
         return "utf-8", 0.5
 
-    bom_enc = detect_encoding_from_bom(path)
+    bom_enc = detect_encoding_from_bom(source)
     if bom_enc:
         return bom_enc, 1.0
 
-    try:
-        with open(path, "rb") as f:
-            raw = f.read(sample_size)
-    except Exception:
+    raw = read_head(source, sample_size)
+    if not raw:
         return "utf-8", 0.0
 
-    encodings_to_try = [
-        "utf-8", "utf-8-sig", "utf-16", "utf-16-le", "utf-16-be"
-    ] + [e for e in COMMON_ENCODINGS if e not in ("utf-8", "utf-8-sig", "utf-16", "utf-16-le", "utf-16-be")]
+    profile = get_profile(header_fingerprint(raw))
+    if profile and profile.get("encoding"):
+        return profile["encoding"], 1.0
+
+    sniffed = sniff_encoding(raw)
+    if sniffed and decode_head(raw, sniffed) is not None:
+        return sniffed, 0.9
+    # Without a BOM or NUL pattern the file is not UTF-16/UTF-32 (those codecs
+    # accept almost any even-length bytes); try UTF-8, then the legacy codepages.
+    encodings_to_try = ["utf-8"] + [
+        e for e in COMMON_ENCODINGS if e != "utf-8" and not e.startswith(("utf-16", "utf-32"))
+    ]
     for enc in encodings_to_try:
-        try:
-            text = raw.decode(enc)
-            if enc.startswith("utf-16") or enc.startswith("utf-32"):
-                return enc, 0.9
+        if decode_head(raw, enc) is not None:
             return enc, 0.85
-        except (UnicodeDecodeError, LookupError):
-            continue
     return "utf-8", 0.0
@@ -3,9 +3,9 @@
 import pandas as pd
 
 try:
-    from ..reader import load_table
+    from ..reader import TableSource, load_table
 except ImportError:
-    from reader import load_table
+    from reader import TableSource, load_table
 
 try:
     from ..constants import CANONICAL_OUTPUT_COLUMNS
@@ -15,13 +15,13 @@ except ImportError:
 _CANONICAL_LOWER = {c.strip().lower() for c in CANONICAL_OUTPUT_COLUMNS}
 
 
-def get_headers(path: str) -> list[str] | None:
+def get_headers(source: TableSource) -> list[str] | None:
     """
     Read only the header row of a CSV or Excel file (uses src.reader.load_table).
-    Returns list of column names or None on failure.
+    source may be a path or an uploaded file. Returns list of column names or None on failure.
     """
     try:
-        df = load_table(path)
+        df = load_table(source)
         return list(df.columns) if df is not None and not df.empty else None
     except Exception:
         return None
@@ -74,7 +74,7 @@ def reorder_df_to_canonical(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
-def headers_align(paths: list[str]) -> tuple[bool, list[list[str] | None], list[str] | None]:
+def headers_align(paths: list[TableSource]) -> tuple[bool, list[list[str] | None], list[str] | None]:
     """
     Check if all files have readable headers and every file has all canonical
     output columns (case-insensitive). Column order does not matter.
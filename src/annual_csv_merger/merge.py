@@ -7,38 +7,40 @@ from typing import Callable
 import pandas as pd
 
 try:
-    from ..reader import load_table
+    from ..reader import TableSource, load_table, source_name
 except ImportError:
-    from reader import load_table
+    from reader import TableSource, load_table, source_name
 
 from .encoding import detect_csv_encoding
 from .header_check import headers_align, reorder_df_to_canonical
 
 
-def load_file_with_encoding(path: str) -> tuple[pd.DataFrame | None, str, float]:
+def load_file_with_encoding(source: TableSource) -> tuple[pd.DataFrame | None, str, float]:
     """
     Load CSV or Excel via src.reader.load_table; return (df, encoding_label, confidence).
+    source may be a path or an uploaded file.
     Encoding is only meaningful for CSV; for Excel returns ('excel', 1.0).
     """
     try:
-        df = load_table(path)
+        df = load_table(source)
     except Exception:
         return None, "unknown", 0.0
     if df is None:
         return None, "unknown", 0.0
-    if path.lower().endswith(".csv"):
-        enc, confidence = detect_csv_encoding(path)
+    if source_name(source).lower().endswith(".csv"):
+        enc, confidence = detect_csv_encoding(source)
         return df, enc, confidence
     return df, "excel", 1.0
 
 
 def merge_if_aligned(
-    paths: list[str],
+    paths: list[TableSource],
     progress_callback: Callable[[float, str], None] | None = None,
 ) -> tuple[pd.DataFrame | None, list[dict], bool]:
     """
     If all files have aligned headers, load and concatenate them (direct: src.reader only).
     Returns (merged_dataframe, report_list, headers_aligned).
+    paths may be filesystem paths or uploaded files (reported by name).
     report_list contains per-file: path, encoding, confidence, rows, columns.
     progress_callback(progress_ratio, message) is called to report progress (0.0 to 1.0).
     """
@@ -60,7 +62,7 @@ def merge_if_aligned(
         df, enc, confidence = load_file_with_encoding(path)
         if df is None:
             report.append({
-                "path": path,
+                "path": source_name(path),
                 "encoding": enc,
                 "confidence": confidence,
                 "rows": 0,
@@ -69,7 +71,7 @@ def merge_if_aligned(
             })
             continue
         report.append({
-            "path": path,
+            "path": source_name(path),
             "encoding": enc,
             "confidence": confidence,
             "rows": len(df),
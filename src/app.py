@@ -1,73 +1,128 @@
 """Streamlit app: CSV/Excel merger by country keywords and Brand JSON manager."""
 
-import os
-import tempfile
 from pathlib import Path
 
-import pandas as pd
 import streamlit as st
 
 try:
     from .brand_editor import (
+        BrandLockTimeout,
+        add_brand,
+        add_keywords,
         filter_brands_by_letter,
-        load_brand_json,
+        get_brand_index,
+        get_brand_json_version,
         normalize_display_text,
-        save_brand_json,
+        remove_brand,
+        remove_keywords,
     )
 except ImportError:
     from brand_editor import (
+        BrandLockTimeout,
+        add_brand,
+        add_keywords,
         filter_brands_by_letter,
-        load_brand_json,
+        get_brand_index,
+        get_brand_json_version,
         normalize_display_text,
-        save_brand_json,
+        remove_brand,
+        remove_keywords,
     )
-_merger_import_error = None
-try:
+# The mergers and the result cache pull in pandas and numpy, so each page imports
+# what it needs on first render; the Brand Keywords Manager never loads them.
+
+
+def _load_quarterly_merger() -> Exception | None:
+    """Import the quarterly merger on first use; return the import error, if any."""
+    global PREVIEW_ROWS, ROLLUP_DIMENSIONS, cancel_job, get_job, merge_sources, query_rollup
+    global select_output_columns, submit_merge, tag_distributions
     try:
-        from .quarterly_csv_merger import (
-            add_brand_from_keywords,
-            add_date_columns,
-            add_market_column,
-            add_media_platform_column,
-            add_media_type_column,
-            drop_blank_url_rows,
-            process_file,
-            select_output_columns,
-            set_engagement_from_sum,
-        )
-    except ImportError:
-        from quarterly_csv_merger import (
-            add_brand_from_keywords,
-            add_date_columns,
-            add_market_column,
-            add_media_platform_column,
-            add_media_type_column,
-            drop_blank_url_rows,
-            process_file,
-            select_output_columns,
-            set_engagement_from_sum,
-        )
-except Exception as e:
-    _merger_import_error = e
+        try:
+            from .quarterly_csv_merger import (
+                PREVIEW_ROWS,
+                cancel_job,
+                get_job,
+                merge_sources,
+                select_output_columns,
+                submit_merge,
+                tag_distributions,
+            )
+            from .quarterly_csv_merger.output import ROLLUP_DIMENSIONS, query_rollup
+        except ImportError:
+            from quarterly_csv_merger import (
+                PREVIEW_ROWS,
+                cancel_job,
+                get_job,
+                merge_sources,
+                select_output_columns,
+                submit_merge,
+                tag_distributions,
+            )
+            from quarterly_csv_merger.output import ROLLUP_DIMENSIONS, query_rollup
+    except Exception as e:
+        return e
+    return None
 
-_encoding_merger_import_error = None
-try:
+
+def _load_results() -> Exception | None:
+    """Import the result cache, preview and exports on first use; return the import error, if any."""
+    global EXPORT_FORMATS, PREVIEW_PAGE_SIZE, export_path, get_export, get_preview_index
+    global get_result, get_rollup, keep_result, put_result, query_preview, result_key
     try:
-        from .annual_csv_merger import (
-            CANONICAL_OUTPUT_COLUMNS,
-            file_has_all_canonical_headers,
-            headers_align,
-            merge_if_aligned,
-        )
-    except ImportError:
-        from annual_csv_merger import (
-            CANONICAL_OUTPUT_COLUMNS,
-            file_has_all_canonical_headers,
-            headers_align,
-            merge_if_aligned,
-        )
-except Exception as e:
-    _encoding_merger_import_error = e
+        try:
+            from .results import (
+                EXPORT_FORMATS,
+                PREVIEW_PAGE_SIZE,
+                export_path,
+                get_export,
+                get_preview_index,
+                get_result,
+                get_rollup,
+                keep_result,
+                put_result,
+                query_preview,
+                result_key,
+            )
+        except ImportError:
+            from results import (
+                EXPORT_FORMATS,
+                PREVIEW_PAGE_SIZE,
+                export_path,
+                get_export,
+                get_preview_index,
+                get_result,
+                get_rollup,
+                keep_result,
+                put_result,
+                query_preview,
+                result_key,
+            )
+    except Exception as e:
+        return e
+    return None
+
+
+def _load_annual_merger() -> Exception | None:
+    """Import the annual merger on first use; return the import error, if any."""
+    global CANONICAL_OUTPUT_COLUMNS, file_has_all_canonical_headers, headers_align, merge_if_aligned
+    try:
+        try:
+            from .annual_csv_merger import (
+                CANONICAL_OUTPUT_COLUMNS,
+                file_has_all_canonical_headers,
+                headers_align,
+                merge_if_aligned,
+            )
+        except ImportError:
+            from annual_csv_merger import (
+                CANONICAL_OUTPUT_COLUMNS,
+                file_has_all_canonical_headers,
+                headers_align,
+                merge_if_aligned,
+            )
+    except Exception as e:
+        return e
+    return None
 
 
 def get_base_dir() -> str:
@@ -108,6 +163,22 @@ def _show_brand_action_popup() -> None:
     _dialog()
 
 
+def _render_alias_collisions(index, keywords: list[str], brand: str | None = None) -> None:
+    """Warn about typed Keywords that already belong to another Brand."""
+    for kw in keywords:
+        others = [b for b in index.owners(kw) if b != brand]
+        if others:
+            st.warning(f"«{kw}» is already a Keyword of **{', '.join(others)}**.")
+
+
+def _brand_saved(message: str, action: str) -> None:
+    """Show the success popup after a save and rerun."""
+    st.session_state.brand_editor_show_popup = True
+    st.session_state.brand_editor_popup_message = message
+    st.session_state.brand_editor_popup_action = action
+    st.rerun()
+
+
 def _render_brand_json_manager() -> None:
     """Render Brand JSON manager UI (add/remove brands and keywords)."""
     _show_brand_action_popup()
@@ -116,8 +187,10 @@ def _render_brand_json_manager() -> None:
     st.markdown("Edit **Brands** and **Keywords** in the brand configuration. Changes are saved immediately.")
 
     base_dir = get_base_dir()
-    data = load_brand_json(base_dir)
-    keys = sorted(data.keys()) if data else []
+    # The index is rebuilt only when brand.json's version changes, not on every rerun.
+    index = get_brand_index(base_dir)
+    data = index.data
+    keys = index.brands
 
     action = st.radio(
         "What do you want to do?",
@@ -131,15 +204,37 @@ def _render_brand_json_manager() -> None:
         horizontal=False,
     )
 
+    try:
+        _render_brand_action(action, index, data, keys, base_dir)
+    except BrandLockTimeout as e:
+        st.error(f"{e} Try again in a moment.")
+
+
+def _render_brand_action(action: str, index, data: dict, keys: list[str], base_dir: str) -> None:
+    """Render one Brand Keywords Manager action; each save is a single locked change."""
     if action == "Show all Brands and Keywords":
         st.subheader("All Brands and Keywords")
         if not data:
             st.info("No Brands yet. Add a Brand to get started.")
         else:
-            total_keywords = sum(len(v) for v in data.values() if isinstance(v, list))
-            letters = [chr(c) for c in range(ord("A"), ord("Z") + 1)]
-            selected_letter = st.selectbox("Choose letter", letters, key="brand_list_letter", index=0)
-            filtered_keys = filter_brands_by_letter(keys, selected_letter, normalize_fn=normalize_display_text)
+            collisions = index.collisions()
+            if collisions:
+                with st.expander(f"{len(collisions)} Keyword(s) used by more than one Brand"):
+                    for alias, brands in sorted(collisions.items()):
+                        st.text(f"{alias}: {', '.join(brands)}")
+            search_col, mode_col = st.columns([3, 1])
+            with search_col:
+                query = st.text_input("Search Brands and Keywords", key="brand_search")
+            with mode_col:
+                substring = st.toggle("Contains", key="brand_search_contains")
+            if query.strip():
+                filtered_keys = index.matching_brands(query, substring=substring)
+                empty_message = f"No Brands or Keywords match **{query.strip()}**."
+            else:
+                letters = [chr(c) for c in range(ord("A"), ord("Z") + 1)]
+                selected_letter = st.selectbox("Choose letter", letters, key="brand_list_letter", index=0)
+                filtered_keys = filter_brands_by_letter(keys, selected_letter, normalize_fn=normalize_display_text)
+                empty_message = f"No Brands starting with **{selected_letter}**."
             filtered_kw_count = sum(
                 len(data.get(b, [])) for b in filtered_keys if isinstance(data.get(b), list)
             )
@@ -149,7 +244,7 @@ def _render_brand_json_manager() -> None:
                 unsafe_allow_html=True,
             )
             if not filtered_keys:
-                st.info(f"No Brands starting with **{selected_letter}**.")
+                st.info(empty_message)
             else:
                 for brand in filtered_keys:
                     keywords = data.get(brand, [])
@@ -157,7 +252,7 @@ def _render_brand_json_manager() -> None:
                         keywords = [str(keywords)]
                     brand_display = normalize_display_text(brand)
                     label = f"**{brand_display}** — {len(keywords)} Keyword(s)"
-                    with st.expander(label, expanded=False):
+                    with st.expander(label, expanded=bool(query.strip())):
                         if keywords:
                             for kw in keywords:
                                 st.text(normalize_display_text(kw))
@@ -182,20 +277,16 @@ def _render_brand_json_manager() -> None:
                     placeholder="keyword1\nkeyword2\nkeyword3",
                     key="add_values_existing",
                 )
+                new_values = [v.strip() for v in new_values_raw.strip().splitlines() if v.strip()]
+                _render_alias_collisions(index, new_values, chosen)
                 if st.button("Append to Brand"):
                     if not chosen:
                         st.warning("Select a Brand.")
+                    elif not new_values:
+                        st.warning("Enter at least one Keyword.")
                     else:
-                        new_values = [v.strip() for v in new_values_raw.strip().splitlines() if v.strip()]
-                        if not new_values:
-                            st.warning("Enter at least one Keyword.")
-                        else:
-                            data[chosen] = data.get(chosen, []) + new_values
-                            save_brand_json(data, base_dir)
-                            st.session_state.brand_editor_show_popup = True
-                            st.session_state.brand_editor_popup_message = f"Appended {len(new_values)} Keyword(s) to **{chosen}**."
-                            st.session_state.brand_editor_popup_action = "add"
-                            st.rerun()
+                        added = add_keywords(chosen, new_values, base_dir)
+                        _brand_saved(f"Appended {added} Keyword(s) to **{chosen}**.", "add")
         else:
             new_key = st.text_input("New Brand name", key="add_new_key_name")
             new_values_raw = st.text_area(
@@ -204,48 +295,39 @@ def _render_brand_json_manager() -> None:
                 placeholder="keyword1\nkeyword2",
                 key="add_values_new_key",
             )
+            key_stripped = new_key.strip()
+            new_values = [v.strip() for v in new_values_raw.strip().splitlines() if v.strip()]
+            _render_alias_collisions(index, new_values, key_stripped)
             if st.button("Create Brand and add Keywords"):
-                key_stripped = new_key.strip()
                 if not key_stripped:
                     st.warning("Enter a Brand name.")
+                elif key_stripped in data:
+                    added = add_keywords(key_stripped, new_values, base_dir)
+                    _brand_saved(f"Appended {added} Keyword(s) to existing Brand **{key_stripped}**.", "add")
                 else:
-                    new_values = [v.strip() for v in new_values_raw.strip().splitlines() if v.strip()]
-                    if key_stripped in data:
-                        data[key_stripped] = data[key_stripped] + new_values
-                        save_brand_json(data, base_dir)
-                        st.session_state.brand_editor_show_popup = True
-                        st.session_state.brand_editor_popup_message = f"Appended {len(new_values)} Keyword(s) to existing Brand **{key_stripped}**."
-                        st.session_state.brand_editor_popup_action = "add"
-                    else:
-                        data[key_stripped] = new_values if new_values else []
-                        save_brand_json(data, base_dir)
-                        st.session_state.brand_editor_show_popup = True
-                        st.session_state.brand_editor_popup_message = f"Created Brand **{key_stripped}** with {len(new_values)} Keyword(s)."
-                        st.session_state.brand_editor_popup_action = "add"
-                    st.rerun()
+                    add_keywords(key_stripped, new_values, base_dir)
+                    _brand_saved(f"Created Brand **{key_stripped}** with {len(new_values)} Keyword(s).", "add")
 
     elif action == "Add a new Brand":
         st.subheader("Add a new Brand")
         new_key = st.text_input("Brand name", key="new_key_name")
+        key_stripped = new_key.strip()
+        if key_stripped and key_stripped not in data:
+            _render_alias_collisions(index, [key_stripped])
         new_values_raw = st.text_area(
             "Initial Keywords (one per line, optional)",
             height=100,
             key="new_key_values",
         )
+        values = [v.strip() for v in new_values_raw.strip().splitlines() if v.strip()]
+        _render_alias_collisions(index, values, key_stripped)
         if st.button("Add Brand"):
-            key_stripped = new_key.strip()
             if not key_stripped:
                 st.warning("Enter a Brand name.")
-            elif key_stripped in data:
+            elif not add_brand(key_stripped, values, base_dir):
                 st.warning(f"Brand **{key_stripped}** already exists. Use **Add Keywords to a Brand** to append.")
             else:
-                values = [v.strip() for v in new_values_raw.strip().splitlines() if v.strip()]
-                data[key_stripped] = values
-                save_brand_json(data, base_dir)
-                st.session_state.brand_editor_show_popup = True
-                st.session_state.brand_editor_popup_message = f"Added Brand **{key_stripped}** with {len(values)} Keyword(s)."
-                st.session_state.brand_editor_popup_action = "add"
-                st.rerun()
+                _brand_saved(f"Added Brand **{key_stripped}** with {len(values)} Keyword(s).", "add")
 
     elif action == "Remove a Brand":
         st.subheader("Remove a Brand")
@@ -254,13 +336,10 @@ def _render_brand_json_manager() -> None:
         else:
             to_remove = st.selectbox("Select Brand to remove", keys, key="remove_key_sel")
             if st.button("Remove Brand"):
-                if to_remove in data:
-                    del data[to_remove]
-                    save_brand_json(data, base_dir)
-                    st.session_state.brand_editor_show_popup = True
-                    st.session_state.brand_editor_popup_message = f"Removed Brand **{to_remove}**."
-                    st.session_state.brand_editor_popup_action = "remove"
-                    st.rerun()
+                if not remove_brand(to_remove, base_dir):
+                    st.warning(f"Brand **{to_remove}** was already removed.")
+                else:
+                    _brand_saved(f"Removed Brand **{to_remove}**.", "remove")
 
     elif action == "Remove Keyword(s) from a Brand":
         st.subheader("Remove Keyword(s) from a Brand")
@@ -281,12 +360,178 @@ def _render_brand_json_manager() -> None:
                     if not to_remove:
                         st.warning("Select at least one Keyword.")
                     else:
-                        data[chosen] = [v for v in values_in_key if v not in to_remove]
-                        save_brand_json(data, base_dir)
-                        st.session_state.brand_editor_show_popup = True
-                        st.session_state.brand_editor_popup_message = f"Removed {len(to_remove)} Keyword(s) from **{chosen}**."
-                        st.session_state.brand_editor_popup_action = "remove"
-                        st.rerun()
+                        removed = remove_keywords(chosen, to_remove, base_dir)
+                        _brand_saved(f"Removed {removed} Keyword(s) from **{chosen}**.", "remove")
+
+
+def _render_result_preview(result_id: str, df, widget_key: str, to_display=None) -> None:
+    """Page through a result on the server, filtered and sorted via a precomputed index."""
+    index = get_preview_index(result_id, df)
+    columns = list(index["columns"])
+    filters = {}
+    if columns:
+        filter_cols = st.columns(len(columns))
+        for col, container in zip(columns, filter_cols):
+            with container:
+                filters[col] = st.multiselect(col, index["columns"][col]["values"], key=f"{widget_key}_f_{col}")
+        sort_col, order_col = st.columns([3, 1])
+        with sort_col:
+            sort_by = st.selectbox("Sort by", ["(file order)"] + columns, key=f"{widget_key}_sort")
+        with order_col:
+            descending = st.toggle("Descending", key=f"{widget_key}_desc")
+    else:
+        sort_by, descending = "(file order)", False
+    _, total = query_preview(df, index, filters, page_size=0)
+    n_pages = max(1, -(-total // PREVIEW_PAGE_SIZE))
+    page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, value=1, key=f"{widget_key}_page") - 1
+    rows, total = query_preview(
+        df,
+        index,
+        filters,
+        sort_by=None if sort_by == "(file order)" else sort_by,
+        descending=descending,
+        page=page,
+        page_size=PREVIEW_PAGE_SIZE,
+    )
+    if to_display is not None:
+        rows = to_display(rows)
+    st.dataframe(rows, use_container_width=True)
+    first = page * PREVIEW_PAGE_SIZE + 1 if total else 0
+    st.caption(f"Rows {first:,}–{min(total, (page + 1) * PREVIEW_PAGE_SIZE):,} of {total:,} matching")
+
+
+def _render_download(result_id: str, build_df, file_stem: str, widget_key: str) -> None:
+    """Offer a result for download; each format is written once, on request, and served from disk."""
+    fmt = st.selectbox(
+        "Download format",
+        list(EXPORT_FORMATS),
+        format_func=lambda f: EXPORT_FORMATS[f][2],
+        key=f"{widget_key}_format",
+    )
+    suffix, mime, label = EXPORT_FORMATS[fmt]
+    path = export_path(result_id, fmt)
+    if not path.exists():
+        if not st.button(f"Prepare {label} file", key=f"{widget_key}_prepare"):
+            return
+        with st.spinner(f"Writing {label} file..."):
+            path = get_export(result_id, fmt, build_df)
+    with open(path, "rb") as f:
+        st.download_button(
+            label=f"Download merged {label}",
+            data=f,
+            file_name=f"{file_stem}{suffix}",
+            mime=mime,
+            key=widget_key,
+        )
+
+
+def _render_quality_panel(quality: dict) -> None:
+    """Show the data-quality profile collected during the merge."""
+    with st.expander("Data quality"):
+        metrics = quality.get("metrics", {})
+        st.dataframe(
+            {
+                "Check": list(metrics),
+                "Rows": [m["count"] for m in metrics.values()],
+                "Share": [f"{m['rate']:.1%}" for m in metrics.values()],
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
+        flagged = [name for name, m in metrics.items() if m["count"]]
+        if flagged:
+            metric = st.selectbox("Breakdown", flagged, key="quality_breakdown")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.caption("By file")
+                st.dataframe(metrics[metric]["by_file"], use_container_width=True)
+            with col2:
+                st.caption("By country")
+                st.dataframe(metrics[metric]["by_country"], use_container_width=True)
+        st.caption("Stages")
+        st.dataframe(
+            [
+                {"Stage": s["stage"], "Rows in": s["rows_in"], "Rows out": s["rows_out"], "Seconds": s["seconds"]}
+                for s in quality.get("stages", [])
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+def _render_sample_preview(uploaded, base_dir: str, cache_key: str, dedupe: bool) -> None:
+    """Run the pipeline over the first (or sampled) rows of each upload and show the tagging."""
+    with st.expander("Preview tagging on a sample"):
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            nrows = st.number_input("Rows per file", min_value=1, value=PREVIEW_ROWS, step=500, key="preview_rows")
+        with col2:
+            sample = st.toggle("Random sample", key="preview_sample")
+        preview_key = (cache_key, int(nrows), sample)
+        if st.button("Preview", key="preview_btn"):
+            warnings: list[str] = []
+            with st.spinner("Previewing..."):
+                df = merge_sources(
+                    uploaded,
+                    base_dir=base_dir,
+                    names=[f.name for f in uploaded],
+                    on_warning=warnings.append,
+                    dedupe=dedupe,
+                    nrows=int(nrows),
+                    sample=sample,
+                )
+            st.session_state["merge_preview"] = (preview_key, df, warnings)
+        stored = st.session_state.get("merge_preview")
+        if stored is None or stored[0] != preview_key:
+            return
+        _, df, warnings = stored
+        for msg in warnings:
+            st.warning(msg)
+        if df.empty:
+            st.warning("No rows matched country keywords (ID/SG/TH/MY in filename or name column).")
+            return
+        st.caption(f"{len(df):,} tagged rows")
+        distributions = tag_distributions(df)
+        cols = st.columns(2)
+        for i, (col, counts) in enumerate(distributions.items()):
+            with cols[i % 2]:
+                st.dataframe({col: list(counts), "Rows": list(counts.values())}, hide_index=True, use_container_width=True)
+        st.dataframe(select_output_columns(df).head(PREVIEW_ROWS), use_container_width=True)
+
+
+def _format_eta(seconds: float | None) -> str:
+    """Format an ETA in seconds as m:ss (empty if unknown)."""
+    if seconds is None:
+        return ""
+    minutes, secs = divmod(int(seconds), 60)
+    return f" · ETA {minutes}:{secs:02d}"
+
+
+@st.fragment(run_every=1.0)
+def _render_merge_job_progress(job_id: str) -> None:
+    """Poll a running merge job (progress, ETA, cancel); rerun the page once it finishes."""
+    job = get_job(job_id)
+    if job is None or job["finished_at"] is not None:
+        st.rerun()
+        return
+    st.progress(min(1.0, job["progress"]), text=f"{job['message']}{_format_eta(job['eta_seconds'])}")
+    if st.button("Cancel merge", key=f"cancel_merge_{job_id}"):
+        cancel_job(job_id)
+        st.info("Cancelling...")
+
+
+def _show_merge_job_outcome(job: dict) -> None:
+    """Show warnings and the final status of a finished merge job."""
+    for msg in job["warnings"]:
+        st.warning(msg)
+    if job["status"] == "cancelled":
+        st.info("Merge cancelled.")
+    elif job["status"] == "failed":
+        st.error(job["message"])
+    elif job["result"] is None or job["result"].empty:
+        st.warning("No rows matched country keywords (ID/SG/TH/MY in filename or name column).")
+    else:
+        st.success(f"Merged **{len(job['result'])}** rows.")
 
 
 def _render_annual_csv_merge() -> None:
@@ -299,8 +544,9 @@ def _render_annual_csv_merge() -> None:
             "Files are combined into a single CSV with columns in a fixed order."
         )
 
-    if _encoding_merger_import_error is not None:
-        st.error(f"Failed to load Annual CSV Merger module: {_encoding_merger_import_error}")
+    import_error = _load_annual_merger() or _load_results()
+    if import_error is not None:
+        st.error(f"Failed to load Annual CSV Merger module: {import_error}")
         return
 
     uploaded = st.file_uploader(
@@ -310,61 +556,52 @@ def _render_annual_csv_merge() -> None:
         key="annual_csv_uploader",
     )
 
-    paths: list[str] = []
-    temp_dir = tempfile.mkdtemp()
-    try:
-        for f in uploaded:
-            path = os.path.join(temp_dir, f.name)
-            with open(path, "wb") as out:
-                out.write(f.getvalue())
-            paths.append(path)
-
-        aligned, all_headers, _ = headers_align(paths)
-
-        if not aligned and paths and all_headers:
-            for path, h in zip(paths, all_headers):
-                if h is None:
-                    st.warning(f"Could not read headers from: **{os.path.basename(path)}**")
-                    break
-                if not file_has_all_canonical_headers(h):
-                    st.warning("Headers do not match canonical output columns.")
-                    break
-
-        if aligned:
-            st.success("Good to go — each file has matching columns (case-insensitive). You can combine the files.")
-            if "encoding_merged_df" not in st.session_state and st.button("Combine files", key="encoding_merge_btn"):
-                progress_bar = st.progress(0.0, text="Starting...")
-                def on_progress(ratio: float, msg: str) -> None:
-                    progress_bar.progress(min(1.0, ratio), text=msg)
-                merged, report, _ = merge_if_aligned(paths, progress_callback=on_progress)
-                progress_bar.progress(1.0, text="Done.")
-                if merged is not None and not merged.empty:
-                    st.session_state["encoding_merged_df"] = merged
-                    st.session_state["encoding_merged_report"] = report
-                    st.rerun()
-
-        if "encoding_merged_df" in st.session_state and st.session_state.encoding_merged_df is not None:
-            df = st.session_state.encoding_merged_df
-            st.subheader("Merged Result")
-            st.dataframe(df.head(100), use_container_width=True)
-            st.subheader("Summary")
-            st.metric("Total Rows", f"{len(df):,}")
-            st.download_button(
-                label="Download merged CSV",
-                data=df.to_csv(index=False, encoding="utf-8-sig"),
-                file_name="merged_annual.csv",
-                mime="text/csv",
-                key="encoding_download_btn",
-            )
-    finally:
-        try:
-            for p in paths:
-                if os.path.isfile(p):
-                    os.remove(p)
-            if os.path.isdir(temp_dir):
-                os.rmdir(temp_dir)
-        except Exception:
-            pass
+    # Uploads are parsed straight from their in-memory buffers (no temp files).
+    sources = list(uploaded or [])
+    aligned, all_headers, _ = headers_align(sources)
+
+    if not aligned and sources and all_headers:
+        for f, h in zip(sources, all_headers):
+            if h is None:
+                st.warning(f"Could not read headers from: **{f.name}**")
+                break
+            if not file_has_all_canonical_headers(h):
+                st.warning("Headers do not match canonical output columns.")
+                break
+
+    if aligned:
+        st.success("Good to go — each file has matching columns (case-insensitive). You can combine the files.")
+        if "encoding_merged_df" not in st.session_state and st.button("Combine files", key="encoding_merge_btn"):
+            progress_bar = st.progress(0.0, text="Starting...")
+            def on_progress(ratio: float, msg: str) -> None:
+                progress_bar.progress(min(1.0, ratio), text=msg)
+            merged, report, _ = merge_if_aligned(sources, progress_callback=on_progress)
+            progress_bar.progress(1.0, text="Done.")
+            if merged is not None and not merged.empty:
+                key = result_key(sources, "annual")
+                # Cached like quarterly results, so its download files are removed with the entry.
+                put_result(key, merged)
+                st.session_state["encoding_merged_df"] = merged
+                st.session_state["encoding_merged_report"] = report
+                st.session_state["encoding_merged_key"] = key
+                st.rerun()
+
+    if "encoding_merged_df" in st.session_state and st.session_state.encoding_merged_df is not None:
+        df = st.session_state.encoding_merged_df
+        key = st.session_state["encoding_merged_key"]
+        # The session outlives the cache entry: re-cache it so the preview index
+        # built below is evicted with it rather than kept for good.
+        keep_result(key, df)
+        st.subheader("Merged Result")
+        _render_result_preview(key, df, "annual_preview")
+        st.subheader("Summary")
+        st.metric("Total Rows", f"{len(df):,}")
+        _render_download(
+            key,
+            lambda: df,
+            "merged_annual",
+            "encoding_download_btn",
+        )
 
 
 def main() -> None:
@@ -396,116 +633,78 @@ def main() -> None:
             "Upload your files below, then preview and download the merged result."
         )
 
-    if _merger_import_error is not None:
-        st.error(f"Failed to load Quarterly CSV Merger module: {_merger_import_error}")
+    import_error = _load_quarterly_merger() or _load_results()
+    if import_error is not None:
+        st.error(f"Failed to load Quarterly CSV Merger module: {import_error}")
         st.info("Check that dependencies are installed (e.g. `pip install pandas openpyxl streamlit`) and restart the app.")
         return
 
     base_dir = get_base_dir()
-    df = None
-
     uploaded = st.file_uploader(
         "Upload CSV or Excel files",
         type=["csv", "xlsx", "xls"],
         accept_multiple_files=True,
     )
-    if uploaded and st.button("Merge files"):
-        temp_dir = tempfile.mkdtemp()
-        paths: list[str] = []
-        try:
-            for f in uploaded:
-                path = os.path.join(temp_dir, f.name)
-                with open(path, "wb") as out:
-                    out.write(f.getvalue())
-                paths.append(path)
-
-            n_steps = 1 + len(paths) + 1 + 6 + 1
-            progress_bar = st.progress(0, text="Starting...")
-            step = 0
-
-            def advance(msg: str) -> None:
-                nonlocal step
-                step += 1
-                progress_bar.progress(step / n_steps, text=msg)
-
-            try:
-                advance("Processing files...")
-                frames = []
-                for i, path in enumerate(paths):
-                    progress_bar.progress((1 + i) / n_steps, text=f"Reading {os.path.basename(path)}...")
-                    try:
-                        frame = process_file(path, base_dir=base_dir)
-                        if not frame.empty:
-                            frames.append(frame)
-                    except Exception as e:
-                        st.warning(f"Skipped {os.path.basename(path)}: {e}")
-                step = 1 + len(paths)
-
-                if frames:
-                    advance("Combining rows...")
-                    try:
-                        df = pd.concat(frames, ignore_index=True)
-                    except Exception as e:
-                        st.error(f"Failed to combine rows: {e}")
-                        df = None
-                    if df is not None and not df.empty:
-                        def _safe_step(name: str, fn, *args, **kwargs):
-                            nonlocal df
-                            try:
-                                df = fn(df, *args, **kwargs)
-                                return True
-                            except Exception as e:
-                                st.warning(f"Step «{name}» skipped: {e}")
-                                return False
-                        advance("Removing blank URLs...")
-                        _safe_step("Remove blank URLs", drop_blank_url_rows)
-                        advance("Adding Market...")
-                        _safe_step("Market", add_market_column)
-                        advance("Adding Media Platform...")
-                        _safe_step("Media Platform", add_media_platform_column)
-                        advance("Adding Media Type...")
-                        _safe_step("Media Type", add_media_type_column)
-                        advance("Adding date columns...")
-                        _safe_step("Date columns", add_date_columns)
-                        advance("Calculating Engagement...")
-                        _safe_step("Engagement", set_engagement_from_sum)
-                        advance("Resolving Brand...")
-                        _safe_step("Brand", add_brand_from_keywords, base_dir=base_dir)
-                    progress_bar.progress(1.0, text="Done.")
-                    if df is not None and not df.empty:
-                        st.success(f"Merged **{len(df)}** rows from {len(uploaded)} file(s).")
-                    else:
-                        st.warning("Merge completed but no rows remained after pipeline steps.")
-                else:
-                    progress_bar.progress(1.0, text="Done.")
-                    st.warning("No rows matched country keywords (ID/SG/TH/MY in filename or name column).")
-                    df = None
-            except Exception as e:
-                progress_bar.progress(1.0, text="Error.")
-                st.error(f"Merge failed: {e}")
-                df = None
-        except Exception as e:
-            st.error(f"Failed to prepare files: {e}")
-        finally:
-            try:
-                for p in paths:
-                    if os.path.isfile(p):
-                        os.remove(p)
-                if os.path.isdir(temp_dir):
-                    os.rmdir(temp_dir)
-            except Exception:
-                pass
+    dedupe = st.checkbox(
+        "Remove duplicate mentions across files (same URL, Date and Influencer)",
+        key="merge_dedupe",
+    )
+    # Results are cached by upload content + brand.json version, so reruns and
+    # re-opening the same upload set skip the merge entirely.
+    cache_key = (
+        result_key(uploaded, get_brand_json_version(base_dir), "dedupe" if dedupe else "")
+        if uploaded
+        else None
+    )
+    df = get_result(cache_key)
+
+    # Merges run as background jobs; the job id survives reruns (session) and
+    # browser refreshes (query string), and the job keeps running either way.
+    job_id = st.session_state.get("merge_job_id") or st.query_params.get("merge_job")
+    job = get_job(job_id)
+    if job is not None and job["finished_at"] is None:
+        _render_merge_job_progress(job["id"])
+        return
+    if df is None and job is not None and job["status"] == "done":
+        if not uploaded or st.session_state.get("merge_job_key") == cache_key:
+            df = job["result"] if job["result"] is not None and not job["result"].empty else None
+            _show_merge_job_outcome(job)
+    elif df is not None:
+        st.caption("Showing cached merge for these files.")
+    elif job is not None and job["status"] in ("failed", "cancelled"):
+        _show_merge_job_outcome(job)
+
+    if df is None and uploaded:
+        _render_sample_preview(uploaded, base_dir, cache_key, dedupe)
+
+    if df is None and uploaded and st.button("Merge files"):
+        job_id = submit_merge(
+            uploaded,
+            base_dir=base_dir,
+            names=[f.name for f in uploaded],
+            on_done=lambda result, key=cache_key: put_result(key, result),
+            dedupe=dedupe,
+            profile=True,
+        )
+        st.session_state["merge_job_id"] = job_id
+        st.session_state["merge_job_key"] = cache_key
+        st.query_params["merge_job"] = job_id
+        st.rerun()
 
     if df is not None and not df.empty:
         try:
-            out_df = select_output_columns(df)
+            result_id = cache_key or job_id
+            keep_result(result_id, df)
             st.subheader("Merged Result")
-            st.dataframe(out_df.head(100), use_container_width=True)
+            _render_result_preview(result_id, df, "merged_preview", to_display=select_output_columns)
 
             st.subheader("Summary")
-            n_rows = len(out_df)
-            n_cols = len(out_df.columns)
-            n_countries = df["Country"].nunique() if "Country" in df.columns else 0
+            # Summary figures come from the result's rollup cube, not the full frame.
+            cube = get_rollup(result_id, df, to_output=select_output_columns)
+            by_country = query_rollup(cube, ["Country"]).dropna(subset=["Country"])
+            n_rows = len(df)
+            n_cols = len(select_output_columns(df.iloc[:0]).columns)
+            n_countries = len(by_country)
             n_files = len(uploaded) if uploaded else 0
 
             col1, col2, col3, col4 = st.columns(4)
@@ -518,19 +717,38 @@ def main() -> None:
             with col4:
                 st.metric("Files Merged", n_files)
 
-            if "Country" in df.columns and n_countries > 0:
+            duplicates = df.attrs.get("duplicates")
+            if duplicates:
+                st.caption(f"Duplicates removed: {sum(duplicates.values()):,}")
+                st.dataframe(
+                    {"Source file": list(duplicates), "Duplicate rows": list(duplicates.values())},
+                    hide_index=True,
+                )
+
+            if n_countries > 0:
                 st.caption("Rows per country")
-                counts = df["Country"].value_counts().sort_index()
-                cols = st.columns(min(len(counts), 4))
-                for i, (country, count) in enumerate(counts.items()):
+                cols = st.columns(min(n_countries, 4))
+                for i, (country, count) in enumerate(zip(by_country["Country"], by_country["Mentions"])):
                     with cols[i % len(cols)]:
                         st.metric(country, f"{count:,}")
 
-            st.download_button(
-                label="Download merged CSV",
-                data=out_df.to_csv(index=False, encoding="utf-8-sig"),
-                file_name="merged_data.csv",
-                mime="text/csv",
+            if "quality" in df.attrs:
+                _render_quality_panel(df.attrs["quality"])
+
+            with st.expander("Rollups"):
+                dims = st.multiselect(
+                    "Group by",
+                    list(ROLLUP_DIMENSIONS),
+                    default=["Country", "Quarter"],
+                    key="merged_rollup_dims",
+                )
+                st.dataframe(query_rollup(cube, dims), hide_index=True, use_container_width=True)
+
+            _render_download(
+                result_id,
+                lambda: select_output_columns(df),
+                "merged_data",
+                "merged_download_btn",
             )
         except Exception as e:
             st.error(f"Preview or download failed: {e}")
@@ -1,15 +1,36 @@
-"""Brand JSON editor: load, save, normalize, filter."""
+"""Brand JSON editor: load, save, normalize, filter, search."""
 
 from .editor import (
+    BrandLockTimeout,
+    add_brand,
+    add_keywords,
+    brand_lock,
     filter_brands_by_letter,
+    get_brand_json_version,
+    get_brand_version,
     load_brand_json,
     normalize_display_text,
+    remove_brand,
+    remove_keywords,
     save_brand_json,
+    update_brand_json,
 )
+from .index import BrandIndex, get_brand_index
 
 __all__ = [
+    "BrandIndex",
+    "BrandLockTimeout",
+    "add_brand",
+    "add_keywords",
+    "brand_lock",
     "filter_brands_by_letter",
+    "get_brand_index",
+    "get_brand_json_version",
+    "get_brand_version",
     "load_brand_json",
     "normalize_display_text",
+    "remove_brand",
+    "remove_keywords",
     "save_brand_json",
+    "update_brand_json",
 ]
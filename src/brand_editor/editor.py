@@ -1,8 +1,18 @@
-"""Brand JSON data layer: load, save, normalize."""
+"""Brand JSON data layer: load, save, normalize.
+
+Writes are serialized with a lock file (created with O_CREAT | O_EXCL), re-read
+brand.json, apply one change and atomically replace the file, then bump a
+version counter kept beside it, so concurrent editors no longer overwrite each
+other and caches can check the counter instead of re-reading the file.
+"""
 
 import json
+import os
 import re
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
 try:
     from ..constants import BRAND_JSON_FILENAME
@@ -34,12 +44,169 @@ def load_brand_json(base_dir: str | None = None) -> dict:
     return data if isinstance(data, dict) else {}
 
 
-def save_brand_json(data: dict, base_dir: str | None = None) -> None:
-    """Save brand data to JSON file."""
+BRAND_LOCK_TIMEOUT = 10.0
+BRAND_LOCK_STALE_SECONDS = 30.0
+
+
+class BrandLockTimeout(RuntimeError):
+    """Raised when the brand JSON lock could not be taken in time."""
+
+
+def _sidecar(path: Path, suffix: str) -> Path:
+    """Return the lock or version file next to brand JSON."""
+    return path.with_name(path.name + suffix)
+
+
+def get_brand_version(base_dir: str | None = None) -> int:
+    """Return the write counter of brand JSON (0 before the first locked write)."""
+    try:
+        return int(_sidecar(get_brand_json_path(base_dir), ".version").read_text(encoding="ascii"))
+    except (OSError, ValueError):
+        return 0
+
+
+def get_brand_json_version(base_dir: str | None = None) -> str:
+    """Return a cheap version token for brand JSON (write counter plus file stat, so hand edits count too)."""
+    path = get_brand_json_path(base_dir)
+    try:
+        st = path.stat()
+    except OSError:
+        return "missing"
+    return f"{get_brand_version(base_dir)}-{st.st_mtime_ns}-{st.st_size}"
+
+
+@contextmanager
+def brand_lock(base_dir: str | None = None, timeout: float = BRAND_LOCK_TIMEOUT) -> Iterator[None]:
+    """Hold the brand JSON lock file; a lock older than BRAND_LOCK_STALE_SECONDS is taken over."""
+    path = _sidecar(get_brand_json_path(base_dir), ".lock")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - path.stat().st_mtime > BRAND_LOCK_STALE_SECONDS:
+                    path.unlink(missing_ok=True)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() >= deadline:
+                raise BrandLockTimeout(f"Brand JSON is locked by another editor ({path}).")
+            time.sleep(0.05)
+    try:
+        os.write(fd, f"{os.getpid()}\n".encode("ascii"))
+        os.close(fd)
+        yield
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def _replace_file(path: Path, text: str) -> None:
+    """Write text to a temporary file and rename it over path."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _write_locked(data: dict, base_dir: str | None) -> None:
+    """Atomically replace brand JSON and bump its version; caller holds the lock."""
     path = get_brand_json_path(base_dir)
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _replace_file(path, json.dumps(data, ensure_ascii=False, indent=2))
+    _replace_file(_sidecar(path, ".version"), str(get_brand_version(base_dir) + 1))
+
+
+def save_brand_json(data: dict, base_dir: str | None = None) -> None:
+    """Save brand data to JSON file (locked, atomic replace of the whole file)."""
+    with brand_lock(base_dir):
+        _write_locked(data, base_dir)
+
+
+def update_brand_json(change: Callable[[dict], bool], base_dir: str | None = None) -> bool:
+    """
+    Apply change(data) to the current brand JSON under the lock and save it if
+    change returns True. Returns what change returned.
+    """
+    with brand_lock(base_dir):
+        data = load_brand_json(base_dir)
+        changed = change(data)
+        if changed:
+            _write_locked(data, base_dir)
+    return changed
+
+
+def _clean_keywords(keywords: Iterable[str]) -> list[str]:
+    """Strip keywords and drop blanks and repeats (case-insensitive), keeping order."""
+    seen: dict[str, str] = {}
+    for kw in keywords:
+        kw = kw.strip() if isinstance(kw, str) else ""
+        if kw and kw.lower() not in seen:
+            seen[kw.lower()] = kw
+    return list(seen.values())
+
+
+def add_brand(brand: str, keywords: Iterable[str] = (), base_dir: str | None = None) -> bool:
+    """Add a Brand with keywords; False if it already exists."""
+    brand = brand.strip()
+    keywords = _clean_keywords(keywords)
+
+    def change(data: dict) -> bool:
+        if not brand or brand in data:
+            return False
+        data[brand] = keywords
+        return True
+
+    return update_brand_json(change, base_dir)
+
+
+def add_keywords(brand: str, keywords: Iterable[str], base_dir: str | None = None) -> int:
+    """Append keywords the Brand does not have yet (creating it if needed); return how many were added."""
+    brand = brand.strip()
+    keywords = _clean_keywords(keywords)
+    added: list[str] = []
+
+    def change(data: dict) -> bool:
+        nonlocal added
+        current = data.get(brand)
+        current = current if isinstance(current, list) else []
+        have = {str(kw).strip().lower() for kw in current}
+        added = [kw for kw in keywords if kw.lower() not in have]
+        if not brand or (brand in data and not added):
+            return False
+        data[brand] = current + added
+        return True
+
+    update_brand_json(change, base_dir)
+    return len(added)
+
+
+def remove_brand(brand: str, base_dir: str | None = None) -> bool:
+    """Remove a Brand; False if it does not exist."""
+    return update_brand_json(lambda data: data.pop(brand, None) is not None, base_dir)
+
+
+def remove_keywords(brand: str, keywords: Iterable[str], base_dir: str | None = None) -> int:
+    """Remove keywords from a Brand; return how many were removed."""
+    drop = set(keywords)
+    removed = 0
+
+    def change(data: dict) -> bool:
+        nonlocal removed
+        current = data.get(brand)
+        if not isinstance(current, list):
+            return False
+        kept = [kw for kw in current if kw not in drop]
+        removed = len(current) - len(kept)
+        data[brand] = kept
+        return removed > 0
+
+    update_brand_json(change, base_dir)
+    return removed
 
 
 def normalize_display_text(raw: str) -> str:
@@ -0,0 +1,78 @@
+"""Search and reverse-alias index over brand JSON, cached per brand JSON version."""
+
+import threading
+from bisect import bisect_left
+
+from .editor import get_brand_json_version, load_brand_json
+
+
+class BrandIndex:
+    """Brands and keywords of one brand JSON version, indexed for search and alias lookups."""
+
+    def __init__(self, data: dict, version: str = ""):
+        self.data = data
+        self.version = version
+        self.brands = sorted(data)
+        # (lowercase term, Brand, term as written) for every Brand name and keyword, sorted.
+        entries: list[tuple[str, str, str]] = []
+        owners: dict[str, set[str]] = {}
+        for brand, keywords in data.items():
+            terms = [str(brand).strip()]
+            if isinstance(keywords, list):
+                terms += [kw.strip() for kw in keywords if isinstance(kw, str) and kw.strip()]
+            for term in dict.fromkeys(t for t in terms if t):
+                key = term.lower()
+                entries.append((key, brand, term))
+                owners.setdefault(key, set()).add(brand)
+        entries.sort()
+        self._entries = entries
+        self._keys = [e[0] for e in entries]
+        self._owners = {key: sorted(brands) for key, brands in owners.items()}
+
+    def owners(self, alias: str) -> list[str]:
+        """Return the Brands whose name or keywords include alias (case-insensitive)."""
+        return self._owners.get(alias.strip().lower(), [])
+
+    def collisions(self) -> dict[str, list[str]]:
+        """Return aliases that resolve to more than one Brand (the merge keeps the last one)."""
+        return {key: brands for key, brands in self._owners.items() if len(brands) > 1}
+
+    def search(self, text: str, substring: bool = False) -> list[tuple[str, str]]:
+        """
+        Return (Brand, matching term) for Brand names and keywords starting with
+        text (binary search), or containing it with substring=True (linear scan).
+        """
+        query = text.strip().lower()
+        if not query:
+            return []
+        if substring:
+            return [(brand, term) for key, brand, term in self._entries if query in key]
+        matches = []
+        for i in range(bisect_left(self._keys, query), len(self._keys)):
+            if not self._keys[i].startswith(query):
+                break
+            _, brand, term = self._entries[i]
+            matches.append((brand, term))
+        return matches
+
+    def matching_brands(self, text: str, substring: bool = False) -> list[str]:
+        """Return the Brands (sorted) whose name or any keyword matches text."""
+        return sorted({brand for brand, _ in self.search(text, substring)})
+
+
+_lock = threading.Lock()
+_indexes: dict[str, BrandIndex] = {}
+
+
+def get_brand_index(base_dir: str | None = None) -> BrandIndex:
+    """Return the index of the current brand JSON, rebuilt only when its version changes."""
+    version = get_brand_json_version(base_dir)
+    key = str(base_dir)
+    with _lock:
+        index = _indexes.get(key)
+        if index is not None and index.version == version:
+            return index
+    index = BrandIndex(load_brand_json(base_dir), version)
+    with _lock:
+        _indexes[key] = index
+    return index
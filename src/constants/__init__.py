@@ -91,10 +91,31 @@ CANONICAL_OUTPUT_COLUMNS = (
     "Media Type",
 )
 
+# Merged rows remember the file they came from (not written to the output).
+SOURCE_FILE_COLUMN = "Source File"
+
 OUTPUT_DIR = "output"
 OUTPUT_ENCODING = "utf-8-sig"
 RAW_DATA_PATH = r"C:\Users\Lerry\Desktop\test\raw_data"
 BRAND_JSON_FILENAME = "data/brand.json"
+# Learned CSV ingest profiles (dialect, date format, column roles) keyed by header fingerprint.
+READER_PROFILES_FILENAME = "data/reader_profiles.json"
+# Persistent SQLite store of merged mentions, upserted by normalized URL + Date.
+MENTIONS_STORE_FILENAME = "data/mentions.sqlite"
+
+# Merge result cache shared by app reruns and sessions (see src/results).
+RESULT_CACHE_DIR = "output/.cache/results"
+RESULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+RESULT_CACHE_SPILL_BYTES = 64 * 1024 * 1024
+RESULT_CACHE_DISK_MAX_BYTES = 2 * 1024 * 1024 * 1024
+RESULT_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+# Sorted runs and aggregation partitions spilled by the external sort / group-by.
+SPILL_DIR = "output/.cache/spill"
+
+# Per-stage output columns reused by --stage-cache, least recently used first out.
+STAGE_CACHE_DIR = "output/.cache/stages"
+STAGE_CACHE_MAX_BYTES = 1024 * 1024 * 1024
 
 # Encodings to try for CSV (UTF-8, UTF-16, etc.). Used by Annual CSV Merger.
 COMMON_ENCODINGS = [
@@ -112,3 +133,13 @@ COMMON_ENCODINGS = [
     "cp1250",
     "cp1251",
 ]
+
+# Background merge jobs (app and local merge service).
+MERGE_JOB_WORKERS = 4
+MERGE_JOB_RETENTION_SECONDS = 60 * 60
+# Local merge service (python -m src.quarterly_csv_merger --serve); loopback only.
+MERGE_SERVICE_HOST = "127.0.0.1"
+MERGE_SERVICE_PORT = 8765
+
+# Download files generated on demand, one per result and format.
+EXPORT_CACHE_DIR = "output/.cache/exports"
@@ -1,29 +1,67 @@
-"""Merge CSV/Excel by country keywords; ingest, clean, tag, transform, output."""
-
-from .pipeline import merge_data, run_merge_and_save, main
-from .ingest import process_file, collect_files
-from .columns import select_output_columns
-from .tagging import (
-    add_market_column,
-    add_media_platform_column,
-    add_media_type_column,
-    add_brand_from_keywords,
-)
-from .transforms import add_date_columns, set_engagement_from_sum
-from .cleaning import drop_blank_url_rows
-
-__all__ = [
-    "merge_data",
-    "run_merge_and_save",
-    "main",
-    "process_file",
-    "collect_files",
-    "select_output_columns",
-    "add_market_column",
-    "add_media_platform_column",
-    "add_media_type_column",
-    "add_date_columns",
-    "set_engagement_from_sum",
-    "add_brand_from_keywords",
-    "drop_blank_url_rows",
-]
+"""Merge CSV/Excel by country keywords; ingest, clean, tag, transform, output.
+
+The public names below are imported from their submodules on first access, so
+importing the package (or one light submodule) does not load pandas and every
+stage up front.
+"""
+
+import importlib
+
+# public name -> submodule that defines it
+_EXPORTS = {
+    "STAGES": ".pipeline",
+    "merge_data": ".pipeline",
+    "merge_sources": ".pipeline",
+    "run_stages": ".pipeline",
+    "run_merge_and_save": ".pipeline",
+    "run_out_of_core_and_save": ".pipeline",
+    "main": ".pipeline",
+    "ENGINES": ".engines",
+    "clear_stage_cache": ".stage_cache",
+    "process_file": ".ingest",
+    "collect_files": ".ingest",
+    "select_output_columns": ".columns",
+    "add_market_column": ".tagging",
+    "add_media_platform_column": ".tagging",
+    "add_media_type_column": ".tagging",
+    "add_date_columns": ".transforms",
+    "set_engagement_from_sum": ".transforms",
+    "add_brand_from_keywords": ".tagging",
+    "drop_blank_url_rows": ".cleaning",
+    "normalize_url": ".cleaning",
+    "JobCancelled": ".jobs",
+    "cancel_job": ".jobs",
+    "get_job": ".jobs",
+    "list_jobs": ".jobs",
+    "submit_merge": ".jobs",
+    "run_incremental": ".incremental",
+    "watch_folder": ".incremental",
+    "QUALITY_METRICS": ".quality",
+    "check_thresholds": ".quality",
+    "write_profile": ".quality",
+    "PREVIEW_ROWS": ".preview",
+    "tag_distributions": ".preview",
+    "open_store": ".store",
+    "query_store": ".store",
+    "sync_store": ".store",
+    "upsert_mentions": ".store",
+    "run_client": ".service",
+    "serve": ".service",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Import a public name from its submodule on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List module globals and the lazily imported public names."""
+    return sorted(set(globals()) | set(__all__))
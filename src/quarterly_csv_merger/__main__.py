@@ -1,6 +1,17 @@
 """CLI entry for merger module."""
 
-from .pipeline import main
+import sys
+
+from .service import run_client
 
 if __name__ == "__main__":
-    main()
+    argv = sys.argv[1:]
+    if "--via-service" in argv:
+        # Forwarded before the pipeline (and pandas) is imported; see service.py.
+        code = run_client(argv)
+        if code is not None:
+            sys.exit(code)
+        argv = [a for a in argv if a != "--via-service"]
+    from .pipeline import main
+
+    main(argv)
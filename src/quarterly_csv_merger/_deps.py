@@ -6,6 +6,10 @@ try:
         ENGAGEMENT_COLS,
         KEYWORDS,
         MARKET_BY_CODE,
+        MENTIONS_STORE_FILENAME,
+        MERGE_JOB_RETENTION_SECONDS,
+        MERGE_JOB_WORKERS,
+        MERGE_SERVICE_PORT,
         MEDIA_PLATFORM_SOCIAL,
         NAME_COLUMN_CANDIDATES,
         OUTPUT_CSV_COLUMNS,
@@ -13,14 +17,36 @@ try:
         OUTPUT_ENCODING,
         OWNED_ACCOUNTS,
         RAW_DATA_PATH,
+        SOURCE_FILE_COLUMN,
+        SPILL_DIR,
+        STAGE_CACHE_DIR,
+        STAGE_CACHE_MAX_BYTES,
     )
-    from ..reader import load_table
+    from ..reader import (
+        ReadAborted,
+        ReadProgress,
+        TableSource,
+        content_digest,
+        load_table,
+        read_csv,
+        source_name,
+        source_size,
+    )
+    from ..reader.archives import ARCHIVE_ERRORS, ArchiveMember, archive_members, is_archive
+    from ..reader.mapped import MAPPED_MIN_BYTES
+    from ..reader.profiles import PROFILE_SAMPLE_BYTES, forget_profile, get_profile, header_fingerprint, update_profile
+    from ..reader.sources import is_path, open_owned, read_head
+    from ..reader.transcode import TranscodingReader, is_native
 except ImportError:
     from constants import (
         BRAND_JSON_FILENAME,
         ENGAGEMENT_COLS,
         KEYWORDS,
         MARKET_BY_CODE,
+        MENTIONS_STORE_FILENAME,
+        MERGE_JOB_RETENTION_SECONDS,
+        MERGE_JOB_WORKERS,
+        MERGE_SERVICE_PORT,
         MEDIA_PLATFORM_SOCIAL,
         NAME_COLUMN_CANDIDATES,
         OUTPUT_CSV_COLUMNS,
@@ -28,5 +54,23 @@ except ImportError:
         OUTPUT_ENCODING,
         OWNED_ACCOUNTS,
         RAW_DATA_PATH,
+        SOURCE_FILE_COLUMN,
+        SPILL_DIR,
+        STAGE_CACHE_DIR,
+        STAGE_CACHE_MAX_BYTES,
+    )
+    from reader import (
+        ReadAborted,
+        ReadProgress,
+        TableSource,
+        content_digest,
+        load_table,
+        read_csv,
+        source_name,
+        source_size,
     )
-    from reader import load_table
+    from reader.archives import ARCHIVE_ERRORS, ArchiveMember, archive_members, is_archive
+    from reader.mapped import MAPPED_MIN_BYTES
+    from reader.profiles import PROFILE_SAMPLE_BYTES, forget_profile, get_profile, header_fingerprint, update_profile
+    from reader.sources import is_path, open_owned, read_head
+    from reader.transcode import TranscodingReader, is_native
@@ -1,5 +1,14 @@
 """Cleaning: remove invalid or unwanted rows."""
 
 from .blank_url_remover import drop_blank_url_rows
+from .duplicate_remover import DuplicateIndex, drop_duplicate_mentions, mention_keys
+from .url_normalizer import normalize_url, normalize_urls
 
-__all__ = ["drop_blank_url_rows"]
+__all__ = [
+    "drop_blank_url_rows",
+    "DuplicateIndex",
+    "drop_duplicate_mentions",
+    "mention_keys",
+    "normalize_url",
+    "normalize_urls",
+]
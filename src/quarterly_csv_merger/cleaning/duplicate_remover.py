@@ -0,0 +1,105 @@
+"""Drop duplicate mentions across files, keyed on normalized URL + Date + Influencer.
+
+Each row is reduced to a 64-bit hash of its key, and a DuplicateIndex keeps the
+sorted hashes seen so far (8 bytes per mention), so batches, chunks and runs
+can be checked against everything already kept without holding the rows.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .._deps import SOURCE_FILE_COLUMN
+from ..columns import find_column_by_pattern
+from .url_normalizer import normalize_urls
+
+
+class DuplicateIndex:
+    """Sorted set of 64-bit mention keys already kept."""
+
+    def __init__(self, keys: np.ndarray | None = None):
+        self._keys = np.unique(keys).astype(np.uint64) if keys is not None else np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def mark(self, keys: np.ndarray) -> np.ndarray:
+        """Return a mask of keys that are duplicates (seen before or earlier in keys); add the rest."""
+        keys = np.asarray(keys, dtype=np.uint64)
+        seen = self._keys
+        if len(seen):
+            pos = np.minimum(np.searchsorted(seen, keys), len(seen) - 1)
+            dup = seen[pos] == keys
+        else:
+            dup = np.zeros(len(keys), dtype=bool)
+        dup |= pd.Series(keys).duplicated().to_numpy()
+        self._keys = np.union1d(seen, keys[~dup])
+        return dup
+
+    def save(self, path: str | Path, tag: str = "") -> None:
+        """Write the index atomically (.npz); tag records what state it covers."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, keys=self._keys, tag=np.array(tag))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path, tag: str = "") -> "DuplicateIndex | None":
+        """Read an index written by save; None if missing, unreadable or saved with another tag."""
+        try:
+            with np.load(path) as data:
+                if str(data["tag"]) != tag:
+                    return None
+                return cls(data["keys"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def mention_keys(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return (64-bit key per row, mask of rows that can be keyed). Rows without a
+    URL are never treated as duplicates.
+    """
+    url_col = find_column_by_pattern(df, r"url")
+    if url_col is None:
+        return np.zeros(len(df), dtype=np.uint64), np.zeros(len(df), dtype=bool)
+    url = normalize_urls(df[url_col])
+    date = pd.to_datetime(df["Date"], errors="coerce") if "Date" in df.columns else pd.Series(pd.NaT, index=df.index)
+    influencer = df["Influencer"] if "Influencer" in df.columns else pd.Series("", index=df.index)
+    parts = pd.DataFrame(
+        {
+            "url": url,
+            "date": date.dt.strftime("%Y-%m-%d %H:%M:%S").fillna(""),
+            "influencer": influencer.fillna("").astype(str).str.strip().str.lower(),
+        }
+    )
+    keys = pd.util.hash_pandas_object(parts, index=False).to_numpy(dtype=np.uint64)
+    return keys, (url != "").to_numpy()
+
+
+def drop_duplicate_mentions(
+    df: pd.DataFrame,
+    index: DuplicateIndex | None = None,
+) -> tuple[pd.DataFrame, dict[str, int]]:
+    """
+    Drop rows whose URL + Date + Influencer was already seen (earlier in df or in
+    index); the first occurrence is kept. Returns (deduplicated df, duplicates per
+    source file from the Source File column).
+    """
+    if df.empty:
+        return df, {}
+    index = index if index is not None else DuplicateIndex()
+    keys, keyed = mention_keys(df)
+    dup = np.zeros(len(df), dtype=bool)
+    dup[keyed] = index.mark(keys[keyed])
+    if not dup.any():
+        return df, {}
+    if SOURCE_FILE_COLUMN in df.columns:
+        report = df.loc[dup, SOURCE_FILE_COLUMN].fillna("").value_counts().sort_index().to_dict()
+    else:
+        report = {"": int(dup.sum())}
+    return df.loc[~dup].reset_index(drop=True), report
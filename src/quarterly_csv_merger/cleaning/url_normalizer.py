@@ -0,0 +1,50 @@
+"""Normalize mention URLs into a stable key for de-duplication and upserts."""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import pandas as pd
+
+# Query parameters that only track the click and never identify the mention.
+TRACKING_QUERY_PARAMS = ("fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "ref", "si")
+
+
+def normalize_url(url) -> str:
+    """
+    Return a canonical form of url: lower-case scheme and host without "www.",
+    no fragment, no tracking parameters (utm_*, fbclid, ...), sorted query and
+    no trailing slash. Blank values give ""; a value urlsplit cannot parse
+    (e.g. "http://[::1") gives itself, stripped and lower-cased.
+    """
+    if url is None or (not isinstance(url, str) and pd.isna(url)):
+        return ""
+    raw = str(url).strip()
+    if not raw:
+        return ""
+    url = raw if "://" in raw else "https://" + raw
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return raw.lower()
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_QUERY_PARAMS
+    )
+    path = parts.path.rstrip("/")
+    try:
+        return urlunsplit((scheme, host, path, urlencode(query), ""))
+    except ValueError:
+        return raw.lower()
+
+
+def normalize_urls(values: pd.Series) -> pd.Series:
+    """Vectorised normalize_url: each distinct URL is normalized once."""
+    uniques = pd.unique(values)
+    mapping = {u: normalize_url(u) for u in uniques}
+    return values.map(mapping).astype(object)
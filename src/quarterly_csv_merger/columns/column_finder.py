@@ -3,7 +3,7 @@
 import re
 import pandas as pd
 
-from .._deps import NAME_COLUMN_CANDIDATES, OUTPUT_CSV_COLUMNS
+from .._deps import NAME_COLUMN_CANDIDATES, OUTPUT_CSV_COLUMNS, SOURCE_FILE_COLUMN
 
 
 def get_name_column(df: pd.DataFrame) -> str | None:
@@ -15,9 +15,12 @@ def get_name_column(df: pd.DataFrame) -> str | None:
 
 
 def find_column_by_pattern(df: pd.DataFrame, pattern: str) -> str | None:
-    """Return first column matching pattern (case-insensitive), or None."""
+    """
+    Return first column matching pattern (case-insensitive), or None. The Source File
+    label added by merge_sources is never an input column (it would match "source").
+    """
     for col in df.columns:
-        if re.search(pattern, str(col), re.IGNORECASE):
+        if col != SOURCE_FILE_COLUMN and re.search(pattern, str(col), re.IGNORECASE):
             return col
     return None
 
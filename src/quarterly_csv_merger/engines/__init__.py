@@ -0,0 +1,27 @@
+"""Execution engines for country assignment and the pipeline stages.
+
+"pandas" runs the functions of the ingest, cleaning, tagging and transforms
+packages. "polars" computes the same columns with multithreaded Polars
+expressions and hands back a pandas DataFrame identical to the pandas engine's
+(Polars is an optional dependency, imported only when the engine is used).
+The "duckdb" out-of-core merge (duckdb_engine) writes the output CSV itself
+and is run with --out-of-core rather than selected here.
+"""
+
+ENGINES = ("pandas", "polars")
+DEFAULT_ENGINE = "pandas"
+
+# Characters str.strip() and the re module's \s treat as whitespace (all below U+3001),
+# and the same set as a regex character class body (\x{..} escapes, Rust regex / RE2).
+PY_WHITESPACE = "".join(chr(c) for c in range(0x3001) if chr(c).isspace())
+PY_WHITESPACE_CLASS = "".join(f"\\x{{{ord(c):x}}}" for c in PY_WHITESPACE)
+
+
+def check_engine(engine: str) -> str:
+    """Return engine if known; raise ValueError otherwise."""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine} (expected one of {', '.join(ENGINES)})")
+    return engine
+
+
+__all__ = ["DEFAULT_ENGINE", "ENGINES", "PY_WHITESPACE", "PY_WHITESPACE_CLASS", "check_engine"]
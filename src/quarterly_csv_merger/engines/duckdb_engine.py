@@ -0,0 +1,611 @@
+"""DuckDB engine: out-of-core merge of CSV exports straight to the output CSV.
+
+Every CSV is scanned by DuckDB as text (with pandas' missing-value strings), its
+column types are inferred by pandas' rules, and its rows are inserted, typed as
+pd.concat would type them and already filtered by country and blank URL, into
+a table of an on-disk database in the spill folder. The other stages are SQL
+over that table: the taggers are RE2 expressions with Python's whitespace and
+case rules spelled out, dates go through the pandas date parser one vector at
+a time, Engagement follows pd.to_numeric, and Brand is a join of the exploded
+keyword lists with the brand.json alias table. Output rows stream back in input
+order, typed as the pandas engine types them, through the regular CSV writer,
+so data.csv is identical to merge_data's while memory stays within DuckDB's
+limit (the table, the join and the ordering spill to disk).
+Excel sources are skipped. DuckDB is an optional dependency, imported only
+when the engine is used.
+"""
+
+import io
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+
+from .._deps import (
+    BRAND_JSON_FILENAME,
+    ENGAGEMENT_COLS,
+    KEYWORDS,
+    MARKET_BY_CODE,
+    MEDIA_PLATFORM_SOCIAL,
+    OUTPUT_CSV_COLUMNS,
+    OWNED_ACCOUNTS,
+    SOURCE_FILE_COLUMN,
+    TableSource,
+    TranscodingReader,
+    get_profile,
+    is_native,
+    is_path,
+    open_owned,
+    read_csv,
+    source_name,
+    update_profile,
+)
+from ..columns import find_column_by_pattern, find_columns_by_patterns, get_name_column
+from ..ingest.country_keywords import _resolve_roles, keyword_from_filename
+from ..output.chunked import CHUNK_ROWS
+from ..tagging.brand_resolver import load_brand_alias_map
+from ..tagging.media_platform_tagger import _normalize_handle
+from ..transforms import detect_date_format, parse_dates
+from ..transforms.date_columns import DATE_SAMPLE_SIZE
+from . import PY_WHITESPACE, PY_WHITESPACE_CLASS
+
+DUCKDB_SNIFF_ROWS = 1_000
+# Longest CSV record, and the read buffer (DuckDB's default is 16 records of the maximum).
+DUCKDB_MAX_LINE_BYTES = 16 << 20
+DUCKDB_BUFFER_BYTES = 32 << 20
+
+# Text pandas' parsers read as numbers (C whitespace around the value is allowed).
+_C_SPACE = " \t\n\r\f\v"
+_INT_PATTERN = r"[ \t\n\r\f\v]*[+-]?[0-9]+[ \t\n\r\f\v]*"
+_FLOAT_PATTERN = (
+    r"(?i)[ \t\n\r\f\v]*[+-]?(?:(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:e[+-]?[0-9]+)?|inf|infinity)[ \t\n\r\f\v]*"
+)
+_TRUE_VALUES = ("True", "TRUE", "true")
+_BOOL_VALUES = (*_TRUE_VALUES, "False", "FALSE", "false")
+
+# A column of each inferred kind; pd.concat of these gives a merged column's dtype.
+# "empty" is an all-missing column (float64), "boolna" booleans with gaps (object).
+_KIND_SAMPLES = {
+    "int": pd.Series([1, 2]),
+    "float": pd.Series([0.5, 1.5]),
+    "empty": pd.Series([float("nan")] * 2),
+    "bool": pd.Series([True, False]),
+    "boolna": pd.Series([True, float("nan")], dtype=object),
+    "str": pd.Series(["a", "b"], dtype="str"),
+    "datetime": pd.Series(pd.to_datetime(["2024-01-01", "2024-01-02"])),
+}
+_SQL_TYPES = {
+    "int": "BIGINT",
+    "float": "DOUBLE",
+    "bool": "BOOLEAN",
+    "str": "VARCHAR",
+    "datetime": "TIMESTAMP",
+    "object": "VARCHAR",
+}
+
+
+def _require_duckdb():
+    """Import duckdb or raise a clear error."""
+    try:
+        import duckdb
+    except ImportError as e:
+        raise RuntimeError("The out-of-core merge requires duckdb (pip install duckdb).") from e
+    return duckdb
+
+
+def _lit(value: str) -> str:
+    """SQL string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _lits(values) -> str:
+    """Comma-separated SQL string literals."""
+    return ", ".join(_lit(v) for v in values)
+
+
+def _schema(columns: list) -> pd.DataFrame:
+    """Empty frame with the given columns, for the pandas column finders."""
+    return pd.DataFrame(columns=columns)
+
+
+def _stripped(expr: str) -> str:
+    """SQL for str(value).strip()."""
+    return f"trim(CAST({expr} AS VARCHAR), {_lit(PY_WHITESPACE)})"
+
+
+def _number(expr: str, sql_type: str) -> str:
+    """SQL casting number text (C whitespace around it allowed) to sql_type, NULL if it does not fit."""
+    return f"TRY_CAST(trim({expr}, {_lit(_C_SPACE)}) AS {sql_type})"
+
+
+def _dtype_kind(dtype) -> str:
+    """Kind of a merged pandas dtype."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "int"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float"
+    if isinstance(dtype, pd.StringDtype):
+        return "str"
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return "datetime"
+    return "object"
+
+
+def _column_kind(total: int, present: int, ints: int, int_like: int, floats: int, bools: int) -> str:
+    """Kind pandas' read_csv infers for a column from counts of its non-missing values."""
+    if not present:
+        return "empty"
+    if int_like == present:
+        if ints < present:
+            return "str"  # beyond int64: pandas keeps Python ints
+        return "int" if present == total else "float"
+    if floats == present:
+        return "float"
+    if bools == present:
+        return "bool" if present == total else "boolna"
+    return "str"
+
+
+def _date_parser(date_format: str | None) -> Callable:
+    """Arrow UDF parsing a vector of date text exactly as process_file does."""
+    import pyarrow as pa
+
+    def parse(values):
+        parsed = parse_dates(values.to_pandas(), date_format)
+        if not pd.api.types.is_datetime64_dtype(parsed):
+            raise ValueError("Dates with time zones are not supported by the out-of-core merge.")
+        return pa.array(parsed.dt.as_unit("us"), type=pa.timestamp("us"))
+
+    return parse
+
+
+def _scan_sql(path: str, sep: str, width: int) -> str:
+    """read_csv call returning the file's fields as text columns f0, f1, ... (missing as NULL)."""
+    columns = ", ".join(f"'f{j}': 'VARCHAR'" for j in range(width))
+    return (
+        f"read_csv({_lit(path)}, delim={_lit(sep)}, quote='\"', escape='\"', header=true, "
+        f"auto_detect=false, null_padding=true, parallel=false, "
+        f"max_line_size={DUCKDB_MAX_LINE_BYTES}, buffer_size={DUCKDB_BUFFER_BYTES}, "
+        f"nullstr=[{_lits(sorted(STR_NA_VALUES))}], columns={{{columns}}})"
+    )
+
+
+def _country_sql(raw: str | None, file_keyword: str | None) -> str:
+    """SQL for the country of each row (see ingest.row_matches_keyword)."""
+    fallback = _lit(KEYWORDS.get(file_keyword, "") if file_keyword else "")
+    if raw is None:
+        return fallback
+    cases = []
+    for code, country in KEYWORDS.items():
+        pattern = rf"(?:^|[{PY_WHITESPACE_CLASS},]){re.escape(code)}[{PY_WHITESPACE_CLASS}_\-]"
+        cases.append(f"WHEN regexp_matches(upper({raw}), {_lit(pattern)}) THEN {_lit(country)}")
+    return f"CASE {' '.join(cases)} ELSE {fallback} END"
+
+
+def _prepare_file(con, path: TableSource, label: str, index: int, workdir: Path, base_dir: str) -> dict | None:
+    """
+    Detect one CSV's dialect, column kinds, roles and date format (learning the
+    reader profile as process_file does); None if no row is kept.
+    """
+    sniff = read_csv(path, nrows=DUCKDB_SNIFF_ROWS, base_dir=base_dir)
+    if sniff.empty:
+        return None
+    fingerprint = sniff.attrs.get("ingest_fingerprint")
+    profile = get_profile(fingerprint, base_dir)
+    if not (profile and profile.get("sep") and profile.get("encoding")):
+        raise ValueError("Could not detect the CSV dialect.")
+    if not isinstance(sniff.index, pd.RangeIndex):
+        raise ValueError("Rows have more fields than the header.")
+    sep, encoding = profile["sep"], profile["encoding"]
+    if not is_native(encoding) or not is_path(path):
+        # DuckDB scans UTF-8 files: archive members are decompressed (and others
+        # transcoded) into the work folder as they are copied.
+        utf8_path = workdir / f"source-{index}.csv"
+        with open_owned(path) as src, open(utf8_path, "wb") as dst:
+            stream = src if is_native(encoding) else io.BufferedReader(TranscodingReader(src, encoding))
+            shutil.copyfileobj(stream, dst, 1 << 20)
+        path = str(utf8_path)
+    columns = [str(c) for c in sniff.columns]
+    raw = {col: f"f{j}" for j, col in enumerate(columns)}
+    scan = _scan_sql(path, sep, len(columns))
+    roles = _resolve_roles(_schema(columns), profile)
+    country = _country_sql(raw.get(roles.get("name")), keyword_from_filename(label))
+
+    counts = []
+    for f in raw.values():
+        counts += [
+            f"count({f})",
+            f"count_if(regexp_full_match({f}, {_lit(_INT_PATTERN)}) AND {_number(f, 'BIGINT')} IS NOT NULL)",
+            f"count_if(regexp_full_match({f}, {_lit(_INT_PATTERN)}))",
+            f"count_if(regexp_full_match({f}, {_lit(_FLOAT_PATTERN)}))",
+            f"count_if({f} IN ({_lits(_BOOL_VALUES)}))",
+        ]
+    row = con.execute(f"SELECT count(*), count_if(({country}) <> ''), {', '.join(counts)} FROM {scan}").fetchone()
+    total, kept = row[0], row[1]
+    if not kept:
+        return None
+    kinds = {col: _column_kind(total, *row[2 + 5 * j : 7 + 5 * j]) for j, col in enumerate(columns)}
+
+    values = dict(raw)
+    date_col = roles.get("date")
+    date_format = profile.get("date_format")
+    if date_col is not None:
+        if not date_format:
+            sample = con.execute(
+                f"SELECT {raw[date_col]} FROM {scan} WHERE {raw[date_col]} IS NOT NULL LIMIT {DATE_SAMPLE_SIZE}"
+            ).fetchall()
+            date_format = detect_date_format(pd.Series([v for (v,) in sample], dtype="str"))
+        udf = f"parse_dates_{index}"
+        con.create_function(
+            udf, _date_parser(date_format), ["VARCHAR"], "TIMESTAMP", type="arrow", null_handling="special"
+        )
+        kinds[date_col] = "datetime"
+        values[date_col] = f"{udf}({raw[date_col]})"
+    update_profile(fingerprint, base_dir, roles=roles, date_format=date_format)
+
+    kinds["Country"] = kinds[SOURCE_FILE_COLUMN] = "str"
+    values["Country"] = "__country"
+    values[SOURCE_FILE_COLUMN] = _lit(label)
+    return {"label": label, "scan": scan, "country": country, "kinds": kinds, "values": values}
+
+
+def _value_sql(file: dict, col: str, merged: str) -> str:
+    """SQL for a file's values of col in the merged column's type (object: as pandas prints them)."""
+    kind = file["kinds"].get(col)
+    if kind is None:
+        return f"CAST(NULL AS {_SQL_TYPES[merged]})"
+    value = file["values"][col]
+    if col == "Country" or col == SOURCE_FILE_COLUMN or (kind == merged and kind in ("str", "datetime")):
+        return value
+    is_true = f"({value} IN ({_lits(_TRUE_VALUES)}))"
+    if merged == "int" and kind in ("int", "bool"):
+        return _number(value, "BIGINT") if kind == "int" else f"CAST({is_true} AS BIGINT)"
+    if merged == "float" and kind in ("int", "float", "empty"):
+        return _number(value, "DOUBLE")
+    if merged == "bool" and kind == "bool":
+        return is_true
+    if merged == "object":
+        if kind == "int":
+            return f"CAST({_number(value, 'BIGINT')} AS VARCHAR)"
+        if kind in ("float", "empty"):
+            return f"CAST({_number(value, 'DOUBLE')} AS VARCHAR)"
+        if kind in ("bool", "boolna"):
+            return f"CASE WHEN {value} IS NULL THEN NULL WHEN {is_true} THEN 'True' ELSE 'False' END"
+        if kind == "str":
+            return value
+        if kind == "datetime":
+            # str(pd.Timestamp): microseconds only when there are any.
+            return (
+                f"strftime({value}, '%Y-%m-%d %H:%M:%S') || "
+                f"CASE WHEN microsecond({value}) % 1000000 <> 0 THEN strftime({value}, '.%f') ELSE '' END"
+            )
+    raise ValueError(f"Column {col!r} mixes {kind} and {merged} values; merge it with the pandas or polars engine.")
+
+
+def _text_sql(col: str, kinds: dict, refs: dict, flags: dict) -> str:
+    """SQL for isinstance(value, str) of a merged column."""
+    if kinds.get(col) == "str":
+        return f"({refs[col]} IS NOT NULL)"
+    return flags.get(col, "false")
+
+
+class _Stages:
+    """SQL of the stages after blank-URL removal, tracking pandas' column order."""
+
+    def __init__(self, con, columns: list, kinds: dict, refs: dict, flags: dict, base_dir: str):
+        self.con = con
+        self.columns = columns
+        self.kinds = kinds
+        self.refs = refs
+        self.flags = flags
+        self.base_dir = base_dir
+        self.select: list[str] = []
+        self.join = ""
+
+    def schema(self) -> pd.DataFrame:
+        return _schema(self.columns)
+
+    def text(self, col: str) -> str:
+        return _text_sql(col, self.kinds, self.refs, self.flags)
+
+    def relation(self) -> str:
+        """SQL of the rows with the columns added so far."""
+        added = "".join(f", {expr}" for expr in self.select)
+        return f"(SELECT r.rowid AS __row, r.*{added} FROM rows r {self.join})"
+
+    def scalar(self, aggregate: str):
+        """Value of an aggregate over the rows with the columns added so far."""
+        return self.con.execute(f"SELECT {aggregate} FROM {self.relation()}").fetchone()[0]
+
+    def add(self, name: str, expr: str, kind: str) -> None:
+        """Add or replace column name (an existing column keeps its position)."""
+        if name not in self.columns:
+            self.columns.append(name)
+        alias = f"p{len(self.select)}"
+        self.select.append(f"{expr} AS {alias}")
+        self.refs[name] = alias
+        self.kinds[name] = kind
+
+    def market(self) -> None:
+        """Market from the name column (tagging.add_market_column)."""
+        name_col = get_name_column(self.schema())
+        if name_col is None:
+            return self.add("Market", "'Unknown'", "str")
+        value = _stripped(self.refs[name_col])
+        cases = []
+        for code, market in MARKET_BY_CODE.items():
+            pattern = rf"(?i)(?:^|[{PY_WHITESPACE_CLASS},_\-]){re.escape(code)}(?:$|[{PY_WHITESPACE_CLASS},_\-])"
+            cases.append(f"WHEN regexp_matches({value}, {_lit(pattern)}) THEN {_lit(market)}")
+        market = f"CASE WHEN NOT {self.text(name_col)} THEN 'Unknown' {' '.join(cases)} ELSE 'Unknown' END"
+        self.add("Market", market, "str")
+
+    def media_platform(self) -> None:
+        """Media Platform from the source column (tagging.add_media_platform_column)."""
+        source_col = find_column_by_pattern(self.schema(), r"source")
+        if source_col is None:
+            return self.add("Media Platform", "'News'", "str")
+        value = _stripped(self.refs[source_col])
+        cases = " ".join(
+            f"WHEN regexp_matches({value}, {_lit('(?i)' + re.escape(tag))}) THEN {_lit(tag)}"
+            for tag in MEDIA_PLATFORM_SOCIAL.values()
+        )
+        self.add("Media Platform", f"CASE WHEN {self.refs[source_col]} IS NULL THEN 'News' {cases} ELSE 'News' END", "str")
+
+    def media_type(self) -> None:
+        """Media Type from Media Platform and Influencer (tagging.add_media_type_column)."""
+        schema = self.schema()
+        platform_col = find_column_by_pattern(schema, r"media\s*platform")
+        if platform_col is None:
+            return self.add("Media Type", "'Earned'", "str")
+        influencer_col = find_column_by_pattern(schema, r"influencer")
+        platform = _stripped(self.refs[platform_col])
+        social = "|".join(re.escape(tag) for tag in MEDIA_PLATFORM_SOCIAL.values())
+        owned = "false"
+        if influencer_col is not None:
+            handles = sorted({h for h in (_normalize_handle(x) for x in OWNED_ACCOUNTS) if h})
+            handle = f"replace(replace(ltrim(lower({_stripped(self.refs[influencer_col])}), '@'), '.', ''), '_', '')"
+            owned = f"({self.text(influencer_col)} AND {handle} IN ({_lits(handles)}))"
+        self.add(
+            "Media Type",
+            f"CASE WHEN {self.refs[platform_col]} IS NULL THEN 'Earned' "
+            f"WHEN regexp_matches({platform}, '(?i)news') THEN 'News' "
+            f"WHEN regexp_matches({platform}, {_lit('(?i)' + social)}) THEN CASE WHEN {owned} THEN 'Owned' ELSE 'Earned' END "
+            f"ELSE 'News' END",
+            "str",
+        )
+
+    def date_columns(self) -> None:
+        """Year, Quarter, Day, MonthName, Date (For Trendline) (transforms.add_date_columns)."""
+        date_col = find_column_by_pattern(self.schema(), r"^date$")
+        if date_col is None:
+            return
+        if self.kinds[date_col] in ("str", "object"):
+            # Not parsed by every file: the stage parses the merged text ("mixed").
+            self.con.create_function(
+                "parse_dates_mixed", _date_parser(None), ["VARCHAR"], "TIMESTAMP", type="arrow", null_handling="special"
+            )
+            self.add(date_col, f"parse_dates_mixed({self.refs[date_col]})", "datetime")
+        elif self.kinds[date_col] != "datetime":
+            raise ValueError(f"Column {date_col!r} holds numbers; merge with the pandas or polars engine.")
+        date = self.refs[date_col]
+        # With NaT among the dates, pandas returns the parts as float64.
+        missing = self.scalar(f"count(*) FILTER (WHERE {date} IS NULL)")
+        number, kind = ("DOUBLE", "float") if missing else ("INTEGER", "int")
+        for name, part in (("Year", "year"), ("Quarter", "quarter"), ("Day", "day")):
+            self.add(name, f"CAST({part}({date}) AS {number})", kind)
+        self.add("MonthName", f"strftime({date}, '%b')", "str")
+        self.add("Date (For Trendline)", f"strftime({date}, '%d-%b-%Y')", "str")
+
+    def engagement(self) -> None:
+        """Engagement as the sum of engagement columns (transforms.set_engagement_from_sum)."""
+        found = find_columns_by_patterns(self.schema(), ENGAGEMENT_COLS)
+        if not found:
+            if "Engagement" not in self.columns:
+                self.add("Engagement", "CAST(0 AS BIGINT)", "int")
+            return
+        values = []
+        exact = True
+        for col in found:
+            ref, kind = self.refs[col], self.kinds[col]
+            if kind in ("int", "bool"):
+                values.append((f"CAST({ref} AS BIGINT)", f"CAST({ref} AS DOUBLE)"))
+            elif kind == "float":
+                values.append((None, ref))
+                exact = False
+            elif kind in ("str", "object"):
+                # pd.to_numeric: int64 only when every value is integer text.
+                is_int = f"regexp_full_match({ref}, {_lit(_INT_PATTERN)}) AND {_number(ref, 'BIGINT')} IS NOT NULL"
+                exact = exact and bool(self.scalar(f"bool_and({ref} IS NOT NULL AND {is_int})"))
+                number = f"CASE WHEN regexp_full_match({ref}, {_lit(_FLOAT_PATTERN)}) THEN {_number(ref, 'DOUBLE')} END"
+                values.append((_number(ref, "BIGINT"), number))
+            else:
+                raise ValueError(f"Engagement column {col!r} holds dates; merge with the pandas or polars engine.")
+        if exact:
+            total = " + ".join(f"coalesce({whole}, 0)" for whole, _ in values)
+        else:
+            # Like DataFrame.sum(axis=1) then astype("int64"): float sum in column order, truncated.
+            total = "CAST(trunc(" + " + ".join(f"coalesce({number}, 0)" for _, number in values) + ") AS BIGINT)"
+        self.add("Engagement", total, "int")
+
+    def brand(self) -> None:
+        """Brand from Keywords and the brand JSON aliases (tagging.add_brand_from_keywords)."""
+        keyword_col = find_column_by_pattern(self.schema(), r"keyword")
+        alias_to_brand = load_brand_alias_map(Path(self.base_dir) / BRAND_JSON_FILENAME) if keyword_col else {}
+        if not alias_to_brand:
+            if "Brand" not in self.columns:
+                self.add("Brand", "'Unknown'", "str")
+            return
+        aliases = pd.DataFrame({"alias": list(alias_to_brand), "brand": list(alias_to_brand.values())})
+        self.con.register("alias_frame", aliases)
+        self.con.execute("CREATE TABLE aliases AS SELECT * FROM alias_frame")
+        self.con.unregister("alias_frame")
+        # The last keyword of the list that is a known alias wins.
+        self.con.execute(
+            f"""
+            CREATE TABLE brands AS
+            SELECT k.r, arg_max(a.brand, k.pos) AS brand
+            FROM (
+                SELECT r, unnest(parts) AS keyword, generate_subscripts(parts, 1) AS pos
+                FROM (
+                    SELECT rowid AS r, string_split({self.refs[keyword_col]}, ',') AS parts
+                    FROM rows WHERE {self.text(keyword_col)}
+                )
+            ) k
+            JOIN aliases a ON a.alias = lower(trim(k.keyword, {_lit(PY_WHITESPACE)}))
+            GROUP BY k.r
+            """
+        )
+        self.join = "LEFT JOIN brands b ON b.r = r.rowid"
+        self.add("Brand", "coalesce(b.brand, 'Unknown')", "str")
+
+
+def _resolutions(stages: _Stages, columns: list[str]) -> dict[str, str]:
+    """output.datetime_resolutions of the given TIMESTAMP (microsecond) columns, computed in SQL."""
+    if not columns:
+        return {}
+    checks = [
+        f"bool_and(epoch_us({stages.refs[col]}) % {size} = 0)"
+        for col in columns
+        for size in (86_400_000_000, 1_000_000, 1_000)
+    ]
+    flags = stages.scalar(f"[{', '.join(checks)}]")
+    resolutions = {}
+    for j, col in enumerate(columns):
+        # bool_and of only NULLs is NULL: a column of NaT is written as dates.
+        day, second, milli = (flag is not False for flag in flags[3 * j : 3 * j + 3])
+        resolutions[col] = "D" if day else "s" if second else "ms" if milli else "us"
+    return resolutions
+
+
+def _rechunk(reader, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Yield record batches as DataFrames of exactly chunk_rows rows (the last may be shorter)."""
+    pending: list[pd.DataFrame] = []
+    size = 0
+    for batch in reader:
+        pending.append(batch.to_pandas())
+        size += batch.num_rows
+        while size >= chunk_rows:
+            frame = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+            yield frame.iloc[:chunk_rows].reset_index(drop=True)
+            pending, size = [frame.iloc[chunk_rows:]], size - chunk_rows
+    if size:
+        yield pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0].reset_index(drop=True)
+
+
+@contextmanager
+def duckdb_merge(
+    files: list[TableSource],
+    base_dir: str,
+    spill_dir: str,
+    memory_limit: str | None = None,
+    on_warning: Callable[[str], None] | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[tuple[dict, Iterator[pd.DataFrame]]]:
+    """
+    Merge CSV files (paths or archive members) with DuckDB and yield (summary, chunks): summary holds
+    "rows", "countries" (rows per Country) and "resolutions" (output.datetime_resolutions
+    of the output columns, for write_csv_parts), chunks the output columns in
+    order, equal to select_output_columns(merge_sources(files)) sliced by chunk_rows.
+    Intermediate data lives in a temporary database under spill_dir, removed on exit.
+    memory_limit (e.g. "2GB") caps DuckDB's memory; on_warning(message) receives
+    skipped files (default: print).
+    """
+    duckdb = _require_duckdb()
+    Path(spill_dir).mkdir(parents=True, exist_ok=True)
+    workdir = Path(tempfile.mkdtemp(prefix="duckdb-", dir=spill_dir))
+    con = duckdb.connect(str(workdir / "merge.duckdb"))
+    try:
+        con.execute(f"SET temp_directory = {_lit(str(workdir / 'tmp'))}")
+        con.execute("SET preserve_insertion_order = true")
+        con.execute("SET enable_progress_bar = false")
+        if memory_limit:
+            con.execute(f"SET memory_limit = {_lit(memory_limit)}")
+
+        def warn(label: str, message: str) -> None:
+            if on_warning is None:
+                print(f"Warning: skipped {label}: {message}")
+            else:
+                on_warning(f"Skipped {label}: {message}")
+
+        prepared = []
+        for index, path in enumerate(files):
+            label = os.path.basename(source_name(path))
+            if not label.lower().endswith(".csv"):
+                warn(label, "the out-of-core merge reads CSV files only.")
+                continue
+            try:
+                file = _prepare_file(con, path, label, index, workdir, base_dir)
+            except Exception as e:
+                warn(label, str(e))
+                continue
+            if file is not None:
+                prepared.append(file)
+
+        merged = pd.concat(
+            [pd.DataFrame({col: _KIND_SAMPLES[kind] for col, kind in f["kinds"].items()}) for f in prepared]
+            or [pd.DataFrame()],
+            ignore_index=True,
+        )
+        columns = [str(c) for c in merged.columns]
+        kinds = {col: _dtype_kind(merged[col].dtype) for col in columns}
+        refs = {col: f"c{j}" for j, col in enumerate(columns)}
+        # isinstance(value, str) of object columns the stages test it on.
+        schema = _schema(columns)
+        flags = {
+            col: f"t{j}"
+            for j, col in enumerate(columns)
+            if kinds[col] == "object"
+            and col in (get_name_column(schema), find_column_by_pattern(schema, r"influencer"), find_column_by_pattern(schema, r"keyword"))
+        }
+        definitions = [f"{refs[col]} {_SQL_TYPES[kinds[col]]}" for col in columns]
+        definitions += [f"{flag} BOOLEAN" for flag in flags.values()]
+        con.execute(f"CREATE TABLE rows ({', '.join(definitions) or 'c0 VARCHAR'})")
+
+        url_col = find_column_by_pattern(schema, r"url")
+        for file in prepared:
+            selected = [_value_sql(file, col, kinds[col]) for col in columns]
+            selected += [
+                f"({file['values'][col]} IS NOT NULL)" if file["kinds"].get(col) == "str" else "false"
+                for col in flags
+            ]
+            where = "__country <> ''"
+            if url_col is not None:
+                url = _value_sql(file, url_col, kinds[url_col])
+                where += f" AND {url} IS NOT NULL AND {_stripped(url)} <> ''"
+            con.execute(
+                f"INSERT INTO rows SELECT {', '.join(selected)} "
+                f"FROM (SELECT *, {file['country']} AS __country FROM {file['scan']}) WHERE {where}"
+            )
+
+        (rows,) = con.execute("SELECT count(*) FROM rows").fetchone()
+        summary = {"rows": rows, "countries": {}, "resolutions": {}}
+        if not rows:
+            yield summary, iter(())
+            return
+        summary["countries"] = dict(
+            con.execute(f"SELECT {refs['Country']}, count(*) FROM rows GROUP BY 1 ORDER BY 1").fetchall()
+        )
+
+        stages = _Stages(con, columns, kinds, refs, flags, base_dir)
+        for stage in (stages.market, stages.media_platform, stages.media_type, stages.date_columns, stages.engagement, stages.brand):
+            stage()
+        outputs = [
+            f'{refs[col]} AS "{col}"' if col in refs else f"'' AS \"{col}\""
+            for col in OUTPUT_CSV_COLUMNS
+        ]
+        summary["resolutions"] = _resolutions(stages, [col for col in OUTPUT_CSV_COLUMNS if kinds.get(col) == "datetime"])
+        con.execute(f"SELECT {', '.join(outputs)} FROM {stages.relation()} ORDER BY __row")
+        # to_arrow_reader replaces fetch_record_batch (deprecated in DuckDB 1.5).
+        fetch = getattr(con, "to_arrow_reader", None) or con.fetch_record_batch
+        yield summary, _rechunk(fetch(chunk_rows), chunk_rows)
+    finally:
+        con.close()
+        shutil.rmtree(workdir, ignore_errors=True)
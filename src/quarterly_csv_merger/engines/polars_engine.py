@@ -0,0 +1,321 @@
+"""Polars engine: country assignment and pipeline stages as multithreaded expressions.
+
+The merged pandas DataFrame's stage inputs (URL, name, source, influencer,
+date, engagement and keyword columns) are converted once; every stage adds
+its columns as Polars expressions over them, and the new columns are assigned
+back to the kept pandas rows in the order the pandas stages create them.
+Columns are found with the same finders as the pandas stages, on the same
+column list, and Python's whitespace and case rules are spelled out in the
+expressions, so both engines produce identical frames. Inputs Polars cannot
+represent exactly (object columns holding non-text values) raise
+PolarsUnsupported, and the caller runs the pandas engine instead.
+"""
+
+import re
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from .._deps import (
+    BRAND_JSON_FILENAME,
+    ENGAGEMENT_COLS,
+    KEYWORDS,
+    MARKET_BY_CODE,
+    MEDIA_PLATFORM_SOCIAL,
+    NAME_COLUMN_CANDIDATES,
+    OWNED_ACCOUNTS,
+)
+from ..columns import find_column_by_pattern, find_columns_by_patterns, get_name_column
+from ..tagging.brand_resolver import load_brand_alias_map
+from ..tagging.media_platform_tagger import _normalize_handle
+from ..transforms import add_date_columns
+from . import PY_WHITESPACE as _WHITESPACE, PY_WHITESPACE_CLASS as _WS_CLASS
+_ROW = "__row"
+
+
+class PolarsUnsupported(Exception):
+    """Raised when a frame cannot be converted to Polars without changing values."""
+
+
+def _require_polars():
+    """Import polars or raise a clear error."""
+    try:
+        import polars as pl
+    except ImportError as e:
+        raise RuntimeError("The polars engine requires polars (pip install polars).") from e
+    return pl
+
+
+def _schema(columns: list) -> pd.DataFrame:
+    """Empty frame with the given columns, for the pandas column finders."""
+    return pd.DataFrame(columns=columns)
+
+
+def _to_polars(df: pd.DataFrame, columns: list[str]):
+    """Convert columns of df to a Polars frame (plus a row number column)."""
+    pl = _require_polars()
+    data = {}
+    for col in columns:
+        values = df[col]
+        if values.dtype == object:
+            present = values.dropna()
+            if not present.map(lambda v: isinstance(v, str)).all():
+                raise PolarsUnsupported(f"Column {col!r} mixes text and other values.")
+            values = values.astype("str")
+        data[col] = values
+    rows = pl.Series(_ROW, np.arange(len(df), dtype=np.int64))
+    if not data:
+        return pl.DataFrame([rows])
+    try:
+        frame = pl.from_pandas(pd.DataFrame(data, index=df.index))
+    except Exception as e:
+        raise PolarsUnsupported(str(e)) from e
+    return frame.with_columns(rows)
+
+
+def _is_text(frame, col: str) -> bool:
+    """Return True if a Polars column holds strings."""
+    pl = _require_polars()
+    return frame.schema[col] == pl.String
+
+
+def _stripped(col: str):
+    """Expression for str(value).strip() of a column."""
+    pl = _require_polars()
+    return pl.col(col).cast(pl.String).str.strip_chars(_WHITESPACE)
+
+
+def _country_expr(frame, name_col: str | None, file_keyword: str | None):
+    """Expression for the country of each row (see ingest.row_matches_keyword)."""
+    pl = _require_polars()
+    fallback = KEYWORDS.get(file_keyword, "") if file_keyword else ""
+    expr = pl.lit(fallback)
+    if name_col is None or not _is_text(frame, name_col):
+        return expr
+    upper = pl.col(name_col).str.to_uppercase()
+    chain = None
+    for code, country in KEYWORDS.items():
+        hit = upper.str.contains(rf"(?:^|[{_WS_CLASS},]){re.escape(code)}[{_WS_CLASS}_\-]")
+        chain = pl.when(hit).then(pl.lit(country)) if chain is None else chain.when(hit).then(pl.lit(country))
+    return chain.otherwise(expr) if chain is not None else expr
+
+
+def assign_countries(df: pd.DataFrame, name_col: str | None, file_keyword: str | None) -> pd.Series:
+    """Return the country of each row of df, as ingest.assign_countries does."""
+    frame = _to_polars(df, [name_col] if name_col is not None else [])
+    # with_columns broadcasts the bare literal used without a text name column to every row.
+    countries = frame.with_columns(_country_expr(frame, name_col, file_keyword).alias("Country"))["Country"]
+    return countries.to_pandas().set_axis(df.index)
+
+
+def _blank_url(frame, columns: list, produced: list, base_dir: str):
+    """Drop rows whose URL is missing or blank (cleaning.drop_blank_url_rows)."""
+    pl = _require_polars()
+    url_col = find_column_by_pattern(_schema(columns), r"url")
+    if url_col is None:
+        return frame
+    return frame.filter(pl.col(url_col).is_not_null() & (_stripped(url_col) != ""))
+
+
+def _market(frame, columns: list, produced: list, base_dir: str):
+    """Market from the name column (tagging.add_market_column)."""
+    pl = _require_polars()
+    name_col = get_name_column(_schema(columns))
+    expr = pl.lit("Unknown")
+    if name_col is not None and _is_text(frame, name_col):
+        value = _stripped(name_col)
+        for code, market in reversed(list(MARKET_BY_CODE.items())):
+            pattern = rf"(?i)(?:^|[{_WS_CLASS},_\-]){re.escape(code)}(?:$|[{_WS_CLASS},_\-])"
+            expr = pl.when(value.str.contains(pattern)).then(pl.lit(market)).otherwise(expr)
+    return _add(frame, columns, produced, "Market", expr)
+
+
+def _media_platform(frame, columns: list, produced: list, base_dir: str):
+    """Media Platform from the source column (tagging.add_media_platform_column)."""
+    pl = _require_polars()
+    source_col = find_column_by_pattern(_schema(columns), r"source")
+    expr = pl.lit("News")
+    if source_col is not None:
+        value = _stripped(source_col)
+        for tag in reversed(list(MEDIA_PLATFORM_SOCIAL.values())):
+            expr = pl.when(value.str.contains(f"(?i){re.escape(tag)}")).then(pl.lit(tag)).otherwise(expr)
+    return _add(frame, columns, produced, "Media Platform", expr)
+
+
+def _media_type(frame, columns: list, produced: list, base_dir: str):
+    """Media Type from Media Platform and Influencer (tagging.add_media_type_column)."""
+    pl = _require_polars()
+    schema = _schema(columns)
+    platform_col = find_column_by_pattern(schema, r"media\s*platform")
+    if platform_col is None:
+        return _add(frame, columns, produced, "Media Type", pl.lit("Earned"))
+    influencer_col = find_column_by_pattern(schema, r"influencer")
+    platform = _stripped(platform_col)
+    social = "|".join(re.escape(tag) for tag in MEDIA_PLATFORM_SOCIAL.values())
+    owned = pl.lit(False)
+    if influencer_col is not None and _is_text(frame, influencer_col):
+        handles = sorted({h for h in (_normalize_handle(x) for x in OWNED_ACCOUNTS) if h})
+        handle = (
+            _stripped(influencer_col)
+            .str.to_lowercase()
+            .str.strip_chars_start("@")
+            .str.replace_all(".", "", literal=True)
+            .str.replace_all("_", "", literal=True)
+        )
+        owned = handle.is_in(handles).fill_null(False)
+    expr = (
+        pl.when(pl.col(platform_col).is_null())
+        .then(pl.lit("Earned"))
+        .when(platform.str.contains("(?i)news"))
+        .then(pl.lit("News"))
+        .when(platform.str.contains(f"(?i){social}"))
+        .then(pl.when(owned).then(pl.lit("Owned")).otherwise(pl.lit("Earned")))
+        .otherwise(pl.lit("News"))
+    )
+    return _add(frame, columns, produced, "Media Type", expr)
+
+
+def _date_columns(frame, columns: list, produced: list, base_dir: str):
+    """Year, Quarter, Day, MonthName, Date (For Trendline) (transforms.add_date_columns)."""
+    pl = _require_polars()
+    date_col = find_column_by_pattern(_schema(columns), r"^date$")
+    if date_col is None:
+        return frame
+    dtype = frame.schema[date_col]
+    if not (isinstance(dtype, pl.Datetime) and dtype.time_zone is None):
+        # Text or zone-aware dates: parse and derive exactly as the pandas stage does.
+        derived = add_date_columns(pd.DataFrame({date_col: frame[date_col].to_pandas()}))
+        for col in derived.columns:
+            frame = _add(frame, columns, produced, col, pl.from_pandas(derived[col]).alias(col))
+        return frame
+    date = pl.col(date_col).dt
+    for col, expr in (
+        ("Year", date.year().cast(pl.Int32)),
+        ("Quarter", date.quarter().cast(pl.Int32)),
+        ("Day", date.day().cast(pl.Int32)),
+        ("MonthName", date.strftime("%b")),
+        ("Date (For Trendline)", date.strftime("%d-%b-%Y")),
+    ):
+        frame = _add(frame, columns, produced, col, expr)
+    return frame
+
+
+def _engagement(frame, columns: list, produced: list, base_dir: str):
+    """Engagement as the sum of engagement columns (transforms.set_engagement_from_sum)."""
+    pl = _require_polars()
+    found = find_columns_by_patterns(_schema(columns), ENGAGEMENT_COLS)
+    if not found:
+        if "Engagement" in columns:
+            return frame
+        return _add(frame, columns, produced, "Engagement", pl.lit(0, dtype=pl.Int64))
+    values = []
+    exact = True
+    for col in found:
+        dtype = frame.schema[col]
+        if dtype.is_numeric() or dtype == pl.Boolean:
+            values.append(pl.col(col))
+            exact = exact and (dtype.is_integer() or dtype == pl.Boolean)
+        else:
+            # pd.to_numeric's text rules (whitespace, exponents, "inf") are pandas-specific.
+            numbers = pd.to_numeric(frame[col].to_pandas(), errors="coerce")
+            values.append(pl.lit(pl.from_pandas(numbers)))
+            exact = exact and pd.api.types.is_integer_dtype(numbers)
+    # Like DataFrame.sum(axis=1): integer columns add exactly, any float makes it a float sum.
+    target = pl.Int64 if exact else pl.Float64
+    total = pl.sum_horizontal([v.cast(target).fill_null(0) for v in values])
+    if not exact:
+        total = total.fill_nan(0)
+    return _add(frame, columns, produced, "Engagement", total.cast(pl.Int64))
+
+
+def _brand(frame, columns: list, produced: list, base_dir: str):
+    """Brand from Keywords and the brand JSON aliases (tagging.add_brand_from_keywords)."""
+    pl = _require_polars()
+    keyword_col = find_column_by_pattern(_schema(columns), r"keyword")
+    alias_to_brand = load_brand_alias_map(Path(base_dir) / BRAND_JSON_FILENAME) if keyword_col else {}
+    if not alias_to_brand:
+        if "Brand" in columns:
+            return frame
+        return _add(frame, columns, produced, "Brand", pl.lit("Unknown"))
+    expr = pl.lit("Unknown")
+    if _is_text(frame, keyword_col):
+        matches = pl.col(keyword_col).str.split(",").list.eval(
+            pl.element()
+            .str.strip_chars(_WHITESPACE)
+            .str.to_lowercase()
+            .replace_strict(alias_to_brand, default=None, return_dtype=pl.String)
+        )
+        expr = matches.list.drop_nulls().list.last().fill_null("Unknown")
+    return _add(frame, columns, produced, "Brand", expr)
+
+
+def _add(frame, columns: list, produced: list, name: str, expr):
+    """Add or replace column name, tracking pandas' column order and assignments."""
+    if name not in columns:
+        columns.append(name)
+    if name not in produced:
+        produced.append(name)
+    return frame.with_columns(expr.alias(name))
+
+
+# Same labels and order as pipeline.STAGES.
+POLARS_STAGES: tuple[tuple[str, Callable], ...] = (
+    ("Remove blank URLs", _blank_url),
+    ("Market", _market),
+    ("Media Platform", _media_platform),
+    ("Media Type", _media_type),
+    ("Date columns", _date_columns),
+    ("Engagement", _engagement),
+    ("Brand", _brand),
+)
+
+
+def _input_columns(df: pd.DataFrame) -> list[str]:
+    """Columns of df any stage may read (first match per pattern, as the stages pick them)."""
+    wanted = [get_name_column(df), *find_columns_by_patterns(df, ENGAGEMENT_COLS)]
+    wanted += [
+        find_column_by_pattern(df, pattern)
+        for pattern in (r"url", r"source", r"media\s*platform", r"influencer", r"^date$", r"keyword")
+    ]
+    wanted += [c for c in NAME_COLUMN_CANDIDATES if c in df.columns]
+    return list(dict.fromkeys(c for c in wanted if c is not None))
+
+
+def run_polars_stages(
+    df: pd.DataFrame,
+    base_dir: str,
+    progress_callback: Callable[[float, str], None] | None = None,
+    on_warning: Callable[[str], None] | None = None,
+) -> tuple[pd.DataFrame, list[tuple[str, int, int, float]]]:
+    """
+    Run the stages with Polars; return (DataFrame equal to the pandas engine's
+    result, [(label, rows in, rows out, seconds)] per stage).
+    """
+    frame = _to_polars(df, _input_columns(df))
+    columns = list(df.columns)
+    produced: list[str] = []
+    filtered = False
+    timings = []
+    for i, (label, fn) in enumerate(POLARS_STAGES):
+        if progress_callback is not None:
+            progress_callback(i / len(POLARS_STAGES), f"{label} ({frame.height:,} rows)...")
+        rows_in = frame.height
+        started = time.perf_counter()
+        before = (list(columns), list(produced))
+        try:
+            frame = fn(frame, columns, produced, base_dir)
+            filtered = filtered or (fn is _blank_url and find_column_by_pattern(df, r"url") is not None)
+        except Exception as e:
+            if on_warning is None:
+                raise
+            columns[:], produced[:] = before
+            on_warning(f"Step «{label}» skipped: {e}")
+        timings.append((label, rows_in, frame.height, time.perf_counter() - started))
+
+    out = df.iloc[frame[_ROW].to_numpy()].reset_index(drop=True) if filtered else df.copy()
+    for col in produced:
+        out[col] = frame[col].to_pandas().set_axis(out.index)
+    return out, timings
@@ -0,0 +1,279 @@
+"""Incremental merge: keep output/data.csv in step with a raw-data folder.
+
+A manifest next to the output records, per input file, its size, mtime, content
+hash, row count and the offset of its rows in the output. A run only merges new
+or changed files and appends their rows; rows of deleted or changed files are
+dropped by rewriting the output once. The rollup cube beside the output is
+updated with the appended rows. watch_folder polls for unattended runs.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from ._deps import OUTPUT_CSV_COLUMNS, OUTPUT_DIR, OUTPUT_ENCODING, ArchiveMember, TableSource, content_digest
+from .cleaning import DuplicateIndex, mention_keys
+from .columns import select_output_columns
+from .engines import DEFAULT_ENGINE
+from .output import ROLLUP_FILENAME, build_rollup, merge_rollups, read_rollup, write_rollup
+from .pipeline import ProgressCallback, _default_base_dir, merge_sources, resolve_input_files
+
+INCREMENTAL_MANIFEST_NAME = "data.incremental.json"
+DEDUPE_INDEX_NAME = "data.dedupe.npz"
+REWRITE_CHUNK_ROWS = 100_000
+
+
+def _load_manifest(path: Path) -> dict:
+    """Return the manifest, or an empty one if missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if isinstance(manifest.get("files"), dict):
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"files": {}, "output_bytes": 0}
+
+
+def _save_manifest(manifest: dict, path: Path) -> None:
+    """Write the manifest atomically."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _write_header(out_csv: Path) -> None:
+    """Start an empty output with the BOM and header row."""
+    pd.DataFrame(columns=list(OUTPUT_CSV_COLUMNS)).to_csv(out_csv, index=False, encoding=OUTPUT_ENCODING)
+
+
+def _rewrite_output(out_csv: Path, kept: list[dict]) -> int:
+    """
+    Rewrite out_csv keeping only the row ranges of the kept entries (sorted by
+    offset); entries get their new offsets. Returns the number of rows removed.
+    """
+    keep_ranges = [(e["offset"], e["offset"] + e["rows"]) for e in kept]
+    tmp = out_csv.with_name(out_csv.name + ".tmp")
+    _write_header(tmp)
+    removed = 0
+    position = 0
+    reader = pd.read_csv(
+        out_csv,
+        encoding=OUTPUT_ENCODING,
+        dtype=str,
+        keep_default_na=False,
+        chunksize=REWRITE_CHUNK_ROWS,
+    )
+    for chunk in reader:
+        mask = np.zeros(len(chunk), dtype=bool)
+        for start, stop in keep_ranges:
+            mask[max(start - position, 0) : max(stop - position, 0)] = True
+        chunk[mask].to_csv(tmp, mode="a", header=False, index=False, encoding="utf-8")
+        removed += int((~mask).sum())
+        position += len(chunk)
+    os.replace(tmp, out_csv)
+    offset = 0
+    for entry in kept:
+        entry["offset"] = offset
+        offset += entry["rows"]
+    return removed
+
+
+def _stat(source: TableSource) -> os.stat_result:
+    """Stat of a source's file (an archive member's archive)."""
+    return os.stat(source.archive if isinstance(source, ArchiveMember) else source)
+
+
+def _index_output(out_csv: Path) -> DuplicateIndex:
+    """Build a duplicate index from the mentions already in out_csv."""
+    index = DuplicateIndex()
+    reader = pd.read_csv(out_csv, encoding=OUTPUT_ENCODING, dtype=str, chunksize=REWRITE_CHUNK_ROWS)
+    for chunk in reader:
+        keys, keyed = mention_keys(chunk)
+        index.mark(keys[keyed])
+    return index
+
+
+def run_incremental(
+    input_path: str,
+    base_dir: str | None = None,
+    progress_callback: ProgressCallback | None = None,
+    on_warning: Callable[[str], None] | None = None,
+    dedupe: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+) -> dict:
+    """
+    Bring output/data.csv up to date with the files at input_path, merging only
+    new or changed files (include / exclude as in merge_data). Returns {"output", "files_added", "files_changed",
+    "files_unchanged", "files_removed", "files_failed", "rows_appended",
+    "rows_removed", "rows_total", "duplicates"}; changed files also count as added.
+    With dedupe, mentions already in the output are not appended again (the
+    64-bit key index is kept in output/data.dedupe.npz). engine selects the merge
+    engine (see merge_sources).
+    """
+    if base_dir is None:
+        base_dir = _default_base_dir()
+    out_dir = Path(base_dir) / OUTPUT_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_csv = out_dir / "data.csv"
+    manifest_path = out_dir / INCREMENTAL_MANIFEST_NAME
+    manifest = _load_manifest(manifest_path)
+    entries: dict[str, dict] = manifest["files"]
+
+    # Rows appended after the last manifest save (interrupted run) are cut off;
+    # a missing or shortened output cannot be trusted and is rebuilt.
+    size = out_csv.stat().st_size if out_csv.exists() else -1
+    if not entries or size < manifest.get("output_bytes", 0):
+        entries = {}
+        _write_header(out_csv)
+    elif size > manifest["output_bytes"]:
+        with open(out_csv, "r+b") as f:
+            f.truncate(manifest["output_bytes"])
+
+    # Sources are keyed by path (archive members by <archive>/<member>, with the
+    # archive's size and mtime).
+    kept: dict[str, dict] = {}
+    pending: list[tuple[str, str, os.stat_result]] = []
+    sources = {str(s): s for s in resolve_input_files(input_path, base_dir, include=include, exclude=exclude)}
+    for path, source in sources.items():
+        st = _stat(source)
+        entry = entries.get(path)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            kept[path] = entry
+            continue
+        digest = content_digest(source)
+        if entry and entry["digest"] == digest:
+            entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+            kept[path] = entry
+            continue
+        pending.append((path, digest, st))
+
+    pending_paths = {path for path, _, _ in pending}
+    summary = {
+        "output": out_csv,
+        "files_added": 0,
+        "files_changed": len([p for p in entries if p in pending_paths]),
+        "files_unchanged": len(kept),
+        "files_removed": len([p for p in entries if p not in kept and p not in pending_paths]),
+        "files_failed": 0,
+        "rows_appended": 0,
+        "rows_removed": 0,
+    }
+    if dedupe and (summary["files_removed"] or summary["files_changed"]):
+        # A removed or changed file may have held the first copy of mentions that later
+        # files had dropped as duplicates; merge those files again.
+        for path in [p for p, e in kept.items() if e.get("duplicates")]:
+            entry = kept.pop(path)
+            pending.append((path, entry["digest"], _stat(sources[path])))
+            summary["files_changed"] += 1
+            summary["files_unchanged"] -= 1
+    ordered = sorted(kept.values(), key=lambda e: e["offset"])
+    if len(kept) < len(entries):
+        summary["rows_removed"] = _rewrite_output(out_csv, ordered)
+    offset = sum(e["rows"] for e in ordered)
+    index_path = out_csv.with_name(DEDUPE_INDEX_NAME)
+    index = None
+    summary["duplicates"] = {}
+    if dedupe:
+        # The saved index is tagged with the row count it covers; after removals
+        # or an interrupted run it no longer matches and is rebuilt.
+        index = DuplicateIndex.load(index_path, tag=str(offset)) if not summary["rows_removed"] else None
+        if index is None:
+            index = _index_output(out_csv)
+
+    rollup_path = out_csv.with_name(ROLLUP_FILENAME)
+    cube = read_rollup(rollup_path) if not summary["rows_removed"] else None
+    if cube is None or int(cube["Mentions"].sum()) != offset:
+        reader = pd.read_csv(out_csv, encoding=OUTPUT_ENCODING, chunksize=REWRITE_CHUNK_ROWS)
+        cube = build_rollup(reader)
+        write_rollup(cube, rollup_path)
+
+    def save() -> None:
+        manifest["files"] = {p: kept[p] for p in sorted(kept, key=lambda p: kept[p]["offset"])}
+        manifest["output_bytes"] = out_csv.stat().st_size
+        manifest["updated_at"] = time.time()
+        _save_manifest(manifest, manifest_path)
+
+    save()
+    for i, (path, digest, st) in enumerate(pending):
+
+        def file_progress(ratio: float, msg: str, i: int = i) -> None:
+            progress_callback((i + ratio) / len(pending), msg)
+
+        warnings: list[str] = []
+        df = merge_sources(
+            [sources[path]],
+            base_dir=base_dir,
+            progress_callback=file_progress if progress_callback is not None else None,
+            on_warning=warnings.append,
+            dedupe=index if dedupe else False,
+            engine=engine,
+        )
+        for msg in warnings:
+            if on_warning is None:
+                print(f"Warning: {msg}")
+            else:
+                on_warning(msg)
+        if df.empty and warnings:
+            summary["files_failed"] += 1
+            continue
+        out_df = select_output_columns(df) if not df.empty else pd.DataFrame()
+        if not out_df.empty:
+            out_df.to_csv(out_csv, mode="a", header=False, index=False, encoding="utf-8")
+        kept[path] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "digest": digest,
+            "rows": len(out_df),
+            "offset": offset,
+            "duplicates": sum(df.attrs.get("duplicates", {}).values()),
+        }
+        offset += len(out_df)
+        summary["files_added"] += 1
+        summary["rows_appended"] += len(out_df)
+        for source_file, count in df.attrs.get("duplicates", {}).items():
+            summary["duplicates"][source_file] = summary["duplicates"].get(source_file, 0) + count
+        if index is not None:
+            index.save(index_path, tag=str(offset))
+        save()
+        cube = merge_rollups(cube, build_rollup([out_df]))
+        write_rollup(cube, rollup_path)
+    summary["rows_total"] = offset
+    if progress_callback is not None:
+        progress_callback(1.0, "Done.")
+    return summary
+
+
+def watch_folder(
+    input_path: str,
+    base_dir: str | None = None,
+    interval: float = 60.0,
+    on_update: Callable[[dict], None] | None = None,
+    stop: threading.Event | None = None,
+    dedupe: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+) -> None:
+    """
+    Run run_incremental every interval seconds until stop is set (or forever).
+    on_update(summary) is called after runs that added, changed or removed files.
+    """
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        summary = run_incremental(
+            input_path, base_dir=base_dir, dedupe=dedupe, engine=engine, include=include, exclude=exclude
+        )
+        changed = summary["files_added"] or summary["files_removed"]
+        if on_update is not None and changed:
+            on_update(summary)
+        stop.wait(interval)
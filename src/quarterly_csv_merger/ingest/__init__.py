@@ -1,5 +1,6 @@
 """Ingest: load files and assign country from filename or name column."""
 
 from .country_keywords import process_file, collect_files
+from .pipelined import pipelined_ingest
 
-__all__ = ["process_file", "collect_files"]
+__all__ = ["process_file", "collect_files", "pipelined_ingest"]
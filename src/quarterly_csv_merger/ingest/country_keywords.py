@@ -2,10 +2,33 @@
 
 import os
 import re
+from fnmatch import fnmatchcase
+
 import pandas as pd
 
-from .._deps import KEYWORDS, load_table
-from ..columns import get_name_column
+from .._deps import (
+    ARCHIVE_ERRORS,
+    KEYWORDS,
+    ReadProgress,
+    TableSource,
+    archive_members,
+    get_profile,
+    is_archive,
+    load_table,
+    source_name,
+    update_profile,
+)
+from ..columns import find_column_by_pattern, get_name_column
+from ..transforms import detect_date_format, parse_dates
+
+# Column roles remembered per export format (role -> pattern used by the stages).
+_ROLE_PATTERNS = {
+    "url": r"url",
+    "date": r"^date$",
+    "keywords": r"keyword",
+    "source": r"source",
+    "influencer": r"influencer",
+}
 
 
 def keyword_from_filename(filename: str) -> str | None:
@@ -31,15 +54,8 @@ def row_matches_keyword(row, name_col: str | None, file_keyword: str | None) ->
     return file_keyword
 
 
-def process_file(path: str, base_dir: str | None = None) -> pd.DataFrame:
-    """Load file and add Country column from filename or name column."""
-    df = load_table(path)
-    if df.empty:
-        return df
-
-    name_col = get_name_column(df)
-    file_keyword = keyword_from_filename(os.path.basename(path))
-
+def assign_countries(df: pd.DataFrame, name_col: str | None, file_keyword: str | None) -> pd.Series:
+    """Return the country of each row: from its name column, else the file keyword ("" if neither)."""
     countries = []
     for _, row in df.iterrows():
         kw = row_matches_keyword(row, name_col, file_keyword)
@@ -49,6 +65,70 @@ def process_file(path: str, base_dir: str | None = None) -> pd.DataFrame:
             countries.append(KEYWORDS[file_keyword])
         else:
             countries.append("")
+    return pd.Series(countries, index=df.index)
+
+
+def _resolve_roles(df: pd.DataFrame, profile: dict | None) -> dict[str, str]:
+    """Return role -> column, reusing the profile's mapping when its columns are present."""
+    known = (profile or {}).get("roles") or {}
+    if known and all(col in df.columns for col in known.values()):
+        return dict(known)
+    roles: dict[str, str] = {}
+    name_col = get_name_column(df)
+    if name_col is not None:
+        roles["name"] = name_col
+    for role, pattern in _ROLE_PATTERNS.items():
+        col = find_column_by_pattern(df, pattern)
+        if col is not None:
+            roles[role] = str(col)
+    return roles
+
+
+def process_file(
+    source: TableSource,
+    base_dir: str | None = None,
+    name: str | None = None,
+    on_read: ReadProgress | None = None,
+    nrows: int | None = None,
+    sample: bool = False,
+    engine: str = "pandas",
+) -> pd.DataFrame:
+    """
+    Load file, parse its Date column and add Country from filename or name column.
+    source may be a path, a buffer or a file-like upload; name overrides its filename.
+    on_read(bytes_consumed) reports read progress (see reader.read_csv).
+    nrows / sample limit the rows read, for previews (see reader.load_table).
+    The reader profile of the file's format is kept under base_dir.
+    engine "polars" assigns countries with vectorized Polars expressions.
+    """
+    df = load_table(source, name=name, on_read=on_read, nrows=nrows, sample=sample, base_dir=base_dir)
+    if df.empty:
+        return df
+
+    fingerprint = df.attrs.get("ingest_fingerprint")
+    profile = get_profile(fingerprint, base_dir)
+    roles = _resolve_roles(df, profile)
+    date_format = (profile or {}).get("date_format")
+    date_col = roles.get("date")
+    if date_col is not None:
+        if not date_format:
+            date_format = detect_date_format(df[date_col])
+        df[date_col] = parse_dates(df[date_col], date_format)
+    update_profile(fingerprint, base_dir, roles=roles, date_format=date_format)
+
+    name_col = roles.get("name")
+    file_keyword = keyword_from_filename(os.path.basename(source_name(source, name)))
+
+    countries = None
+    if engine == "polars":
+        from ..engines.polars_engine import PolarsUnsupported, assign_countries as assign_countries_polars
+
+        try:
+            countries = assign_countries_polars(df, name_col, file_keyword)
+        except PolarsUnsupported:
+            pass
+    if countries is None:
+        countries = assign_countries(df, name_col, file_keyword)
 
     df = df.copy()
     df["Country"] = countries
@@ -56,25 +136,90 @@ def process_file(path: str, base_dir: str | None = None) -> pd.DataFrame:
     return df
 
 
-def collect_files(path: str) -> list[str]:
-    """Return CSV/Excel paths from given file or directory."""
+TABLE_SUFFIXES = (".csv", ".xlsx", ".xls")
+
+
+def _is_table(filename: str) -> bool:
+    return filename.lower().endswith(TABLE_SUFFIXES)
+
+
+def _matches(rel: str, patterns: list[str]) -> bool:
+    """Case-insensitive glob match of a relative path; patterns without "/" match the file name."""
+    rel = rel.lower()
+    base = rel.rsplit("/", 1)[-1]
+    return any(fnmatchcase(rel, p) or ("/" not in p and fnmatchcase(base, p)) for p in (p.lower() for p in patterns))
+
+
+def _archive_tables(path: str, rel: str, keyword_required: bool) -> list[tuple[str, TableSource]]:
+    """
+    (relative table name, source) for each table in an archive. An archive that cannot
+    be listed, or a zip member that cannot be opened (encrypted, unsupported
+    compression), is skipped with a warning.
+    """
+    try:
+        members = archive_members(path)
+    except ARCHIVE_ERRORS as e:
+        print(f"Warning: skipped {rel}: {e}")
+        return []
+    tables = []
+    for member in members:
+        name = os.path.basename(member.name)
+        # A compressed file's name without its suffix names the table inside.
+        needs_keyword = keyword_required or member.member is not None
+        if not _is_table(name) or (needs_keyword and keyword_from_filename(name) is None):
+            continue
+        member_rel = rel if member.member is None else f"{rel}/{member.member}"
+        if member.member is not None:
+            try:
+                member.open().close()
+            except ARCHIVE_ERRORS as e:
+                print(f"Warning: skipped {member_rel}: {e}")
+                continue
+        tables.append((member_rel, member))
+    return tables
+
+
+def collect_files(
+    path: str,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+) -> list[TableSource]:
+    """
+    Return the CSV/Excel sources at path: the file itself, or every file with a country
+    keyword in its name below the folder (subfolders included). Zip members and
+    .gz/.bz2/.xz files are returned as ArchiveMember sources, read without extracting.
+    include / exclude are glob patterns (case-insensitive) on each table's path relative
+    to the folder (zip members as <zip>/<member>); a pattern without "/" matches the
+    file name.
+    """
     path = os.path.abspath(path)
     if not os.path.exists(path):
         return []
 
+    tables: list[tuple[str, TableSource]] = []
     if os.path.isfile(path):
-        lower = path.lower()
-        if lower.endswith((".csv", ".xlsx", ".xls")):
-            return [path]
-        return []
-
-    files = []
-    for name in os.listdir(path):
-        full = os.path.join(path, name)
-        if not os.path.isfile(full):
-            continue
-        lower = name.lower()
-        if lower.endswith((".csv", ".xlsx", ".xls")):
-            if keyword_from_filename(name) is not None:
-                files.append(full)
-    return sorted(files)
+        rel = os.path.basename(path)
+        if is_archive(path):
+            tables = _archive_tables(path, rel, keyword_required=False)
+        elif _is_table(path):
+            tables = [(rel, path)]
+    else:
+        folders = [(path, "")]
+        while folders:
+            folder, prefix = folders.pop()
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    rel = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        folders.append((entry.path, rel + "/"))
+                    elif not entry.is_file():
+                        continue
+                    elif is_archive(entry.name):
+                        tables += _archive_tables(entry.path, rel, keyword_required=True)
+                    elif _is_table(entry.name) and keyword_from_filename(entry.name) is not None:
+                        tables.append((rel, entry.path))
+    return [
+        source
+        for rel, source in sorted(tables, key=lambda t: str(t[1]))
+        if (not include or _matches(rel, include)) and not (exclude and _matches(rel, exclude))
+    ]
@@ -0,0 +1,192 @@
+"""Pipelined ingest: read sources ahead while earlier ones are parsed.
+
+A small reader pool loads local files into memory ahead of the parser, and
+decompresses archive members of known size, within a byte budget (larger files
+stay paths and are parsed from a memory map; other members stream). A
+parse pool runs process_file on them (read, dates, country); the stages run
+later, once, on the combined frame. pandas' C parser releases the GIL, so with
+more than one core files parse side by side; on one core only reads can overlap
+parsing (benchmarks/ingest.py times both against a sequential loop). Results
+come back in source order. Files that share a header fingerprint are parsed one after the
+other, in order, so the reader profile learned from one applies to the next
+exactly as in a sequential run.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pandas as pd
+
+from .._deps import (
+    MAPPED_MIN_BYTES,
+    PROFILE_SAMPLE_BYTES,
+    ArchiveMember,
+    ReadAborted,
+    TableSource,
+    header_fingerprint,
+    is_path,
+    read_head,
+    source_name,
+    source_size,
+)
+
+INGEST_READ_WORKERS = 2
+INGEST_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+# Source bytes held in memory between the reader and the parser.
+INGEST_PREFETCH_BYTES = 256 << 20
+
+
+class _ByteBudget:
+    """
+    Bytes in flight, bounded, taken in source order (so bytes held by a later source
+    never block an earlier one); a source larger than the budget waits until it is alone.
+    """
+
+    def __init__(self, limit: int, cancelled: threading.Event):
+        self._limit = limit
+        self._used = 0
+        self._turn = 0
+        self._cancelled = cancelled
+        self._cond = threading.Condition()
+
+    def acquire(self, turn: int, n: int) -> None:
+        with self._cond:
+            while self._turn != turn or (self._used and self._used + n > self._limit):
+                if self._cancelled.is_set():
+                    raise ReadAborted("Ingest cancelled.")
+                self._cond.wait(0.1)
+            self._used += n
+            self._turn += 1
+            self._cond.notify_all()
+
+    def skip(self, turn: int) -> None:
+        """Pass a turn without taking bytes (its source failed to read); no-op if already taken."""
+        with self._cond:
+            while self._turn < turn:
+                if self._cancelled.is_set():
+                    raise ReadAborted("Ingest cancelled.")
+                self._cond.wait(0.1)
+            if self._turn == turn:
+                self._turn += 1
+                self._cond.notify_all()
+
+    def release(self, n: int) -> None:
+        with self._cond:
+            self._used -= n
+            self._cond.notify_all()
+
+
+def _prefetch(source: TableSource, turn: int, budget: _ByteBudget) -> tuple[TableSource, int]:
+    """Return (source to parse, bytes held): small local files and archive members are read into memory."""
+    size = source_size(source) if is_path(source) or isinstance(source, ArchiveMember) else None
+    if size is None or size >= MAPPED_MIN_BYTES:
+        budget.acquire(turn, 0)
+        return source, 0
+    budget.acquire(turn, size)
+    try:
+        return (Path(source).read_bytes() if is_path(source) else source.read_bytes()), size
+    except BaseException:
+        budget.release(size)
+        raise
+
+
+def pipelined_ingest(
+    sources: list[TableSource],
+    names: list[str | None],
+    process: Callable[[int, TableSource, str | None], pd.DataFrame],
+    read_workers: int = INGEST_READ_WORKERS,
+    parse_workers: int = INGEST_PARSE_WORKERS,
+    prefetch_bytes: int = INGEST_PREFETCH_BYTES,
+) -> Iterator[tuple[int, pd.DataFrame | None, Exception | None]]:
+    """
+    Yield (index, frame, error) for each source in order, where process(index, source,
+    name) parses one source (the source may be its bytes, read ahead; name is then
+    the original source's name). error is what process raised, frame None with it.
+    ReadAborted from process stops the whole pipeline and is raised.
+    """
+    n = len(sources)
+    cancelled = threading.Event()
+    budget = _ByteBudget(prefetch_bytes, cancelled)
+    fingerprints: list[str | None] = [None] * n
+    parsed = [threading.Event() for _ in range(n)]
+    parse_futures: list[Future | None] = [None] * n
+    ready: dict[int, tuple[TableSource, int]] = {}
+    dispatched = 0
+    lock = threading.Lock()
+    submitted = threading.Condition(lock)
+
+    def read(i: int) -> tuple[TableSource, int]:
+        try:
+            if cancelled.is_set():
+                raise ReadAborted("Ingest cancelled.")
+            source = sources[i]
+            fingerprints[i] = header_fingerprint(read_head(source, PROFILE_SAMPLE_BYTES))
+            return _prefetch(source, i, budget)
+        except BaseException:
+            # Later sources take their turns after this one's, so it must be passed on.
+            budget.skip(i)
+            raise
+
+    def parse(i: int, source: TableSource, held: int) -> pd.DataFrame:
+        try:
+            # Same dialect as an earlier file: wait for it, so its learned profile is used.
+            if fingerprints[i] is not None:
+                for j in range(i):
+                    if fingerprints[j] == fingerprints[i]:
+                        parsed[j].wait()
+            if cancelled.is_set():
+                raise ReadAborted("Ingest cancelled.")
+            name = names[i]
+            if name is None and source is not sources[i]:
+                name = source_name(sources[i])
+            return process(i, source, name)
+        finally:
+            budget.release(held)
+            parsed[i].set()
+
+    def on_read_done(i: int, future: Future) -> None:
+        # Parses are submitted in source order, so a parse only waits on ones already started.
+        nonlocal dispatched
+        with submitted:
+            ready[i] = (sources[i], 0) if future.exception() is not None else future.result()
+            while dispatched in ready and not cancelled.is_set():
+                source, held = ready.pop(dispatched)
+                failed = read_futures[dispatched].exception()
+                if failed is not None:
+                    parse_futures[dispatched] = _failed(failed)
+                    parsed[dispatched].set()
+                else:
+                    parse_futures[dispatched] = parse_pool.submit(parse, dispatched, source, held)
+                dispatched += 1
+            submitted.notify_all()
+
+    read_pool = ThreadPoolExecutor(max_workers=max(1, read_workers), thread_name_prefix="ingest-read")
+    parse_pool = ThreadPoolExecutor(max_workers=max(1, parse_workers), thread_name_prefix="ingest-parse")
+    read_futures: list[Future] = []
+    try:
+        for i in range(n):
+            read_futures.append(read_pool.submit(read, i))
+        for i, future in enumerate(read_futures):
+            future.add_done_callback(lambda f, i=i: on_read_done(i, f))
+        for i in range(n):
+            with submitted:
+                while parse_futures[i] is None:
+                    submitted.wait()
+            error = parse_futures[i].exception()
+            if isinstance(error, ReadAborted):
+                raise error
+            yield i, (None if error is not None else parse_futures[i].result()), error
+    finally:
+        cancelled.set()
+        read_pool.shutdown(wait=True, cancel_futures=True)
+        parse_pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _failed(error: BaseException) -> Future:
+    """A finished future holding error."""
+    future: Future = Future()
+    future.set_exception(error)
+    return future
@@ -0,0 +1,153 @@
+"""Background merge jobs: a process-wide worker pool with progress, ETA and cancellation.
+
+Jobs outlive the Streamlit script run (and browser session) that submitted them;
+any session that knows the job id can poll or cancel it.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import pandas as pd
+
+from ._deps import MERGE_JOB_RETENTION_SECONDS, MERGE_JOB_WORKERS, ReadAborted, TableSource
+from .pipeline import merge_sources
+
+
+class JobCancelled(ReadAborted):
+    """Raised inside a job's progress hook once cancellation was requested."""
+
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_jobs: dict[str, dict] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the shared worker pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MERGE_JOB_WORKERS, thread_name_prefix="merge-job")
+    return _executor
+
+
+def _purge_finished_locked(now: float) -> None:
+    """Forget finished jobs older than the retention period."""
+    for job_id in [
+        j for j, job in _jobs.items()
+        if job["finished_at"] is not None and job["finished_at"] + MERGE_JOB_RETENTION_SECONDS < now
+    ]:
+        del _jobs[job_id]
+
+
+def _run_job(
+    job: dict,
+    sources: list[TableSource],
+    merge_kwargs: dict,
+    on_done: Callable[[pd.DataFrame], None] | None,
+) -> None:
+    """Worker body: run merge_sources, feeding progress and honouring cancellation."""
+    cancel: threading.Event = job["_cancel"]
+
+    def on_progress(ratio: float, msg: str) -> None:
+        if cancel.is_set():
+            raise JobCancelled("Merge cancelled.")
+        now = time.time()
+        elapsed = now - job["started_at"]
+        job["progress"] = ratio
+        job["message"] = msg
+        job["eta_seconds"] = elapsed * (1 - ratio) / ratio if ratio > 0.01 else None
+
+    job["status"] = "running"
+    job["started_at"] = time.time()
+    try:
+        if cancel.is_set():
+            raise JobCancelled("Merge cancelled.")
+        df = merge_sources(
+            sources,
+            progress_callback=on_progress,
+            on_warning=job["warnings"].append,
+            **merge_kwargs,
+        )
+        job["result"] = df
+        if on_done is not None and not df.empty:
+            on_done(df)
+        job["status"] = "done"
+        job["progress"] = 1.0
+        job["message"] = "Done."
+    except JobCancelled as e:
+        job["status"] = "cancelled"
+        job["message"] = str(e)
+    except Exception as e:
+        job["status"] = "failed"
+        job["error"] = str(e)
+        job["message"] = f"Merge failed: {e}"
+    finally:
+        job["eta_seconds"] = None
+        job["finished_at"] = time.time()
+
+
+def submit_merge(
+    sources: list[TableSource],
+    base_dir: str | None = None,
+    names: list[str | None] | None = None,
+    on_done: Callable[[pd.DataFrame], None] | None = None,
+    **merge_kwargs,
+) -> str:
+    """
+    Queue merge_sources(sources, ...) on the worker pool and return its job id.
+    on_done(df) runs in the worker after a non-empty merge (e.g. to fill a result cache).
+    """
+    job_id = uuid.uuid4().hex
+    job = {
+        "id": job_id,
+        "status": "queued",
+        "progress": 0.0,
+        "message": "Queued...",
+        "eta_seconds": None,
+        "warnings": [],
+        "result": None,
+        "error": None,
+        "submitted_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "_cancel": threading.Event(),
+    }
+    merge_kwargs.update(base_dir=base_dir, names=names)
+    with _lock:
+        _purge_finished_locked(time.time())
+        _jobs[job_id] = job
+    _get_executor().submit(_run_job, job, list(sources), merge_kwargs, on_done)
+    return job_id
+
+
+def get_job(job_id: str | None) -> dict | None:
+    """Return a snapshot of a job (status, progress, message, eta_seconds, warnings, result, error)."""
+    if not job_id:
+        return None
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        snapshot = {k: v for k, v in job.items() if not k.startswith("_")}
+    snapshot["warnings"] = list(snapshot["warnings"])
+    return snapshot
+
+
+def cancel_job(job_id: str | None) -> bool:
+    """Request cancellation; the job stops at its next progress report. False if unknown or finished."""
+    with _lock:
+        job = _jobs.get(job_id or "")
+        if job is None or job["finished_at"] is not None:
+            return False
+        job["_cancel"].set()
+        return True
+
+
+def list_jobs() -> list[dict]:
+    """Return snapshots of all known jobs, newest first."""
+    with _lock:
+        ids = sorted(_jobs, key=lambda j: _jobs[j]["submitted_at"], reverse=True)
+    return [job for job in (get_job(j) for j in ids) if job is not None]
@@ -0,0 +1,63 @@
+"""Output: write merged results as CSV, gzip CSV, Parquet (optionally partitioned) or XLSX;
+streaming chunked writers split large outputs into size-bounded parts; external-memory
+sort and group-by order and aggregate outputs larger than memory; rollup cubes are
+built while rows stream through and saved beside the output."""
+
+from .chunked import (
+    CSV_COMPRESSIONS,
+    EXCEL_MAX_ROWS,
+    datetime_resolutions,
+    iter_chunks,
+    remove_manifest_parts,
+    write_csv_parts,
+    write_manifest,
+    write_xlsx_parts,
+)
+from .external import DEFAULT_AGGREGATIONS, external_groupby, external_sort
+from .formats import EXPORT_FORMATS, write_table
+from .rollups import (
+    ROLLUP_DIMENSIONS,
+    ROLLUP_FILENAME,
+    ROLLUP_MEASURES,
+    RollupBuilder,
+    build_rollup,
+    merge_rollups,
+    query_rollup,
+    read_rollup,
+    write_rollup,
+)
+from .parquet import (
+    PARTITION_COLUMNS,
+    read_parquet_output,
+    to_output_dtypes,
+    write_parquet,
+)
+
+__all__ = [
+    "CSV_COMPRESSIONS",
+    "DEFAULT_AGGREGATIONS",
+    "EXCEL_MAX_ROWS",
+    "EXPORT_FORMATS",
+    "PARTITION_COLUMNS",
+    "ROLLUP_DIMENSIONS",
+    "ROLLUP_FILENAME",
+    "ROLLUP_MEASURES",
+    "RollupBuilder",
+    "build_rollup",
+    "datetime_resolutions",
+    "external_groupby",
+    "external_sort",
+    "iter_chunks",
+    "merge_rollups",
+    "query_rollup",
+    "read_parquet_output",
+    "read_rollup",
+    "remove_manifest_parts",
+    "to_output_dtypes",
+    "write_csv_parts",
+    "write_manifest",
+    "write_parquet",
+    "write_rollup",
+    "write_table",
+    "write_xlsx_parts",
+]
@@ -0,0 +1,304 @@
+"""Streaming chunked writers: CSV (plain, gzip, zstd) and constant-memory XLSX.
+
+Rows are written block by block, so memory stays bounded by one block. Output
+rolls over to a new part (file, or sheet for XLSX) when a row or byte limit is
+reached, and every writer returns a manifest of the parts it wrote.
+
+to_csv picks a datetime column's text format from the values it is given
+(dates only when every value is midnight, fraction digits for the finest
+fraction), so a CSV writer is given each column's resolution over all rows
+(datetime_resolutions) and formats blocks that would differ to match: every
+block and part of a column then reads the same.
+"""
+
+import gzip
+import json
+import math
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .._deps import OUTPUT_ENCODING
+
+EXCEL_MAX_ROWS = 1_048_576  # rows per sheet, header included
+CHUNK_ROWS = 100_000
+BLOCK_ROWS = 2_000
+CSV_COMPRESSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+# Datetime resolution -> digits after the seconds in to_csv's text ("D": dates only).
+_FRACTION_DIGITS = {"D": None, "s": 0, "ms": 3, "us": 6, "ns": 9}
+_TICKS_PER_SECOND = {"s": 1, "ms": 1_000, "us": 1_000_000, "ns": 1_000_000_000}
+
+
+def iter_chunks(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Yield consecutive row slices of df (views, not copies)."""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start : start + chunk_rows]
+
+
+def _resolution(values: pd.Series) -> str:
+    """How to_csv writes a datetime column: "D" (dates only), "s", "ms", "us" or "ns"."""
+    array = values.to_numpy()
+    per_second = _TICKS_PER_SECOND[np.datetime_data(array.dtype)[0]]
+    ticks = array.view("i8")[~np.isnat(array)]
+    if not (ticks % (86_400 * per_second)).any():
+        return "D"
+    for unit, size in (("s", per_second), ("ms", per_second // 1_000), ("us", per_second // 1_000_000)):
+        if size and not (ticks % size).any():
+            return unit
+    return "ns"
+
+
+def datetime_resolutions(df: pd.DataFrame) -> dict[str, str]:
+    """Resolution (see _resolution) of each timezone-naive datetime column of df, over all rows."""
+    return {
+        col: _resolution(df[col])
+        for col in df.columns
+        if pd.api.types.is_datetime64_dtype(df[col]) and getattr(df[col].dtype, "tz", None) is None
+    }
+
+
+def _format_datetimes(values: pd.Series, resolution: str) -> pd.Series:
+    """Text of datetime values as to_csv writes them at the given resolution (NaN for NaT)."""
+    digits = _FRACTION_DIGITS[resolution]
+    if digits is None:
+        return values.dt.strftime("%Y-%m-%d")
+    text = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+    if digits:
+        fraction = values.dt.microsecond.fillna(0).astype("int64") * 1000 + values.dt.nanosecond.fillna(0).astype("int64")
+        text = text + "." + (fraction // 10 ** (9 - digits)).astype(str).str.zfill(digits)
+    return text.where(values.notna())
+
+
+def _with_resolutions(block: pd.DataFrame, resolutions: dict[str, str]) -> pd.DataFrame:
+    """block with its datetime columns as text wherever to_csv would format them differently."""
+    changed = {
+        col: _format_datetimes(block[col], resolution)
+        for col, resolution in resolutions.items()
+        if col in block.columns and _resolution(block[col]) != resolution
+    }
+    return block.assign(**changed) if changed else block
+
+
+def _iter_blocks(chunks: Iterable[pd.DataFrame], block_rows: int) -> Iterator[pd.DataFrame]:
+    """Re-slice chunks into blocks of at most block_rows rows."""
+    for chunk in chunks:
+        for start in range(0, len(chunk), block_rows):
+            yield chunk.iloc[start : start + block_rows]
+
+
+def _part_path(base_path: Path, index: int, numbered: bool, suffix: str) -> Path:
+    """Return data.csv (single part) or data-001.csv, data-002.csv, ... (numbered parts)."""
+    stem = base_path.name[: -len(base_path.suffix)] if base_path.suffix else base_path.name
+    if not numbered:
+        return base_path.with_name(f"{stem}{base_path.suffix}{suffix}")
+    return base_path.with_name(f"{stem}-{index:03d}{base_path.suffix}{suffix}")
+
+
+def _open_compressed(path: Path, compression: str | None):
+    """Return (writable binary stream, raw file) for the given compression."""
+    raw = open(path, "wb")
+    if compression is None:
+        return raw, raw
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb"), raw
+    try:
+        import zstandard
+    except ImportError as e:
+        raw.close()
+        raise RuntimeError("zstd output requires zstandard (pip install zstandard).") from e
+    return zstandard.ZstdCompressor().stream_writer(raw, closefd=False), raw
+
+
+def write_csv_parts(
+    chunks: Iterable[pd.DataFrame],
+    base_path: str | Path,
+    compression: str | None = None,
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+    block_rows: int = BLOCK_ROWS,
+    resolutions: dict[str, str] | None = None,
+) -> list[dict]:
+    """
+    Stream chunks to CSV, starting a new numbered part when max_rows or max_bytes
+    (on-disk size; checked per block when compressed) would be exceeded.
+    resolutions (datetime_resolutions of all rows) keeps one text format per
+    datetime column across blocks and parts.
+    Returns the manifest: [{"path", "rows", "bytes"}, ...].
+    """
+    if compression not in CSV_COMPRESSIONS:
+        raise ValueError(f"Unknown CSV compression: {compression}")
+    base_path = Path(base_path)
+    base_path.parent.mkdir(parents=True, exist_ok=True)
+    numbered = bool(max_rows or max_bytes)
+    suffix = CSV_COMPRESSIONS[compression]
+    parts: list[dict] = []
+    stream = raw = None
+    columns: list | None = None
+
+    def close_part() -> None:
+        nonlocal stream, raw
+        if stream is None:
+            return
+        if stream is not raw:
+            stream.close()
+        raw.close()
+        parts[-1]["bytes"] = Path(parts[-1]["path"]).stat().st_size
+        stream = raw = None
+
+    def open_part() -> None:
+        nonlocal stream, raw
+        path = _part_path(base_path, len(parts) + 1, numbered, suffix)
+        stream, raw = _open_compressed(path, compression)
+        parts.append({"path": str(path), "rows": 0, "bytes": 0})
+        header = pd.DataFrame(columns=columns).to_csv(index=False)
+        stream.write(header.encode(OUTPUT_ENCODING))
+
+    def part_bytes() -> int:
+        return raw.tell()
+
+    def rows_text(rows: pd.DataFrame) -> bytes:
+        if resolutions:
+            rows = _with_resolutions(rows, resolutions)
+        return rows.to_csv(index=False, header=False).encode("utf-8")
+
+    try:
+        for block in _iter_blocks(chunks, block_rows):
+            if columns is None:
+                columns = list(block.columns)
+            while len(block):
+                if stream is None:
+                    open_part()
+                part = parts[-1]
+                take = len(block) if not max_rows else min(len(block), max_rows - part["rows"])
+                data = rows_text(block.iloc[:take])
+                exact_bytes = max_bytes and compression is None
+                # Shrink the piece until it fits the remaining byte budget.
+                while exact_bytes and take > 1 and part_bytes() + len(data) > max_bytes:
+                    estimate = int(take * (max_bytes - part_bytes()) / len(data))
+                    take = max(1, min(take - 1, estimate))
+                    data = rows_text(block.iloc[:take])
+                if exact_bytes and part["rows"] and part_bytes() + len(data) > max_bytes:
+                    close_part()
+                    continue
+                stream.write(data)
+                part["rows"] += take
+                block = block.iloc[take:]
+                if (max_rows and part["rows"] >= max_rows) or (max_bytes and part_bytes() >= max_bytes):
+                    close_part()
+        if not parts and columns is not None:
+            open_part()
+    finally:
+        close_part()
+    return parts
+
+
+def _excel_value(value):
+    """Convert a cell value to something xlsxwriter writes natively (None for blanks)."""
+    if value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return value.item() if hasattr(value, "item") else value
+
+
+def write_xlsx_parts(
+    chunks: Iterable[pd.DataFrame],
+    base_path: str | Path,
+    max_rows: int | None = None,
+    rollover: str = "sheet",
+    sheet_name: str = "data",
+) -> list[dict]:
+    """
+    Stream chunks to XLSX in xlsxwriter's constant-memory mode. A sheet holds at most
+    max_rows data rows (capped at Excel's 1,048,575); on overflow a new sheet
+    (rollover="sheet") or a new numbered file (rollover="file") is started.
+    Returns the manifest: [{"path", "sheet", "rows"}, ...] plus "bytes" per file.
+    """
+    try:
+        import xlsxwriter
+    except ImportError as e:
+        raise RuntimeError("XLSX output requires xlsxwriter (pip install xlsxwriter).") from e
+    if rollover not in ("sheet", "file"):
+        raise ValueError(f"Unknown rollover mode: {rollover}")
+    limit = min(max_rows or EXCEL_MAX_ROWS - 1, EXCEL_MAX_ROWS - 1)
+    base_path = Path(base_path)
+    base_path.parent.mkdir(parents=True, exist_ok=True)
+    parts: list[dict] = []
+    workbook = worksheet = None
+    date_format = None
+    columns: list | None = None
+    files: list[str] = []
+
+    def close_workbook() -> None:
+        nonlocal workbook
+        if workbook is not None:
+            workbook.close()
+            workbook = None
+
+    def new_sheet() -> None:
+        nonlocal workbook, worksheet, date_format
+        if workbook is None or rollover == "file":
+            close_workbook()
+            path = _part_path(base_path, len(files) + 1, rollover == "file", "")
+            workbook = xlsxwriter.Workbook(str(path), {"constant_memory": True})
+            date_format = workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"})
+            files.append(str(path))
+        n_sheets_in_file = sum(1 for p in parts if p["path"] == files[-1])
+        name = sheet_name if n_sheets_in_file == 0 else f"{sheet_name}_{n_sheets_in_file + 1}"
+        worksheet = workbook.add_worksheet(name)
+        worksheet.write_row(0, 0, [str(c) for c in columns])
+        parts.append({"path": files[-1], "sheet": name, "rows": 0})
+
+    try:
+        for block in _iter_blocks(chunks, BLOCK_ROWS):
+            if columns is None:
+                columns = list(block.columns)
+            for row in block.itertuples(index=False, name=None):
+                if worksheet is None or parts[-1]["rows"] >= limit:
+                    new_sheet()
+                part = parts[-1]
+                r = part["rows"] + 1
+                for c, value in enumerate(row):
+                    value = _excel_value(value)
+                    if value is None:
+                        continue
+                    if hasattr(value, "year") and hasattr(value, "hour"):
+                        worksheet.write_datetime(r, c, value.replace(tzinfo=None), date_format)
+                    else:
+                        worksheet.write(r, c, value)
+                part["rows"] += 1
+        if not parts and columns is not None:
+            new_sheet()
+    finally:
+        close_workbook()
+    for part in parts:
+        part["bytes"] = Path(part["path"]).stat().st_size
+    return parts
+
+
+def write_manifest(parts: list[dict], path: str | Path) -> Path:
+    """Write a parts manifest as JSON and return its path."""
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"parts": parts, "rows": sum(p["rows"] for p in parts)}, f, indent=2)
+    return path
+
+
+def remove_manifest_parts(path: str | Path) -> None:
+    """Delete the parts listed in a previous manifest (and the manifest itself)."""
+    path = Path(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return
+    for part in data.get("parts", []):
+        Path(part.get("path", "")).unlink(missing_ok=True)
+    path.unlink(missing_ok=True)
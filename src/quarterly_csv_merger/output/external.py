@@ -0,0 +1,254 @@
+"""External-memory sort and group-by over a stream of row chunks.
+
+Sorting spills sorted runs of at most run_rows rows to disk and k-way merges
+them block by block. Aggregation pre-aggregates each chunk, and once the
+partial groups outgrow memory_rows it hash-partitions them to disk and
+finishes one partition at a time. Memory stays bounded by the run / partition
+size, not by the size of the output.
+"""
+
+import os
+import pickle
+import tempfile
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+SORT_RUN_ROWS = 500_000
+MERGE_BLOCK_ROWS = 50_000
+AGG_MEMORY_ROWS = 1_000_000
+AGG_PARTITIONS = 16
+# output name -> (column, function); functions: size, count, sum, min, max, mean
+DEFAULT_AGGREGATIONS: dict[str, tuple[str, str]] = {
+    "Mentions": ("URL", "size"),
+    "Reach": ("Reach", "sum"),
+    "Engagement": ("Engagement", "sum"),
+    "AVE": ("AVE", "sum"),
+}
+_RUN_COLUMN = "__run"
+
+
+def _write_run(df: pd.DataFrame, directory: str, index: int, block_rows: int) -> str:
+    """Spill a sorted run as consecutive pickled blocks; return its path."""
+    path = os.path.join(directory, f"run-{index:05d}.pkl")
+    with open(path, "wb") as f:
+        for start in range(0, len(df), block_rows):
+            pickle.dump(df.iloc[start : start + block_rows], f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_blocks(path: str) -> Iterator[pd.DataFrame]:
+    """Yield the blocks of a spilled run in order."""
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def external_sort(
+    chunks: Iterable[pd.DataFrame],
+    by: list[str],
+    ascending: bool = True,
+    run_rows: int = SORT_RUN_ROWS,
+    block_rows: int = MERGE_BLOCK_ROWS,
+    spill_dir: str | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the rows of chunks sorted by the columns in by (missing values last).
+    Input that fits in one run is sorted in memory; larger input is spilled to
+    sorted runs in a temporary directory under spill_dir and k-way merged.
+    """
+    by = list(by)
+    if spill_dir:
+        os.makedirs(spill_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="sort-", dir=spill_dir) as tmp:
+        runs: list[str] = []
+        pending: list[pd.DataFrame] = []
+        pending_rows = 0
+        for chunk in chunks:
+            missing = [c for c in by if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"Cannot sort by missing column(s): {', '.join(missing)}")
+            pending.append(chunk)
+            pending_rows += len(chunk)
+            if pending_rows >= run_rows:
+                run = pd.concat(pending, ignore_index=True).sort_values(by, ascending=ascending, kind="stable")
+                runs.append(_write_run(run, tmp, len(runs), block_rows))
+                pending, pending_rows = [], 0
+        last = (
+            pd.concat(pending, ignore_index=True).sort_values(by, ascending=ascending, kind="stable")
+            if pending
+            else None
+        )
+        if not runs:
+            if last is not None:
+                for start in range(0, len(last), block_rows):
+                    yield last.iloc[start : start + block_rows].reset_index(drop=True)
+            return
+        if last is not None:
+            runs.append(_write_run(last, tmp, len(runs), block_rows))
+        yield from _merge_runs([_read_blocks(p) for p in runs], by, ascending)
+
+
+def _merge_runs(readers: list[Iterator[pd.DataFrame]], by: list[str], ascending: bool) -> Iterator[pd.DataFrame]:
+    """
+    K-way merge of sorted runs, a block at a time: the buffered rows are sorted
+    together and everything up to the last buffered row of the run whose buffer
+    ends earliest is safe to emit; that run is then refilled.
+    """
+    buffers: dict[int, pd.DataFrame] = {}
+    live: set[int] = set()
+    for i, reader in enumerate(readers):
+        block = next(reader, None)
+        if block is not None:
+            buffers[i] = block.assign(**{_RUN_COLUMN: i})
+            live.add(i)
+    while buffers:
+        combined = pd.concat(buffers.values(), ignore_index=True)
+        # Ties keep input order: earlier runs first, whichever way the keys sort.
+        combined = combined.sort_values([*by, _RUN_COLUMN], ascending=[ascending] * len(by) + [True], kind="stable")
+        runs = combined[_RUN_COLUMN].to_numpy()
+        cut = len(combined)
+        for i in live:
+            # Position of run i's last buffered row in the merged order.
+            cut = min(cut, int(np.flatnonzero(runs == i)[-1]) + 1)
+        emit = combined.iloc[:cut]
+        rest = combined.iloc[cut:]
+        yield emit.drop(columns=_RUN_COLUMN).reset_index(drop=True)
+        buffers = {i: group for i, group in rest.groupby(_RUN_COLUMN, sort=False)}
+        for i in list(live):
+            if i in buffers:
+                continue
+            block = next(readers[i], None)
+            if block is None:
+                live.discard(i)
+            else:
+                buffers[i] = block.assign(**{_RUN_COLUMN: i})
+
+
+def _partial(chunk: pd.DataFrame, by: list[str], aggs: dict[str, tuple[str, str]]) -> pd.DataFrame:
+    """Pre-aggregate one chunk into partial results (means as sum + count)."""
+    keys = chunk[by].copy()
+    for col in by:
+        # Numeric keys are compared (and hashed) as floats so 1 and 1.0 group together.
+        if pd.api.types.is_numeric_dtype(keys[col]):
+            keys[col] = keys[col].astype("float64")
+    values = {}
+    for name, (col, func) in aggs.items():
+        if func == "size":
+            values[name] = np.ones(len(chunk), dtype=np.int64)
+        elif func == "count":
+            values[name] = chunk[col].notna().astype(np.int64)
+        elif func in ("sum", "mean"):
+            numeric = pd.to_numeric(chunk[col], errors="coerce")
+            if func == "mean":
+                values[f"{name}__count"] = numeric.notna().astype(np.int64)
+                name = f"{name}__sum"
+            values[name] = numeric.fillna(0)
+        elif func in ("min", "max"):
+            values[name] = pd.to_numeric(chunk[col], errors="coerce")
+        else:
+            raise ValueError(f"Unknown aggregation: {func}")
+    frame = pd.concat([keys.reset_index(drop=True), pd.DataFrame(values).reset_index(drop=True)], axis=1)
+    return _merge_partials(frame, by, aggs)
+
+
+def _merge_partials(partials: pd.DataFrame, by: list[str], aggs: dict[str, tuple[str, str]]) -> pd.DataFrame:
+    """Combine partial results of the same groups (still in partial form)."""
+    how = {}
+    for name, (_, func) in aggs.items():
+        if func == "mean":
+            how[f"{name}__sum"] = "sum"
+            how[f"{name}__count"] = "sum"
+        elif func in ("min", "max"):
+            how[name] = func
+        else:
+            how[name] = "sum"
+    return partials.groupby(by, dropna=False, sort=False).agg(how).reset_index()
+
+
+def _finalize(partials: pd.DataFrame, aggs: dict[str, tuple[str, str]]) -> pd.DataFrame:
+    """Turn partial columns into final aggregate columns."""
+    for name, (_, func) in aggs.items():
+        if func == "mean":
+            total = partials.pop(f"{name}__sum")
+            count = partials.pop(f"{name}__count")
+            partials[name] = total / count.where(count > 0)
+    return partials
+
+
+def _spill_partitions(partials: pd.DataFrame, by: list[str], files: list) -> None:
+    """Append partial rows to the partition file chosen by the hash of their key."""
+    part = pd.util.hash_pandas_object(partials[by], index=False).to_numpy() % len(files)
+    for i, group in partials.groupby(part, sort=False):
+        pickle.dump(group, files[i], protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def external_groupby(
+    chunks: Iterable[pd.DataFrame],
+    by: list[str],
+    aggs: dict[str, tuple[str, str]] | None = None,
+    memory_rows: int = AGG_MEMORY_ROWS,
+    partitions: int = AGG_PARTITIONS,
+    spill_dir: str | None = None,
+) -> pd.DataFrame:
+    """
+    Group the rows of chunks by the columns in by and aggregate (default: mentions
+    and Reach/Engagement/AVE totals). Partial groups beyond memory_rows are
+    hash-partitioned to disk; each partition is then finished on its own.
+    Returns one row per group, sorted by the group columns.
+    """
+    by = list(by)
+    aggs = aggs or {name: spec for name, spec in DEFAULT_AGGREGATIONS.items()}
+    if spill_dir:
+        os.makedirs(spill_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="groupby-", dir=spill_dir) as tmp:
+        paths = [os.path.join(tmp, f"part-{i:03d}.pkl") for i in range(partitions)]
+        files: list | None = None
+        buffer: list[pd.DataFrame] = []
+        buffered = 0
+        try:
+            for chunk in chunks:
+                missing = [c for c in [*by, *(col for col, _ in aggs.values())] if c not in chunk.columns]
+                if missing:
+                    raise ValueError(f"Cannot aggregate missing column(s): {', '.join(missing)}")
+                if chunk.empty:
+                    continue
+                buffer.append(_partial(chunk, by, aggs))
+                buffered += len(buffer[-1])
+                if buffered <= memory_rows:
+                    continue
+                merged = _merge_partials(pd.concat(buffer, ignore_index=True), by, aggs)
+                buffer, buffered = [merged], len(merged)
+                if buffered > memory_rows // 2:
+                    if files is None:
+                        files = [open(p, "wb") for p in paths]
+                    _spill_partitions(merged, by, files)
+                    buffer, buffered = [], 0
+            if files is None:
+                if not buffer:
+                    return pd.DataFrame(columns=[*by, *aggs])
+                result = _finalize(_merge_partials(pd.concat(buffer, ignore_index=True), by, aggs), aggs)
+            else:
+                if buffer:
+                    _spill_partitions(pd.concat(buffer, ignore_index=True), by, files)
+                for f in files:
+                    f.close()
+                finished = []
+                for path in paths:
+                    blocks = list(_read_blocks(path))
+                    if blocks:
+                        merged = _merge_partials(pd.concat(blocks, ignore_index=True), by, aggs)
+                        finished.append(_finalize(merged, aggs))
+                result = pd.concat(finished, ignore_index=True)
+        finally:
+            for f in files or []:
+                f.close()
+    for col in by:
+        values = result[col]
+        if values.dtype == "float64" and (values.dropna() % 1 == 0).all():
+            result[col] = values.astype("Int64")
+    return result.sort_values(by, kind="stable").reset_index(drop=True)
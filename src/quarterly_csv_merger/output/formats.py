@@ -0,0 +1,49 @@
+"""Write a DataFrame to disk in one of the supported export formats."""
+
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from .._deps import OUTPUT_ENCODING
+from .chunked import iter_chunks, write_xlsx_parts
+from .parquet import _require_pyarrow, to_output_dtypes
+
+# format -> (file suffix, MIME type, label)
+EXPORT_FORMATS: dict[str, tuple[str, str, str]] = {
+    "csv": (".csv", "text/csv", "CSV"),
+    "csv.gz": (".csv.gz", "application/gzip", "CSV (gzip)"),
+    "parquet": (".parquet", "application/vnd.apache.parquet", "Parquet"),
+    "xlsx": (
+        ".xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "Excel (XLSX)",
+    ),
+}
+
+
+def write_table(df: pd.DataFrame, path: str | Path, fmt: str = "csv") -> Path:
+    """Write df to path in the given format (atomically: temp file, then replace)."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt} (choose from {', '.join(EXPORT_FORMATS)})")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique per writer: sessions exporting the same result at once must not share it.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        if fmt == "csv":
+            df.to_csv(tmp, index=False, encoding=OUTPUT_ENCODING)
+        elif fmt == "csv.gz":
+            df.to_csv(tmp, index=False, encoding=OUTPUT_ENCODING, compression="gzip")
+        elif fmt == "parquet":
+            _require_pyarrow()
+            to_output_dtypes(df).to_parquet(tmp, index=False, engine="pyarrow")
+        else:
+            # Rolls over to extra sheets past Excel's row limit.
+            write_xlsx_parts(iter_chunks(df), tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return path
@@ -0,0 +1,95 @@
+"""Columnar output: Parquet files or Hive-partitioned Parquet datasets with typed columns."""
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+# Low-cardinality output columns stored as dictionary-encoded categoricals.
+CATEGORICAL_OUTPUT_COLUMNS = (
+    "MonthName",
+    "Market",
+    "Media Platform",
+    "Brand",
+    "Country",
+    "Sentiment",
+    "Media Type",
+)
+# Whole-number output columns stored as nullable integers.
+INTEGER_OUTPUT_COLUMNS = ("Day", "Year", "Quarter", "Engagement")
+PARTITION_COLUMNS = ("Year", "Quarter", "Country")
+
+
+def _require_pyarrow():
+    """Import pyarrow.parquet or raise a clear error."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow).") from e
+    return pq
+
+
+def to_output_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Return df with categorical and nullable-integer dtypes for columnar output."""
+    df = df.copy()
+    for col in CATEGORICAL_OUTPUT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in INTEGER_OUTPUT_COLUMNS:
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype("Int64")
+    return df
+
+
+def write_parquet(
+    df: pd.DataFrame,
+    path: str | Path,
+    partition_by: list[str] | tuple[str, ...] | None = None,
+) -> Path:
+    """
+    Write df as a single Parquet file, or as a Hive-partitioned dataset directory
+    (e.g. Year=2024/Quarter=1/Country=Indonesia/) when partition_by is given.
+    An existing output at path is replaced.
+    """
+    pq = _require_pyarrow()
+    import pyarrow as pa
+
+    path = Path(path)
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    typed = to_output_dtypes(df)
+    if not partition_by:
+        typed.to_parquet(path, index=False, engine="pyarrow")
+        return path
+    missing = [c for c in partition_by if c not in typed.columns]
+    if missing:
+        raise ValueError(f"Cannot partition by missing column(s): {', '.join(missing)}")
+    table = pa.Table.from_pandas(typed, preserve_index=False)
+    pq.write_to_dataset(table, root_path=str(path), partition_cols=list(partition_by))
+    return path
+
+
+def read_parquet_output(
+    path: str | Path,
+    filters: dict[str, list] | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Read a Parquet output. filters maps column -> allowed values; on partitioned
+    datasets, filters on partition columns skip whole directories.
+    """
+    pq = _require_pyarrow()
+    import pyarrow as pa
+
+    expr = None
+    if filters:
+        expr = [(col, "in", list(values)) for col, values in filters.items() if values]
+    table = pq.read_table(str(path), columns=columns, filters=expr or None)
+    for i, field in enumerate(table.schema):
+        # Numeric partition keys come back dictionary-encoded; restore plain integers.
+        if pa.types.is_dictionary(field.type) and not pa.types.is_string(field.type.value_type):
+            table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+    return table.to_pandas()
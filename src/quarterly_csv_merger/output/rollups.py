@@ -0,0 +1,133 @@
+"""Rollup cube: mentions and Reach/Engagement/AVE totals per dimension combination.
+
+The cube holds one row per Year × Quarter × Country × Brand × Media Type × Media
+Platform combination. It is built chunk by chunk while rows are written, saved
+beside the output, and every measure is a plain sum, so cubes can be merged and
+any coarser rollup (e.g. mentions per Country) is a query over a few kilobytes.
+"""
+
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+from .._deps import OUTPUT_ENCODING
+
+ROLLUP_DIMENSIONS = ("Year", "Quarter", "Country", "Brand", "Media Type", "Media Platform")
+ROLLUP_MEASURES = ("Mentions", "Reach", "Engagement", "AVE")
+ROLLUP_FILENAME = "data.rollup.csv"
+_COMPACT_EVERY = 32
+_INTEGER_DIMENSIONS = ("Year", "Quarter")
+
+
+def _empty_cube() -> pd.DataFrame:
+    """Return a cube with no rows."""
+    return pd.DataFrame(columns=[*ROLLUP_DIMENSIONS, *ROLLUP_MEASURES])
+
+
+def _sum_cube(frame: pd.DataFrame) -> pd.DataFrame:
+    """Sum measures per dimension combination."""
+    return frame.groupby(list(ROLLUP_DIMENSIONS), dropna=False, sort=False)[list(ROLLUP_MEASURES)].sum().reset_index()
+
+
+def _cube_of(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Roll up one chunk of output rows."""
+    frame = pd.DataFrame(index=chunk.index)
+    for col in ROLLUP_DIMENSIONS:
+        values = chunk[col] if col in chunk.columns else pd.Series(pd.NA, index=chunk.index)
+        if col in _INTEGER_DIMENSIONS:
+            values = pd.to_numeric(values, errors="coerce").round().astype("Int64")
+        else:
+            values = values.astype(object).where(values.notna() & (values.astype(str) != ""), None)
+        frame[col] = values
+    frame["Mentions"] = 1
+    for col in ROLLUP_MEASURES[1:]:
+        values = chunk[col] if col in chunk.columns else pd.Series(0, index=chunk.index)
+        frame[col] = pd.to_numeric(values, errors="coerce").fillna(0)
+    return _sum_cube(frame)
+
+
+def merge_rollups(*cubes: pd.DataFrame) -> pd.DataFrame:
+    """Merge cubes (e.g. of separate files or runs) into one."""
+    cubes = [c for c in cubes if c is not None and not c.empty]
+    if not cubes:
+        return _empty_cube()
+    return _sum_cube(pd.concat(cubes, ignore_index=True))
+
+
+class RollupBuilder:
+    """Accumulates a rollup cube from chunks as they stream past."""
+
+    def __init__(self):
+        self._cubes: list[pd.DataFrame] = []
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        """Roll up one chunk of output rows."""
+        if chunk.empty:
+            return
+        self._cubes.append(_cube_of(chunk))
+        if len(self._cubes) >= _COMPACT_EVERY:
+            self._cubes = [merge_rollups(*self._cubes)]
+
+    def tee(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Yield chunks unchanged, rolling each one up on the way through."""
+        for chunk in chunks:
+            self.add(chunk)
+            yield chunk
+
+    def cube(self) -> pd.DataFrame:
+        """Return the cube of everything added so far, sorted by dimension."""
+        cube = merge_rollups(*self._cubes)
+        return cube.sort_values(list(ROLLUP_DIMENSIONS), kind="stable").reset_index(drop=True)
+
+
+def build_rollup(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Return the rollup cube of a stream of output chunks."""
+    builder = RollupBuilder()
+    for chunk in chunks:
+        builder.add(chunk)
+    return builder.cube()
+
+
+def write_rollup(cube: pd.DataFrame, path: str | Path) -> Path:
+    """Write a cube as CSV and return its path."""
+    path = Path(path)
+    cube.to_csv(path, index=False, encoding=OUTPUT_ENCODING)
+    return path
+
+
+def read_rollup(path: str | Path) -> pd.DataFrame | None:
+    """Read a cube written by write_rollup (None if missing or unreadable)."""
+    try:
+        cube = pd.read_csv(path, encoding=OUTPUT_ENCODING)
+    except (OSError, ValueError):
+        return None
+    if list(cube.columns) != [*ROLLUP_DIMENSIONS, *ROLLUP_MEASURES]:
+        return None
+    for col in _INTEGER_DIMENSIONS:
+        cube[col] = pd.to_numeric(cube[col], errors="coerce").astype("Int64")
+    return cube
+
+
+def query_rollup(
+    cube: pd.DataFrame,
+    group_by: list[str] | tuple[str, ...] = (),
+    filters: dict[str, list] | None = None,
+) -> pd.DataFrame:
+    """
+    Aggregate a cube to the group_by dimensions (all rows when empty), keeping
+    only combinations whose dimension values are in filters.
+    """
+    unknown = [c for c in [*group_by, *(filters or {})] if c not in ROLLUP_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown rollup dimension(s): {', '.join(unknown)}")
+    for col, values in (filters or {}).items():
+        if values:
+            cube = cube[cube[col].isin(list(values))]
+    if not group_by:
+        return cube.assign(_all=0).groupby("_all")[list(ROLLUP_MEASURES)].sum().reset_index(drop=True)
+    return (
+        cube.groupby(list(group_by), dropna=False)[list(ROLLUP_MEASURES)]
+        .sum()
+        .reset_index()
+    )
@@ -1,12 +1,30 @@
 """Merge pipeline: ingest, clean, tag, transform, output."""
 
+import json
 import os
+import sys
+import threading
+import time
 from pathlib import Path
+from typing import Callable
+
 import pandas as pd
 
-from ._deps import OUTPUT_DIR, OUTPUT_ENCODING, RAW_DATA_PATH
-from .ingest import collect_files, process_file
-from .cleaning import drop_blank_url_rows
+from ._deps import (
+    MERGE_SERVICE_PORT,
+    OUTPUT_CSV_COLUMNS,
+    OUTPUT_DIR,
+    OUTPUT_ENCODING,
+    RAW_DATA_PATH,
+    SOURCE_FILE_COLUMN,
+    SPILL_DIR,
+    TableSource,
+    source_name,
+    source_size,
+)
+from .engines import DEFAULT_ENGINE, ENGINES, check_engine
+from .ingest import collect_files, pipelined_ingest, process_file
+from .cleaning import DuplicateIndex, drop_blank_url_rows, drop_duplicate_mentions
 from .tagging import (
     add_market_column,
     add_media_platform_column,
@@ -15,52 +33,320 @@ from .tagging import (
 )
 from .transforms import add_date_columns, set_engagement_from_sum
 from .columns import select_output_columns
+from .quality import (
+    QUALITY_METRICS,
+    QUALITY_REPORT_NAME,
+    check_thresholds,
+    finish_profile,
+    new_profile,
+    record_ingest,
+    record_stage,
+    write_profile,
+)
+from .preview import PREVIEW_FILENAME, tag_distributions
+from .stage_cache import get_stage_output, put_stage_output, stage_key
+from .output import (
+    CSV_COMPRESSIONS,
+    PARTITION_COLUMNS,
+    ROLLUP_FILENAME,
+    RollupBuilder,
+    datetime_resolutions,
+    external_groupby,
+    external_sort,
+    iter_chunks,
+    remove_manifest_parts,
+    write_csv_parts,
+    write_manifest,
+    write_parquet,
+    write_rollup,
+    write_xlsx_parts,
+)
+
+
+ProgressCallback = Callable[[float, str], None]
+
+# (label, stage function, whether it takes base_dir), in pipeline order.
+STAGES: tuple[tuple[str, Callable[..., pd.DataFrame], bool], ...] = (
+    ("Remove blank URLs", drop_blank_url_rows, False),
+    ("Market", add_market_column, False),
+    ("Media Platform", add_media_platform_column, False),
+    ("Media Type", add_media_type_column, False),
+    ("Date columns", add_date_columns, False),
+    ("Engagement", set_engagement_from_sum, False),
+    ("Brand", add_brand_from_keywords, True),
+)
 
 
-def merge_data(input_path: str, base_dir: str | None = None) -> pd.DataFrame:
-    """Load and merge CSV/Excel files by country keywords; return transformed DataFrame."""
+def _default_base_dir() -> str:
+    """Return project root directory."""
+    return str(Path(__file__).resolve().parent.parent.parent)
+
+
+def run_stages(
+    df: pd.DataFrame,
+    base_dir: str | None = None,
+    progress_callback: ProgressCallback | None = None,
+    on_warning: Callable[[str], None] | None = None,
+    profile: dict | None = None,
+    engine: str = DEFAULT_ENGINE,
+    stage_cache: bool = False,
+) -> pd.DataFrame:
+    """
+    Run cleaning, tagging and transform stages in order.
+    If on_warning is given, a failing stage is reported and skipped; otherwise it raises.
+    If profile is given, each stage's rows, time and quality checks are recorded in it.
+    engine "polars" runs the stages as Polars expressions (same result; falls back to
+    pandas for columns Polars cannot hold exactly).
+    stage_cache reuses each stage's output from earlier runs while its input columns
+    and config are unchanged (pandas engine, see stage_cache).
+    """
     if base_dir is None:
-        base_dir = str(Path(__file__).resolve().parent.parent.parent)
-    if not input_path or not str(input_path).strip():
-        return pd.DataFrame()
-    path = input_path.strip()
-    path = os.path.join(base_dir, path) if not os.path.isabs(path) else path
+        base_dir = _default_base_dir()
+    if check_engine(engine) == "polars":
+        from .engines.polars_engine import PolarsUnsupported, run_polars_stages
 
-    files = collect_files(path)
-    if not files:
-        return pd.DataFrame()
+        try:
+            df, timings = run_polars_stages(df, base_dir, progress_callback, on_warning)
+        except PolarsUnsupported:
+            pass
+        else:
+            # No stage after blank-URL removal drops rows or rewrites an earlier stage's
+            # column, so the checks give the same counts on the final frame.
+            if profile is not None:
+                for label, rows_in, rows_out, seconds in timings:
+                    record_stage(profile, label, rows_in, df, seconds, rows_out=rows_out)
+            return df
+    for i, (label, fn, needs_base_dir) in enumerate(STAGES):
+        rows_in = len(df)
+        started = time.perf_counter()
+        key = stage_key(fn, df, base_dir) if stage_cache else None
+        cached = get_stage_output(base_dir, key, df)
+        if progress_callback is not None:
+            status = "cached" if cached is not None else f"{rows_in:,} rows"
+            progress_callback(i / len(STAGES), f"{label} ({status})...")
+        if cached is not None:
+            df = cached
+        else:
+            try:
+                before = df
+                df = fn(df, base_dir=base_dir) if needs_base_dir else fn(df)
+                put_stage_output(base_dir, key, before, df)
+            except Exception as e:
+                if on_warning is None:
+                    raise
+                on_warning(f"Step «{label}» skipped: {e}")
+        if profile is not None:
+            record_stage(profile, label, rows_in, df, time.perf_counter() - started)
+    return df
+
+
+def merge_sources(
+    sources: list[TableSource],
+    base_dir: str | None = None,
+    names: list[str | None] | None = None,
+    progress_callback: ProgressCallback | None = None,
+    on_warning: Callable[[str], None] | None = None,
+    dedupe: bool | DuplicateIndex = False,
+    profile: bool = False,
+    nrows: int | None = None,
+    sample: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    stage_cache: bool = False,
+) -> pd.DataFrame:
+    """
+    Process each source (path, buffer or upload), combine rows and run all stages.
+    Sources are read ahead and parsed concurrently (ingest.pipelined), in source order.
+    names gives the filename for each source when it has none of its own.
+    progress_callback(progress_ratio, message) is called with 0.0 to 1.0, including
+    byte-level progress while each file is parsed; it may raise ReadAborted to cancel.
+    on_warning(message) receives skipped files and stages (default: print, stages raise).
+    dedupe drops repeated mentions (URL + Date + Influencer) before the stages; pass a
+    DuplicateIndex to also drop mentions kept by earlier calls. Duplicates removed per
+    source file are in df.attrs["duplicates"].
+    profile collects a data-quality profile while the stages run (df.attrs["quality"]).
+    nrows reads only the first nrows rows of each source (with sample, a random
+    sample of nrows rows), so a preview runs the same stages on a fraction of the data.
+    engine selects the execution engine for country assignment and the stages
+    ("pandas" or "polars", see engines). stage_cache as in run_stages.
+    """
+    if base_dir is None:
+        base_dir = _default_base_dir()
+    check_engine(engine)
+    names = list(names) if names is not None else [None] * len(sources)
+    n_steps = len(sources) + 1 + len(STAGES)
+
+    def report(step: float, msg: str) -> None:
+        if progress_callback is not None:
+            progress_callback(min(1.0, step / n_steps), msg)
+
+    labels = [os.path.basename(source_name(source, name)) for source, name in zip(sources, names)]
+    sizes = [source_size(source) for source in sources]
+    # Files are read and parsed concurrently (see ingest.pipelined); progress is the
+    # sum of the per-file fractions read.
+    read_fractions = [0.0] * len(sources)
+    progress_lock = threading.Lock()
+
+    def on_read(i: int, pos: int) -> None:
+        size = sizes[i]
+        if size:
+            with progress_lock:
+                read_fractions[i] = min(pos, size) / size
+                report(sum(read_fractions), f"Reading {labels[i]}... {pos / 1e6:,.1f} / {size / 1e6:,.1f} MB")
+
+    def process(i: int, source: TableSource, name: str | None) -> pd.DataFrame:
+        if progress_callback is not None:
+            with progress_lock:
+                report(sum(read_fractions), f"Reading {labels[i]}...")
+        return process_file(
+            source,
+            base_dir=base_dir,
+            name=name,
+            on_read=(lambda pos: on_read(i, pos)) if progress_callback is not None else None,
+            nrows=nrows,
+            sample=sample,
+            engine=engine,
+        )
 
     frames = []
-    for f in files:
-        try:
-            df = process_file(f, base_dir=base_dir)
-            if not df.empty:
-                frames.append(df)
-        except Exception as e:
-            print(f"Warning: skipped {f}: {e}")
+    for i, df, error in pipelined_ingest(sources, names, process):
+        if error is not None:
+            if on_warning is None:
+                print(f"Warning: skipped {labels[i]}: {error}")
+            else:
+                on_warning(f"Skipped {labels[i]}: {error}")
+        elif not df.empty:
+            df[SOURCE_FILE_COLUMN] = labels[i]
+            frames.append(df)
 
     if not frames:
+        report(n_steps, "Done.")
         return pd.DataFrame()
 
+    report(len(sources), f"Combining {sum(len(f) for f in frames):,} rows...")
     merged = pd.concat(frames, ignore_index=True)
-    merged = drop_blank_url_rows(merged)
-    merged = add_market_column(merged)
-    merged = add_media_platform_column(merged)
-    merged = add_media_type_column(merged)
-    merged = add_date_columns(merged)
-    merged = set_engagement_from_sum(merged)
-    merged = add_brand_from_keywords(merged, base_dir=base_dir)
+    quality = new_profile() if profile else None
+    if quality is not None:
+        record_ingest(quality, merged)
+    duplicates: dict[str, int] = {}
+    if dedupe is not False:
+        report(len(sources), f"Removing duplicates ({len(merged):,} rows)...")
+        index = dedupe if isinstance(dedupe, DuplicateIndex) else None
+        merged, duplicates = drop_duplicate_mentions(merged, index)
+        if quality is not None:
+            quality["duplicates"] = duplicates
+
+    def stage_progress(ratio: float, msg: str) -> None:
+        report(len(sources) + 1 + ratio * len(STAGES), msg)
+
+    merged = run_stages(
+        merged,
+        base_dir,
+        progress_callback=stage_progress,
+        on_warning=on_warning,
+        profile=quality,
+        engine=engine,
+        stage_cache=stage_cache,
+    )
+    if quality is not None:
+        merged.attrs["quality"] = finish_profile(quality, merged)
+    if dedupe is not False:
+        merged.attrs["duplicates"] = duplicates
+    report(n_steps, "Done.")
     return merged
 
 
+def resolve_input_files(
+    input_path: str,
+    base_dir: str | None = None,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+) -> list[TableSource]:
+    """
+    Return the CSV/Excel sources at input_path (a file, archive or folder, relative to
+    base_dir), filtered by include / exclude glob patterns (see ingest.collect_files).
+    """
+    if base_dir is None:
+        base_dir = _default_base_dir()
+    if not input_path or not str(input_path).strip():
+        return []
+    path = input_path.strip()
+    path = os.path.join(base_dir, path) if not os.path.isabs(path) else path
+    return collect_files(path, include=include, exclude=exclude)
+
+
+def merge_data(
+    input_path: str,
+    base_dir: str | None = None,
+    dedupe: bool = False,
+    profile: bool = False,
+    nrows: int | None = None,
+    sample: bool = False,
+    progress_callback: ProgressCallback | None = None,
+    engine: str = DEFAULT_ENGINE,
+    stage_cache: bool = False,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Load and merge CSV/Excel files by country keywords; return transformed DataFrame.
+    nrows / sample merge only a preview of each file; engine and stage_cache as in merge_sources.
+    include / exclude select files by glob pattern (see ingest.collect_files).
+    """
+    if base_dir is None:
+        base_dir = _default_base_dir()
+    files = resolve_input_files(input_path, base_dir, include=include, exclude=exclude)
+    if not files:
+        return pd.DataFrame()
+    return merge_sources(
+        files,
+        base_dir=base_dir,
+        progress_callback=progress_callback,
+        dedupe=dedupe,
+        profile=profile,
+        nrows=nrows,
+        sample=sample,
+        engine=engine,
+        stage_cache=stage_cache,
+    )
+
+
+OUTPUT_FORMATS = ("csv", "parquet", "xlsx")
+
+
 def run_merge_and_save(
     input_path: str,
     base_dir: str | None = None,
     df: pd.DataFrame | None = None,
+    output_format: str = "csv",
+    partition_by: list[str] | None = None,
+    compression: str | None = None,
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+    rollover: str = "sheet",
+    sort_by: list[str] | None = None,
+    aggregate_by: list[str] | None = None,
+    rollup: bool = True,
 ) -> Path | None:
-    """Merge data (or use provided df), select output columns, save to output dir."""
+    """
+    Merge data (or use provided df), select output columns, save to output dir.
+    output_format "csv" writes data.csv; "parquet" writes data.parquet with typed
+    columns, as a partitioned dataset directory when partition_by is given.
+    CSV with compression/max_rows/max_bytes, and "xlsx", are streamed in chunks and
+    split into parts (XLSX: new sheet or file per rollover); these return the path
+    of data.manifest.json listing the parts. compression/max_bytes with another
+    format, or max_rows with parquet, raise ValueError.
+    sort_by orders the rows with an external (spill-to-disk) sort; aggregate_by also
+    writes data.aggregate.csv with mentions and Reach/Engagement/AVE totals per group.
+    With rollup, the rollup cube is built while rows are written and saved as data.rollup.csv.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if (compression or max_bytes) and output_format != "csv":
+        raise ValueError("compression and max_bytes require output_format 'csv'")
+    if max_rows and output_format == "parquet":
+        raise ValueError("max_rows requires output_format 'csv' or 'xlsx'")
     if base_dir is None:
-        base_dir = str(Path(__file__).resolve().parent.parent.parent)
+        base_dir = _default_base_dir()
     if df is None:
         df = merge_data(input_path, base_dir=base_dir)
     if df.empty:
@@ -69,13 +355,124 @@ def run_merge_and_save(
     base = Path(base_dir)
     out_dir = base / OUTPUT_DIR
     out_dir.mkdir(parents=True, exist_ok=True)
-    out_csv = out_dir / "data.csv"
-    out_df.to_csv(out_csv, index=False, encoding=OUTPUT_ENCODING)
-    return out_csv
+    spill_dir = str(base / SPILL_DIR)
+    if aggregate_by:
+        aggregates = external_groupby(iter_chunks(out_df), aggregate_by, spill_dir=spill_dir)
+        aggregates.to_csv(out_dir / "data.aggregate.csv", index=False, encoding=OUTPUT_ENCODING)
+    chunks = external_sort(iter_chunks(out_df), sort_by, spill_dir=spill_dir) if sort_by else iter_chunks(out_df)
+    rollups = RollupBuilder() if rollup else None
+    if rollups is not None:
+        chunks = rollups.tee(chunks)
+    if output_format == "parquet":
+        if sort_by:
+            out_df = pd.concat(chunks, ignore_index=True)
+        elif rollups is not None:
+            for _ in chunks:
+                pass
+        out_path = write_parquet(out_df, out_dir / "data.parquet", partition_by=partition_by)
+    elif output_format == "xlsx":
+        manifest = out_dir / "data.manifest.json"
+        remove_manifest_parts(manifest)
+        parts = write_xlsx_parts(chunks, out_dir / "data.xlsx", max_rows=max_rows, rollover=rollover)
+        out_path = write_manifest(parts, manifest)
+    else:
+        resolutions = datetime_resolutions(out_df)
+        out_path = _write_csv_output(chunks, out_dir, compression, max_rows, max_bytes, resolutions)
+    if rollups is not None:
+        write_rollup(rollups.cube(), out_dir / ROLLUP_FILENAME)
+    return out_path
 
 
-def main() -> None:
-    """CLI entry: merge from path and save CSV."""
+def _write_csv_output(
+    chunks,
+    out_dir: Path,
+    compression: str | None = None,
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+    resolutions: dict[str, str] | None = None,
+) -> Path:
+    """
+    Write data.csv, or numbered/compressed parts and return data.manifest.json.
+    resolutions as in write_csv_parts.
+    """
+    if not (compression or max_rows or max_bytes):
+        out_path = out_dir / "data.csv"
+        write_csv_parts(chunks, out_path, resolutions=resolutions)
+        return out_path
+    manifest = out_dir / "data.manifest.json"
+    remove_manifest_parts(manifest)
+    parts = write_csv_parts(
+        chunks,
+        out_dir / "data.csv",
+        compression=compression,
+        max_rows=max_rows,
+        max_bytes=max_bytes,
+        resolutions=resolutions,
+    )
+    return write_manifest(parts, manifest)
+
+
+def run_out_of_core_and_save(
+    input_path: str,
+    base_dir: str | None = None,
+    compression: str | None = None,
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+    rollup: bool = True,
+    memory_limit: str | None = None,
+    on_warning: Callable[[str], None] | None = None,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+) -> tuple[Path | None, dict]:
+    """
+    Merge the CSV files at input_path with DuckDB out of core (engines.duckdb_engine)
+    and write the output CSV (and rollup) as run_merge_and_save does, without holding
+    the merged rows in memory. memory_limit (e.g. "4GB") caps DuckDB; the rest spills
+    to disk. include / exclude as in merge_data. Returns (output path, or None if no
+    rows were merged; {"rows", "countries"}).
+    """
+    from .engines.duckdb_engine import duckdb_merge
+
+    if base_dir is None:
+        base_dir = _default_base_dir()
+    base = Path(base_dir)
+    files = resolve_input_files(input_path, base_dir, include=include, exclude=exclude)
+    with duckdb_merge(
+        files,
+        base_dir,
+        spill_dir=str(base / SPILL_DIR),
+        memory_limit=memory_limit,
+        on_warning=on_warning,
+    ) as (summary, chunks):
+        resolutions = summary.pop("resolutions")
+        if not summary["rows"]:
+            return None, summary
+        out_dir = base / OUTPUT_DIR
+        out_dir.mkdir(parents=True, exist_ok=True)
+        rollups = RollupBuilder() if rollup else None
+        if rollups is not None:
+            chunks = rollups.tee(chunks)
+        out_path = _write_csv_output(chunks, out_dir, compression, max_rows, max_bytes, resolutions)
+    if rollups is not None:
+        write_rollup(rollups.cube(), out_dir / ROLLUP_FILENAME)
+    return out_path, summary
+
+
+def _print_parts(out_path: Path | None) -> None:
+    """List the parts of a manifest output."""
+    if out_path is not None and out_path.suffix == ".json":
+        with open(out_path, encoding="utf-8") as f:
+            for part in json.load(f)["parts"]:
+                sheet = f" [{part['sheet']}]" if part.get("sheet") else ""
+                print(f"  {part['path']}{sheet}: {part['rows']:,} rows, {part['bytes']:,} bytes")
+
+
+def main(argv: list[str] | None = None, progress_callback: ProgressCallback | None = None) -> None:
+    """
+    CLI entry: merge from path and save CSV or Parquet.
+    argv defaults to sys.argv[1:]; progress_callback receives merge progress
+    (used by the local merge service to stream it to clients).
+    """
     import argparse
     parser = argparse.ArgumentParser(
         description="Merge CSV/Excel by country keywords (ID, SG, TH, MY)."
@@ -84,15 +481,399 @@ def main() -> None:
         "input",
         nargs="?",
         default=RAW_DATA_PATH,
-        help=f"Input CSV/Excel file or folder (default: {RAW_DATA_PATH})",
+        help=(
+            "Input CSV/Excel file or folder, searched with its subfolders; zip archives and "
+            f".gz/.bz2/.xz files are read without extracting (default: {RAW_DATA_PATH})"
+        ),
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=None,
+        metavar="GLOB",
+        help="Only merge inputs whose path under the input folder matches GLOB, e.g. '2024/*' or '*.csv.gz' (repeatable)",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=None,
+        metavar="GLOB",
+        help="Skip inputs whose path under the input folder matches GLOB (repeatable)",
+    )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help="Output format: csv (output/data.csv, default), parquet (output/data.parquet) or xlsx",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=[c for c in CSV_COMPRESSIONS if c],
+        default=None,
+        help="CSV only: compress output parts (zstd requires the zstandard package)",
+    )
+    parser.add_argument(
+        "--max-rows",
+        type=int,
+        default=None,
+        help="Start a new part (CSV file or XLSX sheet/file) after this many rows",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=None,
+        help="CSV only: start a new file once a part reaches this size on disk",
+    )
+    parser.add_argument(
+        "--rollover",
+        choices=("sheet", "file"),
+        default="sheet",
+        help="XLSX only: roll over to a new sheet (default) or a new file",
+    )
+    parser.add_argument(
+        "--partition-by",
+        default=None,
+        help=f"Parquet only: comma-separated partition columns, e.g. {','.join(PARTITION_COLUMNS)}",
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Upsert only new files into the local mention store, then write the output from the store",
+    )
+    parser.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        metavar="COLUMN=V1,V2",
+        help="With --store: only extract rows whose column has one of the values (repeatable)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only merge new or changed files into output/data.csv (manifest: output/data.incremental.json)",
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Run --incremental repeatedly, polling the input every SECONDS (Ctrl+C to stop)",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Drop duplicate mentions (same normalized URL, Date and Influencer) across files",
+    )
+    parser.add_argument(
+        "--sort-by",
+        default=None,
+        help="Comma-separated columns to order the output by, e.g. Date,Country,Brand (external sort)",
+    )
+    parser.add_argument(
+        "--aggregate-by",
+        default=None,
+        help="Comma-separated group columns, e.g. Brand,Quarter; writes output/data.aggregate.csv",
+    )
+    parser.add_argument(
+        "--max-rate",
+        action="append",
+        default=[],
+        metavar="METRIC=RATE",
+        help=(
+            "Fail (exit 1) when a quality metric's share of rows exceeds RATE (0-1); repeatable. "
+            f"Metrics: {', '.join(QUALITY_METRICS)}"
+        ),
+    )
+    parser.add_argument(
+        "--preview",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Only run the first N rows of each file through the pipeline; print tag counts and write output/data.preview.csv",
+    )
+    parser.add_argument(
+        "--sample",
+        action="store_true",
+        help="With --preview: use a random sample of N rows per file instead of the first N",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default=DEFAULT_ENGINE,
+        help="Execution engine for country assignment and the stages; polars uses all cores (requires polars)",
+    )
+    parser.add_argument(
+        "--stage-cache",
+        action="store_true",
+        help="Reuse stage outputs from earlier runs whose input columns and config are unchanged (output/.cache/stages)",
+    )
+    parser.add_argument(
+        "--out-of-core",
+        action="store_true",
+        help="Merge CSV inputs with DuckDB, spilling to disk, and write CSV output without loading all rows (requires duckdb)",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        default=None,
+        metavar="SIZE",
+        help="With --out-of-core: DuckDB memory limit, e.g. 4GB (default: DuckDB's, 80%% of RAM)",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run the local merge service: keep pandas, taggers and brand aliases loaded for --via-service clients",
+    )
+    parser.add_argument(
+        "--via-service",
+        action="store_true",
+        help="Forward this run to the local merge service (falls back to merging locally if none is running)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=MERGE_SERVICE_PORT,
+        help=f"Port of the local merge service (default: {MERGE_SERVICE_PORT})",
+    )
+    args = parser.parse_args(argv)
+    if args.serve:
+        from .service import serve
+
+        serve(port=args.port)
+        return
+    if args.via_service:
+        from .service import run_client
+
+        code = run_client(sys.argv[1:] if argv is None else list(argv))
+        if code is not None:
+            raise SystemExit(code)
+
+    def column_list(value: str | None) -> list[str] | None:
+        columns = [c.strip() for c in value.split(",") if c.strip()] if value else []
+        unknown = [c for c in columns if c not in OUTPUT_CSV_COLUMNS]
+        if unknown:
+            parser.error(f"Unknown output column(s): {', '.join(unknown)}")
+        return columns or None
+
+    partition_by = column_list(args.partition_by)
+    sort_by = column_list(args.sort_by)
+    aggregate_by = column_list(args.aggregate_by)
+    if partition_by and args.output_format != "parquet":
+        parser.error("--partition-by requires --format parquet")
+    if (args.compression or args.max_bytes) and args.output_format != "csv":
+        parser.error("--compression and --max-bytes require --format csv")
+    if args.max_rows and args.output_format == "parquet":
+        parser.error("--max-rows requires --format csv or xlsx")
+    filters: dict[str, list[str]] = {}
+    for clause in args.where:
+        col, sep, values = clause.partition("=")
+        if not sep or not col.strip():
+            parser.error(f"--where expects COLUMN=V1,V2, got {clause!r}")
+        filters[col.strip()] = [v.strip() for v in values.split(",") if v.strip()]
+    thresholds: dict[str, float] = {}
+    for clause in args.max_rate:
+        metric, sep, rate = clause.partition("=")
+        metric = metric.strip()
+        if not sep or metric not in QUALITY_METRICS:
+            parser.error(f"--max-rate expects METRIC=RATE with METRIC one of {', '.join(QUALITY_METRICS)}")
+        try:
+            thresholds[metric] = float(rate)
+        except ValueError:
+            parser.error(f"--max-rate: invalid rate {rate!r}")
+    if filters and not args.store:
+        parser.error("--where requires --store")
+    incremental = args.incremental or args.watch is not None
+    if thresholds and (args.store or args.incremental or args.watch is not None):
+        parser.error("--max-rate applies to full merges only (not --store or --incremental)")
+    if args.sample and args.preview is None:
+        parser.error("--sample requires --preview")
+    if args.preview is not None:
+        if args.preview < 1:
+            parser.error("--preview expects a positive row count")
+        if args.store or args.incremental or args.watch is not None or thresholds:
+            parser.error("--preview cannot be combined with --store, --incremental/--watch or --max-rate")
+    if args.dedupe and args.store:
+        parser.error("--store already keeps one row per URL and Date; --dedupe is not needed")
+    output_options = args.compression or args.max_rows or args.max_bytes or sort_by or aggregate_by
+    if incremental and (args.store or args.output_format != "csv" or output_options):
+        parser.error("--incremental/--watch write plain CSV and cannot be combined with --store or output options")
+    if args.stage_cache and (args.store or incremental or args.out_of_core or args.engine != DEFAULT_ENGINE):
+        parser.error("--stage-cache applies to full merges and previews with the pandas engine")
+    if args.memory_limit and not args.out_of_core:
+        parser.error("--memory-limit requires --out-of-core")
+    if args.out_of_core and (
+        args.store
+        or incremental
+        or args.preview is not None
+        or args.dedupe
+        or sort_by
+        or aggregate_by
+        or thresholds
+        or args.output_format != "csv"
+        or args.engine != DEFAULT_ENGINE
+    ):
+        parser.error(
+            "--out-of-core writes CSV (optionally compressed or split) and cannot be combined with "
+            "--store, --incremental/--watch, --preview, --dedupe, --sort-by, --aggregate-by, --max-rate, "
+            "--format or --engine"
+        )
     base = Path(__file__).resolve().parent.parent.parent
-    df = merge_data(args.input, base_dir=str(base))
+    if args.out_of_core:
+        out_path, summary = run_out_of_core_and_save(
+            args.input,
+            base_dir=str(base),
+            compression=args.compression,
+            max_rows=args.max_rows,
+            max_bytes=args.max_bytes,
+            memory_limit=args.memory_limit,
+            include=args.include,
+            exclude=args.exclude,
+        )
+        if out_path is None:
+            print("No data merged (no files or no rows matched keywords).")
+            return
+        print(f"Merged out of core: {summary['rows']} rows.")
+        print("\nRows per country:", summary["countries"])
+        print(f"\nSaved: {out_path}")
+        _print_parts(out_path)
+        return
+    if args.preview is not None:
+        df = merge_data(
+            args.input,
+            base_dir=str(base),
+            dedupe=args.dedupe,
+            profile=True,
+            nrows=args.preview,
+            sample=args.sample,
+            progress_callback=progress_callback,
+            engine=args.engine,
+            stage_cache=args.stage_cache,
+            include=args.include,
+            exclude=args.exclude,
+        )
+        if df.empty:
+            print("No data merged (no files or no rows matched keywords).")
+            return
+        how = "a random sample of" if args.sample else "the first"
+        print(f"Preview: {len(df):,} tagged rows from {how} {args.preview:,} rows of each file.")
+        for col, counts in tag_distributions(df).items():
+            print(f"\n{col}:")
+            for value, count in counts.items():
+                print(f"  {value or '(blank)'}: {count:,} ({count / len(df):.1%})")
+        print("\nQuality checks:")
+        for metric, stats in df.attrs["quality"]["metrics"].items():
+            print(f"  {metric}: {stats['count']:,} rows ({stats['rate']:.2%})")
+        out_dir = base / OUTPUT_DIR
+        out_dir.mkdir(parents=True, exist_ok=True)
+        preview_path = out_dir / PREVIEW_FILENAME
+        select_output_columns(df).to_csv(preview_path, index=False, encoding=OUTPUT_ENCODING)
+        print(f"\nPreview rows: {preview_path}")
+        return
+    if incremental:
+        from .incremental import run_incremental, watch_folder
+
+        def print_summary(summary: dict) -> None:
+            print(
+                f"{summary['files_added']} file(s) merged ({summary['files_changed']} changed), "
+                f"{summary['files_unchanged']} unchanged, {summary['files_removed']} removed, "
+                f"{summary['files_failed']} failed; +{summary['rows_appended']:,} / "
+                f"-{summary['rows_removed']:,} rows, {summary['rows_total']:,} in {summary['output']}"
+            )
+            for source_file, count in summary.get("duplicates", {}).items():
+                print(f"  {source_file}: {count:,} duplicate row(s) dropped")
+
+        if args.watch is None:
+            print_summary(
+                run_incremental(
+                    args.input,
+                    base_dir=str(base),
+                    dedupe=args.dedupe,
+                    engine=args.engine,
+                    include=args.include,
+                    exclude=args.exclude,
+                )
+            )
+            return
+        print(f"Watching {args.input} every {args.watch:g}s (Ctrl+C to stop)...")
+        try:
+            watch_folder(
+                args.input,
+                base_dir=str(base),
+                interval=args.watch,
+                on_update=print_summary,
+                dedupe=args.dedupe,
+                engine=args.engine,
+                include=args.include,
+                exclude=args.exclude,
+            )
+        except KeyboardInterrupt:
+            pass
+        return
+    if args.store:
+        from .store import open_store, query_store, sync_store
+
+        files = resolve_input_files(args.input, str(base), include=args.include, exclude=args.exclude)
+        summary = sync_store(files, base_dir=str(base), engine=args.engine)
+        print(
+            f"Store: {summary['files_new']} new file(s), {summary['files_seen']} already ingested, "
+            f"{summary['files_failed']} failed; {summary['rows_upserted']:,} rows upserted, "
+            f"{summary['rows_total']:,} stored."
+        )
+        conn = open_store(base_dir=str(base))
+        try:
+            df = query_store(conn, filters=filters)
+        except ValueError as e:
+            parser.error(str(e))
+        finally:
+            conn.close()
+    else:
+        df = merge_data(
+            args.input,
+            base_dir=str(base),
+            dedupe=args.dedupe,
+            profile=True,
+            progress_callback=progress_callback,
+            engine=args.engine,
+            stage_cache=args.stage_cache,
+            include=args.include,
+            exclude=args.exclude,
+        )
     if df.empty:
         print("No data merged (no files or no rows matched keywords).")
         return
-    out_csv = run_merge_and_save(args.input, base_dir=str(base), df=df)
+    out_path = run_merge_and_save(
+        args.input,
+        base_dir=str(base),
+        df=df,
+        output_format=args.output_format,
+        partition_by=partition_by,
+        compression=args.compression,
+        max_rows=args.max_rows,
+        max_bytes=args.max_bytes,
+        rollover=args.rollover,
+        sort_by=sort_by,
+        aggregate_by=aggregate_by,
+    )
     print(f"Merged DataFrame: {len(df)} rows.")
     print("\nRows per country:", df["Country"].value_counts().sort_index().to_dict())
-    print(f"\nSaved: {out_csv}")
+    if "duplicates" in df.attrs:
+        duplicates = df.attrs["duplicates"]
+        print(f"\nDuplicates dropped: {sum(duplicates.values()):,}")
+        for source_file, count in duplicates.items():
+            print(f"  {source_file}: {count:,}")
+    print(f"\nSaved: {out_path}")
+    if aggregate_by:
+        print(f"Aggregates: {out_path.parent / 'data.aggregate.csv'}")
+    quality = df.attrs.get("quality")
+    if quality is not None:
+        report_path = write_profile(quality, base / OUTPUT_DIR / QUALITY_REPORT_NAME)
+        print(f"Quality report: {report_path}")
+        for metric, stats in quality["metrics"].items():
+            print(f"  {metric}: {stats['count']:,} rows ({stats['rate']:.2%})")
+        failures = check_thresholds(quality, thresholds)
+        if failures:
+            print("\nQuality thresholds exceeded:")
+            for msg in failures:
+                print(f"  {msg}")
+            raise SystemExit(1)
+    _print_parts(out_path)
@@ -0,0 +1,24 @@
+"""Preview: the full merge pipeline over a bounded sample of each file.
+
+A preview reads only the first rows (or a reservoir sample) of every file and
+runs them through process_file and all stages, exactly as a full merge does,
+so country detection and Market / Media Type / Brand tagging can be checked in
+seconds before committing to a merge of the whole input.
+"""
+
+import pandas as pd
+
+from ._deps import SOURCE_FILE_COLUMN
+
+PREVIEW_ROWS = 1_000
+PREVIEW_FILENAME = "data.preview.csv"
+TAG_COLUMNS = (SOURCE_FILE_COLUMN, "Country", "Market", "Media Type", "Media Platform", "Brand")
+
+
+def tag_distributions(df: pd.DataFrame) -> dict[str, dict[str, int]]:
+    """Return, per tag column, the number of rows with each value (most frequent first; blank as "")."""
+    return {
+        col: {str(k): int(v) for k, v in df[col].fillna("").value_counts().items()}
+        for col in TAG_COLUMNS
+        if col in df.columns
+    }
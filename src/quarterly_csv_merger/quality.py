@@ -0,0 +1,151 @@
+"""Data-quality profile collected while the pipeline stages run.
+
+Each check is attached to the stage that produces the column it inspects and
+runs on that stage's output, so profiling adds no separate pass over the
+merged data. Counts are kept per stage, per source file and per country, and
+the profile is a plain dict that serializes straight to JSON.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from ._deps import ENGAGEMENT_COLS, MEDIA_PLATFORM_SOCIAL, SOURCE_FILE_COLUMN
+from .columns import find_column_by_pattern, find_columns_by_patterns
+
+QUALITY_REPORT_NAME = "data.quality.json"
+
+
+def _date_unparsed(df: pd.DataFrame) -> np.ndarray | None:
+    """Rows whose Date is missing or could not be parsed (NaT)."""
+    col = find_column_by_pattern(df, r"^date$")
+    return None if col is None else df[col].isna().to_numpy()
+
+
+def _equals_unknown(column: str) -> Callable[[pd.DataFrame], np.ndarray | None]:
+    """Rows where column was tagged "Unknown"."""
+
+    def check(df: pd.DataFrame) -> np.ndarray | None:
+        return None if column not in df.columns else (df[column] == "Unknown").to_numpy()
+
+    return check
+
+
+def _social_blank_influencer(df: pd.DataFrame) -> np.ndarray | None:
+    """Social-platform rows without an Influencer."""
+    if "Media Platform" not in df.columns:
+        return None
+    social = df["Media Platform"].isin(list(MEDIA_PLATFORM_SOCIAL.values()))
+    col = find_column_by_pattern(df, r"^influencer$")
+    if col is None:
+        return social.to_numpy()
+    blank = df[col].isna() | (df[col].astype(str).str.strip() == "")
+    return (social & blank).to_numpy()
+
+
+def _engagement_unparsed(df: pd.DataFrame) -> np.ndarray | None:
+    """Rows with an engagement value (likes, shares, ...) that is not a number."""
+    found = find_columns_by_patterns(df, ENGAGEMENT_COLS)
+    if not found:
+        return None
+    bad = np.zeros(len(df), dtype=bool)
+    for col in found:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values):
+            continue
+        present = values.notna() & (values.astype(str).str.strip() != "")
+        bad |= (present & pd.to_numeric(values, errors="coerce").isna()).to_numpy()
+    return bad
+
+
+# stage label -> [(metric, row mask function)], run on that stage's output.
+QUALITY_CHECKS: dict[str, list[tuple[str, Callable[[pd.DataFrame], np.ndarray | None]]]] = {
+    "Market": [("market_unknown", _equals_unknown("Market"))],
+    "Media Type": [("social_blank_influencer", _social_blank_influencer)],
+    "Date columns": [("date_unparsed", _date_unparsed)],
+    "Engagement": [("engagement_unparsed", _engagement_unparsed)],
+    "Brand": [("brand_unknown", _equals_unknown("Brand"))],
+}
+QUALITY_METRICS = tuple(metric for checks in QUALITY_CHECKS.values() for metric, _ in checks)
+
+
+def _counts_by(df: pd.DataFrame, column: str, mask: np.ndarray | None = None) -> dict[str, int]:
+    """Count rows (optionally only masked ones) per value of column."""
+    if column not in df.columns:
+        return {}
+    values = df[column] if mask is None else df.loc[mask, column]
+    return {str(k): int(v) for k, v in values.fillna("").value_counts().sort_index().items()}
+
+
+def new_profile() -> dict:
+    """Return an empty profile."""
+    return {"rows": 0, "files": {}, "countries": {}, "stages": [], "metrics": {}}
+
+
+def record_ingest(profile: dict, df: pd.DataFrame) -> None:
+    """Record the combined rows read from all files, before any stage."""
+    profile["rows_read"] = len(df)
+    profile["files_read"] = _counts_by(df, SOURCE_FILE_COLUMN)
+
+
+def record_stage(
+    profile: dict,
+    label: str,
+    rows_in: int,
+    df: pd.DataFrame,
+    seconds: float,
+    rows_out: int | None = None,
+) -> None:
+    """
+    Record a finished stage: rows in/out, time, and the checks attached to it.
+    rows_out defaults to len(df); engines that run the checks on the final frame pass it.
+    """
+    rows_out = len(df) if rows_out is None else rows_out
+    stage = {"stage": label, "rows_in": rows_in, "rows_out": rows_out, "seconds": round(seconds, 3), "issues": {}}
+    for metric, check in QUALITY_CHECKS.get(label, []):
+        mask = check(df)
+        if mask is None:
+            continue
+        count = int(mask.sum())
+        stage["issues"][metric] = count
+        profile["metrics"][metric] = {
+            "count": count,
+            "by_file": _counts_by(df, SOURCE_FILE_COLUMN, mask) if count else {},
+            "by_country": _counts_by(df, "Country", mask) if count else {},
+        }
+    profile["stages"].append(stage)
+
+
+def finish_profile(profile: dict, df: pd.DataFrame) -> dict:
+    """Add final row counts and rates (issue count / final rows); returns profile."""
+    profile["rows"] = len(df)
+    profile["files"] = _counts_by(df, SOURCE_FILE_COLUMN)
+    profile["countries"] = _counts_by(df, "Country")
+    for metric in profile["metrics"].values():
+        metric["rate"] = round(metric["count"] / len(df), 6) if len(df) else 0.0
+    return profile
+
+
+def check_thresholds(profile: dict, thresholds: dict[str, float]) -> list[str]:
+    """Return a message for each metric whose rate is above its threshold."""
+    failures = []
+    for metric, limit in thresholds.items():
+        rate = profile["metrics"].get(metric, {}).get("rate", 0.0)
+        if rate > limit:
+            failures.append(f"{metric}: {rate:.2%} of rows (limit {limit:.2%})")
+    return failures
+
+
+def write_profile(profile: dict, path: str | Path) -> Path:
+    """Write the profile as JSON (atomically) and return its path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,262 @@
+"""Local merge service: a warm process that runs CLI merges for thin clients.
+
+``--serve`` starts an HTTP server on the loopback interface that keeps pandas,
+every stage, the compiled taggers, the brand alias map and the reader profiles
+loaded. A CLI started with ``--via-service`` forwards its arguments to it and
+prints the streamed output and progress, so small merges skip interpreter and
+import start-up. Only the standard library is imported here, so the client
+side never loads pandas.
+
+Protocol: ``GET /health``; ``POST /cli`` with ``{"argv": [...]}`` answers with
+newline-delimited JSON events (``{"stdout": text}``, ``{"stderr": text}``,
+``{"progress": ratio, "message": text}``, and a final ``{"exit": code}``);
+``POST /shutdown`` stops the service. Runs are executed one at a time.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+
+try:
+    from ..constants import BRAND_JSON_FILENAME, MERGE_SERVICE_HOST, MERGE_SERVICE_PORT
+except ImportError:
+    from constants import BRAND_JSON_FILENAME, MERGE_SERVICE_HOST, MERGE_SERVICE_PORT
+
+# Arguments a forwarded run may not use: they would block the service or recurse.
+REJECTED_SERVICE_ARGS = ("--serve", "--watch", "--via-service")
+_PROGRESS_INTERVAL = 0.1
+_run_lock = threading.Lock()
+
+
+class _EventWriter(io.TextIOBase):
+    """Text stream that forwards complete lines as events of one kind."""
+
+    def __init__(self, send: Callable[[dict], None], kind: str):
+        self._send = send
+        self._kind = kind
+        self._buffer = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            self._send({self._kind: line + "\n"})
+        return len(text)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._send({self._kind: self._buffer})
+            self._buffer = ""
+
+
+def warm_up(base_dir: str | None = None) -> None:
+    """Import pandas and every stage, compile the taggers and load the brand alias map."""
+    from .pipeline import _default_base_dir
+    from .tagging.brand_resolver import load_brand_alias_map
+    from .tagging.media_platform_tagger import _get_owned_regex, _get_source_tag_patterns
+
+    load_brand_alias_map(Path(base_dir or _default_base_dir()) / BRAND_JSON_FILENAME)
+    _get_owned_regex()
+    _get_source_tag_patterns()
+
+
+def run_cli(argv: list[str], send: Callable[[dict], None]) -> int:
+    """Run the merger CLI in this process with argv, sending its output and progress as events."""
+    from ._deps import ReadAborted
+    from .pipeline import main
+
+    disconnected = threading.Event()
+
+    def safe_send(event: dict) -> None:
+        if disconnected.is_set():
+            return
+        try:
+            send(event)
+        except OSError:
+            disconnected.set()
+
+    last_sent = 0.0
+
+    def on_progress(ratio: float, msg: str) -> None:
+        nonlocal last_sent
+        if disconnected.is_set():
+            raise ReadAborted("Client disconnected.")
+        now = time.monotonic()
+        if ratio >= 1.0 or now - last_sent >= _PROGRESS_INTERVAL:
+            last_sent = now
+            safe_send({"progress": round(ratio, 4), "message": msg})
+
+    if not _run_lock.acquire(blocking=False):
+        safe_send({"progress": 0.0, "message": "Waiting for another merge to finish..."})
+        _run_lock.acquire()
+    out, err = _EventWriter(safe_send, "stdout"), _EventWriter(safe_send, "stderr")
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                main(argv, progress_callback=on_progress)
+                code = 0
+            except SystemExit as e:
+                if isinstance(e.code, str):
+                    print(e.code, file=sys.stderr)
+                code = e.code if isinstance(e.code, int) else int(e.code is not None)
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                code = 1
+            finally:
+                out.flush()
+                err.flush()
+    finally:
+        _run_lock.release()
+    return code
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves /health, /cli and /shutdown."""
+
+    server_version = "QuarterlyMergeService/1"
+
+    def log_message(self, format: str, *args) -> None:
+        # Runs redirect sys.stderr; the access log goes to the service's own stderr.
+        sys.__stderr__.write(f"{self.address_string()} - {format % args}\n")
+
+    def _send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_json(404, {"error": "Not found"})
+            return
+        self._send_json(
+            200,
+            {"status": "ok", "pid": os.getpid(), "started_at": self.server.started_at, "runs": self.server.runs},
+        )
+
+    def do_POST(self) -> None:
+        if self.path == "/shutdown":
+            self._send_json(200, {"status": "stopping"})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        if self.path != "/cli":
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            argv = body["argv"]
+            if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": 'Expected {"argv": [str, ...]}'})
+            return
+        rejected = [a for a in argv if a.split("=", 1)[0] in REJECTED_SERVICE_ARGS]
+        if rejected:
+            self._send_json(400, {"error": f"Not supported by the service: {', '.join(rejected)}"})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+
+        def send(event: dict) -> None:
+            self.wfile.write((json.dumps(event) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+        self.server.runs += 1
+        code = run_cli(argv, send)
+        with contextlib.suppress(OSError):
+            send({"exit": code})
+
+
+def serve(host: str = MERGE_SERVICE_HOST, port: int = MERGE_SERVICE_PORT, base_dir: str | None = None) -> None:
+    """Warm up, then serve CLI runs until interrupted or POST /shutdown."""
+    warm_up(base_dir)
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.started_at = time.time()
+    server.runs = 0
+    print(f"Merge service listening on http://{host}:{port} (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _service_port(argv: list[str]) -> int:
+    """Return the --port given in argv, or the default service port."""
+    for i, arg in enumerate(argv):
+        value = None
+        if arg == "--port" and i + 1 < len(argv):
+            value = argv[i + 1]
+        elif arg.startswith("--port="):
+            value = arg.split("=", 1)[1]
+        if value is not None:
+            try:
+                return int(value)
+            except ValueError:
+                break
+    return MERGE_SERVICE_PORT
+
+
+def run_client(argv: list[str], host: str = MERGE_SERVICE_HOST) -> int | None:
+    """
+    Forward CLI arguments (without --via-service) to a running service and print
+    its streamed output. Returns the exit code, or None when no service answers.
+    """
+    argv = [a for a in argv if a != "--via-service"]
+    url = f"http://{host}:{_service_port(argv)}"
+    try:
+        with urllib.request.urlopen(f"{url}/health", timeout=1.0) as resp:
+            json.load(resp)
+    except (OSError, ValueError):
+        print(f"Merge service not reachable at {url}; merging locally.", file=sys.stderr)
+        return None
+    request = urllib.request.Request(
+        f"{url}/cli",
+        data=json.dumps({"argv": argv}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    show_progress = sys.stderr.isatty()
+    code = 1
+    try:
+        with urllib.request.urlopen(request) as resp:
+            for line in resp:
+                event = json.loads(line)
+                if "progress" in event and show_progress:
+                    sys.stderr.write(f"\r\033[K{event['progress']:6.1%} {event['message']}")
+                    sys.stderr.flush()
+                    continue
+                if show_progress and ("stdout" in event or "stderr" in event or "exit" in event):
+                    sys.stderr.write("\r\033[K")
+                if "stdout" in event:
+                    sys.stdout.write(event["stdout"])
+                elif "stderr" in event:
+                    sys.stderr.write(event["stderr"])
+                elif "exit" in event:
+                    code = event["exit"]
+    except urllib.error.HTTPError as e:
+        print(f"Merge service: {json.load(e).get('error', e.reason)}", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # Our own stdout was closed (e.g. piped into head); dropping the connection cancels the run.
+        return 1
+    except OSError as e:
+        print(f"Merge service connection lost: {e}", file=sys.stderr)
+        return 1
+    return code
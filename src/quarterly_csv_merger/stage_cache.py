@@ -0,0 +1,186 @@
+"""On-disk cache of each stage's output, keyed by its input columns and config.
+
+A stage's key combines a fingerprint of the columns it reads (found with the
+stage's own column finders, plus the row index), the constants or files it
+depends on (e.g. brand.json for Brand, OWNED_ACCOUNTS for Media Type) and the
+source of its module. The entry holds what the stage changed: the kept row
+index and the columns it added or rewrote. A rerun therefore recomputes only
+the stages whose inputs or config changed; a stage reading a recomputed
+column (Media Type reads Media Platform) gets a new key and reruns too.
+Entries are pickles under STAGE_CACHE_DIR, evicted least recently used first
+above STAGE_CACHE_MAX_BYTES.
+"""
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from ._deps import (
+    BRAND_JSON_FILENAME,
+    ENGAGEMENT_COLS,
+    MARKET_BY_CODE,
+    MEDIA_PLATFORM_SOCIAL,
+    OWNED_ACCOUNTS,
+    STAGE_CACHE_DIR,
+    STAGE_CACHE_MAX_BYTES,
+)
+from .cleaning import drop_blank_url_rows
+from .columns import column_finder, find_column_by_pattern, find_columns_by_patterns, get_name_column
+from .tagging import add_brand_from_keywords, add_market_column, add_media_platform_column, add_media_type_column
+from .transforms import add_date_columns, set_engagement_from_sum
+
+# path -> (mtime_ns, digest) of module sources, so a run hashes each file once.
+_source_digests: dict[str, tuple[int, str]] = {}
+
+
+def _existing(df: pd.DataFrame, *columns: str | None) -> list[str]:
+    """The given columns that are in df (once each, in order)."""
+    return list(dict.fromkeys(c for c in columns if c is not None and c in df.columns))
+
+
+# Stage function -> the columns of a frame it reads. A stage that keeps an existing
+# output column when it has nothing to compute reads that column too.
+STAGE_INPUTS: dict[Callable, Callable[[pd.DataFrame], list[str]]] = {
+    drop_blank_url_rows: lambda df: _existing(df, find_column_by_pattern(df, r"url")),
+    add_market_column: lambda df: _existing(df, get_name_column(df)),
+    add_media_platform_column: lambda df: _existing(df, find_column_by_pattern(df, r"source")),
+    add_media_type_column: lambda df: _existing(
+        df, find_column_by_pattern(df, r"media\s*platform"), find_column_by_pattern(df, r"influencer")
+    ),
+    add_date_columns: lambda df: _existing(df, find_column_by_pattern(df, r"^date$")),
+    set_engagement_from_sum: lambda df: _existing(df, *find_columns_by_patterns(df, ENGAGEMENT_COLS), "Engagement"),
+    add_brand_from_keywords: lambda df: _existing(df, find_column_by_pattern(df, r"keyword"), "Brand"),
+}
+
+
+def _file_digest(path: Path) -> str:
+    """Content hash of a file ("" if it does not exist)."""
+    try:
+        return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+    except OSError:
+        return ""
+
+
+# Stage function -> (base_dir -> the config it depends on besides its code).
+STAGE_CONFIG: dict[Callable, Callable[[str], tuple]] = {
+    drop_blank_url_rows: lambda base_dir: (),
+    add_market_column: lambda base_dir: (MARKET_BY_CODE,),
+    add_media_platform_column: lambda base_dir: (MEDIA_PLATFORM_SOCIAL,),
+    add_media_type_column: lambda base_dir: (MEDIA_PLATFORM_SOCIAL, OWNED_ACCOUNTS),
+    add_date_columns: lambda base_dir: (),
+    set_engagement_from_sum: lambda base_dir: (ENGAGEMENT_COLS,),
+    add_brand_from_keywords: lambda base_dir: (_file_digest(Path(base_dir) / BRAND_JSON_FILENAME),),
+}
+
+
+def _code_version(fn: Callable) -> str:
+    """Hash of the sources of a stage's module and the column finders."""
+    h = hashlib.blake2b(digest_size=16)
+    for path in (sys.modules[fn.__module__].__file__, column_finder.__file__):
+        mtime = os.stat(path).st_mtime_ns
+        cached = _source_digests.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, _file_digest(Path(path)))
+            _source_digests[path] = cached
+        h.update(cached[1].encode())
+    return h.hexdigest()
+
+
+def _update_with_values(h, values) -> None:
+    """Feed the 64-bit hashes of values (a Series or Index) into h."""
+    h.update(pd.util.hash_pandas_object(values, index=False).to_numpy().tobytes())
+
+
+def stage_key(fn: Callable, df: pd.DataFrame, base_dir: str) -> str | None:
+    """Cache key of running stage fn on df, or None if fn is not cacheable or df cannot be hashed."""
+    if fn not in STAGE_INPUTS:
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{fn.__module__}.{fn.__name__}\0{_code_version(fn)}\0{STAGE_CONFIG[fn](base_dir)!r}".encode())
+    try:
+        _update_with_values(h, df.index)
+        for col in STAGE_INPUTS[fn](df):
+            values = df[col]
+            h.update(f"\0{col}\0{values.dtype}".encode())
+            _update_with_values(h, values)
+            if values.dtype == object:
+                # Hashing object values goes through str(), which 1 and "1" share.
+                _update_with_values(h, values.map(lambda v: type(v).__name__))
+    except TypeError:
+        return None
+    return h.hexdigest()
+
+
+def _entry_path(base_dir: str, key: str) -> Path:
+    return Path(base_dir) / STAGE_CACHE_DIR / f"{key}.pkl"
+
+
+def get_stage_output(base_dir: str, key: str | None, df: pd.DataFrame) -> pd.DataFrame | None:
+    """Return df as the cached stage left it, or None on a miss."""
+    if key is None:
+        return None
+    path = _entry_path(base_dir, key)
+    try:
+        entry = pd.read_pickle(path)
+        os.utime(path)
+    except (OSError, ValueError, EOFError):
+        return None
+    if entry["index"] is not None:
+        df = df.loc[entry["index"]]
+    df = df.copy()
+    for col in entry["data"].columns:
+        df[col] = entry["data"][col]
+    if list(df.columns) != entry["columns"]:
+        df = df[entry["columns"]]
+    return df
+
+
+def _changed(before: pd.Series, after: pd.Series) -> bool:
+    return before.dtype != after.dtype or not before.equals(after)
+
+
+def put_stage_output(base_dir: str, key: str | None, before: pd.DataFrame, after: pd.DataFrame) -> None:
+    """Cache what a stage changed from before to after, then evict down to the size limit."""
+    if key is None:
+        return
+    index = None
+    if not after.index.equals(before.index):
+        index = after.index
+        before = before.loc[index]
+    changed = [c for c in after.columns if c not in before.columns or _changed(before[c], after[c])]
+    entry = {"index": index, "columns": list(after.columns), "data": after[changed]}
+    path = _entry_path(base_dir, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        pd.to_pickle(entry, tmp)
+        os.replace(tmp, path)
+    except OSError:
+        return
+    evict_stage_cache(base_dir)
+
+
+def evict_stage_cache(base_dir: str, max_bytes: int = STAGE_CACHE_MAX_BYTES) -> None:
+    """Delete the least recently used entries until the cache fits in max_bytes."""
+    entries = []
+    for path in (Path(base_dir) / STAGE_CACHE_DIR).glob("*.pkl"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def clear_stage_cache(base_dir: str) -> None:
+    """Delete every cached stage output."""
+    evict_stage_cache(base_dir, max_bytes=-1)
@@ -0,0 +1,222 @@
+"""Persistent mention store: a local SQLite file upserted by normalized URL + Date.
+
+Each merged row is keyed by (normalize_url(URL), Date), so re-ingesting an
+export updates rows instead of duplicating them. Ingested files are recorded by
+content digest; later runs only merge files the store has not seen, and
+extracts become indexed queries instead of re-parsing every export.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from ._deps import MENTIONS_STORE_FILENAME, OUTPUT_CSV_COLUMNS, TableSource, content_digest, source_name
+from .cleaning import normalize_urls
+from .columns import select_output_columns
+from .engines import DEFAULT_ENGINE
+from .pipeline import ProgressCallback, _default_base_dir, merge_sources
+
+STORE_INDEX_COLUMNS = ("Country", "Quarter", "Brand", "Media Type")
+_INTEGER_COLUMNS = ("Day", "Year", "Quarter", "Engagement")
+_REAL_COLUMNS = ("Reach", "AVE")
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _quote(name: str) -> str:
+    """Quote an identifier for SQLite (output columns contain spaces)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _column_type(col: str) -> str:
+    """SQLite type for an output column."""
+    if col in _INTEGER_COLUMNS:
+        return "INTEGER"
+    if col in _REAL_COLUMNS:
+        return "REAL"
+    return "TEXT"
+
+
+def store_path(base_dir: str | None = None) -> Path:
+    """Return the default store location under base_dir."""
+    return Path(base_dir or _default_base_dir()) / MENTIONS_STORE_FILENAME
+
+
+def open_store(path: str | Path | None = None, base_dir: str | None = None) -> sqlite3.Connection:
+    """Open (creating if needed) the mention store and return a connection."""
+    path = Path(path) if path else store_path(base_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    columns = ",\n    ".join(f"{_quote(c)} {_column_type(c)}" for c in OUTPUT_CSV_COLUMNS)
+    with conn:
+        conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS mentions (
+    url_key TEXT NOT NULL,
+    date_key TEXT NOT NULL,
+    {columns},
+    PRIMARY KEY (url_key, date_key)
+)"""
+        )
+        for col in STORE_INDEX_COLUMNS:
+            name = "idx_mentions_" + col.lower().replace(" ", "_")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON mentions ({_quote(col)})")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS ingested_files (
+    digest TEXT PRIMARY KEY,
+    name TEXT,
+    rows INTEGER,
+    ingested_at REAL
+)"""
+        )
+    return conn
+
+
+def _store_rows(df: pd.DataFrame) -> list[tuple]:
+    """Return row tuples (url_key, date_key, *output columns) for rows with a URL."""
+    out = select_output_columns(df)
+    url_key = normalize_urls(out["URL"])
+    dates = pd.to_datetime(out["Date"], errors="coerce")
+    date_text = dates.dt.strftime(_DATE_FORMAT)
+    out = out.astype(object).where(out.notna(), None)
+    out["Date"] = date_text.where(dates.notna(), None)
+    keyed = url_key != ""
+    frame = pd.concat(
+        [url_key.rename("url_key"), date_text.fillna("").rename("date_key"), out],
+        axis=1,
+    )[keyed]
+    return list(frame.itertuples(index=False, name=None))
+
+
+def upsert_mentions(conn: sqlite3.Connection, df: pd.DataFrame) -> int:
+    """
+    Insert or update merged rows keyed by normalized URL + Date; the latest row wins.
+    Rows without a URL cannot be keyed and are left out. Returns rows written.
+    """
+    if df.empty:
+        return 0
+    rows = _store_rows(df)
+    names = ["url_key", "date_key", *OUTPUT_CSV_COLUMNS]
+    updates = ", ".join(f"{_quote(c)} = excluded.{_quote(c)}" for c in OUTPUT_CSV_COLUMNS)
+    sql = (
+        f"INSERT INTO mentions ({', '.join(_quote(c) for c in names)}) "
+        f"VALUES ({', '.join('?' * len(names))}) "
+        f"ON CONFLICT (url_key, date_key) DO UPDATE SET {updates}"
+    )
+    conn.executemany(sql, rows)
+    return len(rows)
+
+
+def ingested_digests(conn: sqlite3.Connection) -> set[str]:
+    """Return the content digests of all files already in the store."""
+    return {row[0] for row in conn.execute("SELECT digest FROM ingested_files")}
+
+
+def record_ingested(conn: sqlite3.Connection, digest: str, name: str, rows: int) -> None:
+    """Remember that a file (by content digest) has been ingested."""
+    conn.execute(
+        "INSERT OR REPLACE INTO ingested_files (digest, name, rows, ingested_at) VALUES (?, ?, ?, ?)",
+        (digest, name, rows, time.time()),
+    )
+
+
+def sync_store(
+    sources: list[TableSource],
+    base_dir: str | None = None,
+    names: list[str | None] | None = None,
+    path: str | Path | None = None,
+    progress_callback: ProgressCallback | None = None,
+    on_warning: Callable[[str], None] | None = None,
+    engine: str = DEFAULT_ENGINE,
+) -> dict:
+    """
+    Merge only the sources the store has not ingested yet and upsert their rows.
+    Each file is committed on its own, so an interrupted run keeps finished files.
+    engine selects the merge engine (see merge_sources).
+    Returns {"files_new", "files_seen", "files_failed", "rows_upserted", "rows_total"}.
+    """
+    if base_dir is None:
+        base_dir = _default_base_dir()
+    names = list(names) if names is not None else [None] * len(sources)
+    conn = open_store(path, base_dir=base_dir)
+    summary = {"files_new": 0, "files_seen": 0, "files_failed": 0, "rows_upserted": 0}
+    try:
+        seen = ingested_digests(conn)
+        pending = []
+        for source, name in zip(sources, names):
+            digest = content_digest(source)
+            if digest in seen:
+                summary["files_seen"] += 1
+            else:
+                seen.add(digest)
+                pending.append((source, name, digest))
+        for i, (source, name, digest) in enumerate(pending):
+            label = source_name(source, name)
+
+            def file_progress(ratio: float, msg: str, i: int = i) -> None:
+                if progress_callback is not None:
+                    progress_callback((i + ratio) / len(pending), msg)
+
+            warnings: list[str] = []
+            df = merge_sources(
+                [source],
+                base_dir=base_dir,
+                names=[name],
+                progress_callback=file_progress if progress_callback is not None else None,
+                on_warning=warnings.append,
+                engine=engine,
+            )
+            for msg in warnings:
+                if on_warning is None:
+                    print(f"Warning: {msg}")
+                else:
+                    on_warning(msg)
+            if df.empty and warnings:
+                summary["files_failed"] += 1
+                continue
+            with conn:
+                written = upsert_mentions(conn, df)
+                record_ingested(conn, digest, label, len(df))
+            summary["files_new"] += 1
+            summary["rows_upserted"] += written
+        summary["rows_total"] = conn.execute("SELECT COUNT(*) FROM mentions").fetchone()[0]
+    finally:
+        conn.close()
+    if progress_callback is not None:
+        progress_callback(1.0, "Done.")
+    return summary
+
+
+def query_store(
+    conn: sqlite3.Connection,
+    filters: dict[str, list] | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Return stored mentions ordered by Date. filters maps an output column to the
+    values to keep (indexed for Country, Quarter, Brand and Media Type).
+    """
+    columns = list(columns or OUTPUT_CSV_COLUMNS)
+    unknown = [c for c in [*columns, *(filters or {})] if c not in OUTPUT_CSV_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown store column(s): {', '.join(unknown)}")
+    where, params = [], []
+    for col, values in (filters or {}).items():
+        values = list(values)
+        if values:
+            where.append(f"{_quote(col)} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    sql = f"SELECT {', '.join(_quote(c) for c in columns)} FROM mentions"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY date_key, url_key"
+    df = pd.read_sql_query(sql, conn, params=params)
+    if "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"], format=_DATE_FORMAT, errors="coerce")
+    for col in _INTEGER_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    return df
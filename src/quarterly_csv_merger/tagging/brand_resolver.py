@@ -7,12 +7,28 @@ import pandas as pd
 from .._deps import BRAND_JSON_FILENAME
 from ..columns import build_keywords_dict
 
+# path -> ((mtime_ns, size), alias map); rebuilt when brand.json changes on disk.
+_alias_maps: dict[str, tuple[tuple[int, int], dict[str, str]]] = {}
+
 
 def load_brand_alias_map(brand_json_path: str | Path) -> dict[str, str]:
-    """Load brand JSON and build lowercase alias -> display name map; return {} if missing/invalid."""
+    """Return the lowercase alias -> display name map of a brand JSON (cached until the file changes)."""
     path = Path(brand_json_path)
-    if not path.exists():
+    try:
+        st = path.stat()
+    except OSError:
         return {}
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _alias_maps.get(str(path))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    alias_to_brand = _read_brand_alias_map(path)
+    _alias_maps[str(path)] = (signature, alias_to_brand)
+    return alias_to_brand
+
+
+def _read_brand_alias_map(path: Path) -> dict[str, str]:
+    """Load brand JSON and build lowercase alias -> display name map; return {} if invalid."""
     try:
         with open(path, encoding="utf-8") as f:
             data = json.load(f)
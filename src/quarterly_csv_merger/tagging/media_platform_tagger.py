@@ -7,14 +7,18 @@ from .._deps import MEDIA_PLATFORM_SOCIAL, OWNED_ACCOUNTS
 from ..columns import find_column_by_pattern
 
 _owned_regex: re.Pattern | None = None
+_source_tag_patterns: list[tuple[re.Pattern, str]] | None = None
 
 
 def _get_source_tag_patterns() -> list[tuple[re.Pattern, str]]:
-    """Return compiled regex patterns for source to Media Platform."""
-    return [
-        (re.compile(re.escape(tag), re.IGNORECASE), tag)
-        for tag in MEDIA_PLATFORM_SOCIAL.values()
-    ]
+    """Return compiled regex patterns for source to Media Platform (cached)."""
+    global _source_tag_patterns
+    if _source_tag_patterns is None:
+        _source_tag_patterns = [
+            (re.compile(re.escape(tag), re.IGNORECASE), tag)
+            for tag in MEDIA_PLATFORM_SOCIAL.values()
+        ]
+    return _source_tag_patterns
 
 
 def tag_source_by_regex(value) -> str:
@@ -1,6 +1,11 @@
 """Transforms: add or derive columns from existing data."""
 
-from .date_columns import add_date_columns
+from .date_columns import add_date_columns, detect_date_format, parse_dates
 from .engagement_sum import set_engagement_from_sum
 
-__all__ = ["add_date_columns", "set_engagement_from_sum"]
+__all__ = [
+    "add_date_columns",
+    "detect_date_format",
+    "parse_dates",
+    "set_engagement_from_sum",
+]
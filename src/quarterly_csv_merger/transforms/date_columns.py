@@ -4,14 +4,54 @@ import pandas as pd
 
 from ..columns import find_column_by_pattern
 
+# Explicit formats tried before falling back to per-value "mixed" parsing.
+DATE_FORMAT_CANDIDATES = (
+    "%d-%b-%Y %I:%M%p",
+    "%d-%b-%Y %I:%M %p",
+    "%d-%b-%Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y",
+)
+DATE_SAMPLE_SIZE = 200
 
-def add_date_columns(df: pd.DataFrame) -> pd.DataFrame:
+
+def detect_date_format(values: pd.Series) -> str | None:
+    """Return a format that parses a sample exactly like format="mixed", or None."""
+    sample = values.dropna().astype(str).head(DATE_SAMPLE_SIZE)
+    if sample.empty:
+        return None
+    expected = pd.to_datetime(sample, format="mixed", errors="coerce")
+    for fmt in DATE_FORMAT_CANDIDATES:
+        parsed = pd.to_datetime(sample, format=fmt, errors="coerce")
+        if parsed.notna().all() and parsed.equals(expected):
+            return fmt
+    return None
+
+
+def parse_dates(values: pd.Series, date_format: str | None = None) -> pd.Series:
+    """Parse dates with a known format in one pass; values it misses fall back to "mixed"."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if not date_format:
+        return pd.to_datetime(values, format="mixed", errors="coerce")
+    parsed = pd.to_datetime(values, format=date_format, errors="coerce")
+    missed = parsed.isna() & values.notna()
+    if missed.any():
+        parsed = parsed.fillna(pd.to_datetime(values[missed], format="mixed", errors="coerce"))
+    return parsed
+
+
+def add_date_columns(df: pd.DataFrame, date_format: str | None = None) -> pd.DataFrame:
     """Add Year, Quarter, Day, MonthName, Date (For Trendline) from Date column."""
     date_col = find_column_by_pattern(df, r"^date$")
     if date_col is None:
         return df
     df = df.copy()
-    df[date_col] = pd.to_datetime(df[date_col], format="mixed", errors="coerce")
+    df[date_col] = parse_dates(df[date_col], date_format)
     df["Year"] = df[date_col].dt.year
     df["Quarter"] = df[date_col].dt.quarter
     df["Day"] = df[date_col].dt.day
@@ -1,67 +1,267 @@
-"""CSV and Excel reading with encoding and separator handling."""
+"""CSV and Excel reading with encoding and separator handling.
 
+Every reader accepts a path, a bytes-like buffer, a file-like object (e.g. a
+Streamlit upload) or an ArchiveMember (a table in a zip/gz/bz2/xz archive); pass
+``name`` when the source has no filename of its own.
+"""
+
+import numpy as np
 import pandas as pd
 
+from .archives import ARCHIVE_SUFFIXES, ArchiveMember, archive_members, is_archive
+from .mapped import MAPPED_MIN_BYTES, read_csv_mapped
+from .profiles import (
+    PROFILE_SAMPLE_BYTES,
+    forget_profile,
+    get_profile,
+    header_fingerprint,
+    update_profile,
+)
+from .sources import (
+    ReadAborted,
+    ReadProgress,
+    TableSource,
+    content_digest,
+    is_path,
+    read_head,
+    source_name,
+    source_size,
+    source_stream,
+)
+from .transcode import TranscodeError, csv_stream, decode_head, sniff_encoding, sniff_separators
+
+SAMPLE_CHUNK_ROWS = 50_000
+MAPPED_SNIFF_ROWS = 1_000
+
+
+def detect_encoding(source: TableSource) -> str:
+    """Detect CSV encoding from BOM or UTF-16/UTF-32 byte pattern; default utf-8."""
+    return sniff_encoding(read_head(source, PROFILE_SAMPLE_BYTES)) or "utf-8"
+
+
+def _dialects(head: bytes) -> list[tuple[str, str]]:
+    """
+    Return (sep, encoding) pairs to try, most likely first. Encodings the first
+    bytes do not decode in are left out; the separator comes from the header line.
+    """
+    encodings = dict.fromkeys((sniff_encoding(head) or "utf-8", "utf-8-sig", "utf-8", "latin-1", "cp1252"))
+    texts = {enc: decode_head(head, enc) for enc in encodings}
+    valid = [enc for enc, text in texts.items() if text is not None]
+    seps = sniff_separators(texts[valid[0]] if valid else None)
+    return [(sep, encoding) for sep in seps for encoding in valid]
+
 
-def detect_encoding(path: str) -> str:
-    """Detect CSV encoding from BOM; default utf-8."""
+def _is_usable(df: pd.DataFrame | None) -> bool:
+    """Return True if a parse produced more than a single empty column."""
+    return df is not None and not (df.empty and len(df.columns) <= 1)
+
+
+def _read_with_profile(
+    source: TableSource,
+    profile: dict,
+    on_read: ReadProgress | None = None,
+    nrows: int | None = None,
+) -> pd.DataFrame | None:
+    """Single parse using a learned profile's dialect; None if the profile no longer fits."""
     try:
-        with open(path, "rb") as f:
-            raw = f.read(4)
-        if raw.startswith(b"\xff\xfe") or raw.startswith(b"\xfe\xff"):
-            return "utf-16"
-        if raw.startswith(b"\xef\xbb\xbf"):
-            return "utf-8-sig"
-        return "utf-8"
+        with csv_stream(source, profile["encoding"], on_read) as (f, encoding):
+            df = pd.read_csv(
+                f,
+                sep=profile["sep"],
+                encoding=encoding,
+                low_memory=False,
+                nrows=nrows,
+            )
+    except ReadAborted:
+        raise
     except Exception:
-        return "utf-8"
-
-
-def read_csv(path: str) -> pd.DataFrame:
-    """Read CSV with encoding and separator detection."""
-    enc = detect_encoding(path)
-    for sep in (",", "\t"):
-        for encoding in (enc, "utf-8-sig", "utf-8", "latin-1", "cp1252"):
-            try:
-                df = pd.read_csv(path, sep=sep, encoding=encoding, low_memory=False)
-                if df is not None and not (df.empty and len(df.columns) <= 1):
-                    return df
-            except Exception:
-                continue
+        return None
+    return df if _is_usable(df) else None
+
+
+def _read_csv_mapped(
+    source: TableSource,
+    fingerprint: str | None,
+    on_read: ReadProgress | None = None,
+    base_dir: str | None = None,
+) -> pd.DataFrame | None:
+    """Parallel parse of a large local CSV from a memory map; None when it cannot be used."""
+    profile = get_profile(fingerprint, base_dir)
+    if not (profile and profile.get("sep") and profile.get("encoding")):
+        # Detect the dialect on the first rows only; this learns the profile.
+        read_csv(source, nrows=MAPPED_SNIFF_ROWS, base_dir=base_dir)
+        profile = get_profile(fingerprint, base_dir)
+        if not (profile and profile.get("sep") and profile.get("encoding")):
+            return None
+    df = read_csv_mapped(source, profile["sep"], profile["encoding"], on_read=on_read)
+    if df is None or not _is_usable(df):
+        return None
+    df.attrs["ingest_fingerprint"] = fingerprint
+    return df
+
+
+def read_csv(
+    source: TableSource,
+    on_read: ReadProgress | None = None,
+    nrows: int | None = None,
+    base_dir: str | None = None,
+) -> pd.DataFrame:
+    """
+    Read CSV with encoding and separator detection (skipped for known export formats).
+    on_read(bytes_consumed) is called as the parser reads; it may raise ReadAborted.
+    nrows reads only the first rows. Known formats are the profiles of base_dir
+    (default: project root).
+    Local files of MAPPED_MIN_BYTES or more are parsed in parallel from a memory map.
+    """
+    head = read_head(source, PROFILE_SAMPLE_BYTES)
+    fingerprint = header_fingerprint(head)
+    if nrows is None and is_path(source) and (source_size(source) or 0) >= MAPPED_MIN_BYTES:
+        df = _read_csv_mapped(source, fingerprint, on_read, base_dir)
+        if df is not None:
+            return df
+    profile = get_profile(fingerprint, base_dir)
+    if profile and profile.get("sep") and profile.get("encoding"):
+        df = _read_with_profile(source, profile, on_read, nrows)
+        if df is not None:
+            df.attrs["ingest_fingerprint"] = fingerprint
+            return df
+        forget_profile(fingerprint, base_dir)
+
+    for sep, encoding in _dialects(head):
+        try:
+            with csv_stream(source, encoding, on_read) as (f, parse_encoding):
+                df = pd.read_csv(f, sep=sep, encoding=parse_encoding, low_memory=False, nrows=nrows)
+            if _is_usable(df):
+                update_profile(fingerprint, base_dir, sep=sep, encoding=encoding)
+                df.attrs["ingest_fingerprint"] = fingerprint
+                return df
+        except ReadAborted:
+            raise
+        except Exception:
+            continue
     try:
-        return pd.read_csv(path, encoding="utf-8", low_memory=False, on_bad_lines="skip")
+        with source_stream(source, on_read) as f:
+            return pd.read_csv(f, encoding="utf-8", low_memory=False, nrows=nrows, on_bad_lines="skip")
+    except ReadAborted:
+        raise
     except TypeError:
         try:
-            return pd.read_csv(path, encoding="utf-8", low_memory=False)
+            with source_stream(source, on_read) as f:
+                return pd.read_csv(f, encoding="utf-8", low_memory=False, nrows=nrows)
+        except ReadAborted:
+            raise
         except Exception as e:
             raise RuntimeError(f"Could not read CSV: {e}") from e
     except Exception as e:
         raise RuntimeError(f"Could not read CSV: {e}") from e
 
 
-def read_excel(path: str) -> pd.DataFrame:
-    """Read first sheet of Excel file (openpyxl or xlrd for .xls)."""
-    path_lower = path.lower()
+def read_excel(
+    source: TableSource,
+    name: str | None = None,
+    on_read: ReadProgress | None = None,
+    nrows: int | None = None,
+) -> pd.DataFrame:
+    """Read first sheet of Excel file (openpyxl or xlrd for .xls); nrows reads only the first rows."""
+    path_lower = source_name(source, name).lower()
+    if isinstance(source, ArchiveMember):
+        # Workbooks are read by random access, which a decompressing stream cannot do cheaply.
+        source = source.read_bytes()
     errors = []
-    if path_lower.endswith(".xls"):
+    engines = (["xlrd"] if path_lower.endswith(".xls") else []) + ["openpyxl", None]
+    for engine in engines:
         try:
-            return pd.read_excel(path, engine="xlrd")
+            with source_stream(source, on_read) as f:
+                return pd.read_excel(f, engine=engine, nrows=nrows)
+        except ReadAborted:
+            raise
         except Exception as e:
-            errors.append(f"xlrd: {e}")
-    try:
-        return pd.read_excel(path, engine="openpyxl")
-    except Exception as e:
-        errors.append(f"openpyxl: {e}")
-    try:
-        return pd.read_excel(path)
-    except Exception as e:
-        errors.append(f"default: {e}")
+            errors.append(f"{engine or 'default'}: {e}")
     raise RuntimeError("Could not read Excel: " + "; ".join(errors))
 
 
-def load_table(path: str) -> pd.DataFrame:
-    """Load file as CSV or Excel by extension."""
-    path_lower = path.lower()
+def reservoir_sample(chunks, rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Return a uniform random sample of rows rows from a stream of chunks (all rows
+    if there are fewer), in their original order. Holds at most rows rows plus one
+    chunk's picks at a time; the same seed gives the same sample.
+    """
+    rng = np.random.default_rng(seed)
+    slots = np.full(rows, -1, dtype=np.int64)
+    pool: pd.DataFrame | None = None
+    seen = 0
+    for chunk in chunks:
+        pos = np.arange(seen, seen + len(chunk), dtype=np.int64)
+        seen += len(chunk)
+        # Algorithm R: row i replaces a random slot with probability rows / (i + 1).
+        target = np.where(pos < rows, pos, rng.integers(0, pos + 1))
+        take = np.flatnonzero(target < rows)
+        if not len(take):
+            continue
+        # When several rows of the chunk land in one slot, the last one wins.
+        _, last = np.unique(target[take][::-1], return_index=True)
+        take = take[len(take) - 1 - last]
+        slots[target[take]] = pos[take]
+        picked = chunk.iloc[take].set_axis(pos[take])
+        pool = picked if pool is None else pd.concat([pool, picked])
+        pool = pool[pool.index.isin(slots)]
+    if pool is None:
+        return pd.DataFrame()
+    return pool.sort_index().reset_index(drop=True)
+
+
+def sample_csv(
+    source: TableSource,
+    rows: int,
+    seed: int = 0,
+    on_read: ReadProgress | None = None,
+    base_dir: str | None = None,
+) -> pd.DataFrame:
+    """
+    Read a reservoir sample of rows rows from a CSV in one streaming pass, using the
+    separator and encoding detected on its first rows.
+    """
+    head = read_csv(source, on_read=on_read, nrows=rows, base_dir=base_dir)
+    if len(head) < rows:
+        return head
+    fingerprint = head.attrs.get("ingest_fingerprint")
+    profile = get_profile(fingerprint, base_dir) or {}
+    try:
+        with csv_stream(source, profile.get("encoding", "utf-8"), on_read) as (f, encoding):
+            reader = pd.read_csv(
+                f,
+                sep=profile.get("sep", ","),
+                encoding=encoding,
+                low_memory=False,
+                chunksize=SAMPLE_CHUNK_ROWS,
+            )
+            df = reservoir_sample(reader, rows, seed)
+    except ReadAborted:
+        raise
+    except Exception:
+        return head
+    df.attrs["ingest_fingerprint"] = fingerprint
+    return df
+
+
+def load_table(
+    source: TableSource,
+    name: str | None = None,
+    on_read: ReadProgress | None = None,
+    nrows: int | None = None,
+    sample: bool = False,
+    base_dir: str | None = None,
+) -> pd.DataFrame:
+    """
+    Load file as CSV or Excel by extension (of ``name`` when given).
+    nrows reads only the first rows, or with sample a random sample of that many rows.
+    base_dir selects the CSV reader profiles (see read_csv).
+    """
+    path_lower = source_name(source, name).lower()
     if path_lower.endswith((".xlsx", ".xls")):
-        return read_excel(path)
-    return read_csv(path)
+        if sample and nrows is not None:
+            return reservoir_sample([read_excel(source, name=name, on_read=on_read)], nrows)
+        return read_excel(source, name=name, on_read=on_read, nrows=nrows)
+    if sample and nrows is not None:
+        return sample_csv(source, nrows, on_read=on_read, base_dir=base_dir)
+    return read_csv(source, on_read=on_read, nrows=nrows, base_dir=base_dir)
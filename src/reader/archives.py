@@ -0,0 +1,82 @@
+"""Compressed and archived sources: zip members and .gz/.bz2/.xz files, streamed.
+
+An ArchiveMember names one table inside a local archive. Every read opens a
+fresh decompressing stream, so nothing is extracted to disk and a parse costs
+one decompression pass (a rewind starts the stream over). Readers treat members
+like any other source; their name (the member path, or the file name without
+its compression suffix) drives extension and keyword detection.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+import zipfile
+import zlib
+from typing import BinaryIO
+
+# Single-file compression suffix -> opener.
+COMPRESSED_SUFFIXES = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+ARCHIVE_SUFFIXES = (".zip", *COMPRESSED_SUFFIXES)
+# What a corrupt or truncated archive raises while it is read; zipfile raises
+# NotImplementedError for an unsupported compression method (e.g. deflate64) and
+# RuntimeError for an encrypted member.
+ARCHIVE_ERRORS = (OSError, EOFError, zipfile.BadZipFile, zlib.error, lzma.LZMAError, NotImplementedError, RuntimeError)
+
+
+def is_archive(path: str) -> bool:
+    """Return True if path names a zip file or a .gz/.bz2/.xz compressed file."""
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+class ArchiveMember:
+    """A table in a local archive: a zip member, or the content of a .gz/.bz2/.xz file (member None)."""
+
+    def __init__(self, archive: str | os.PathLike, member: str | None = None, size: int | None = None):
+        self.archive = os.fspath(archive)
+        self.member = member
+        # Uncompressed size when the archive records it (zip), for read progress.
+        self.size = size
+
+    @property
+    def name(self) -> str:
+        if self.member is not None:
+            return self.member
+        return os.path.splitext(self.archive)[0]
+
+    def open(self) -> BinaryIO:
+        """Return a new decompressing stream over the table's bytes; the caller closes it."""
+        if self.member is None:
+            return COMPRESSED_SUFFIXES[os.path.splitext(self.archive)[1].lower()](self.archive, "rb")
+        zf = zipfile.ZipFile(self.archive)
+        try:
+            return zf.open(self.member)
+        finally:
+            # The member stream keeps the archive file open until it is closed.
+            zf.close()
+
+    def read_bytes(self) -> bytes:
+        """Return the whole decompressed table."""
+        with self.open() as f:
+            return f.read()
+
+    def __str__(self) -> str:
+        return self.archive if self.member is None else f"{self.archive}/{self.member}"
+
+    def __repr__(self) -> str:
+        return f"ArchiveMember({self.archive!r}, {self.member!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ArchiveMember) and (self.archive, self.member) == (other.archive, other.member)
+
+    def __hash__(self) -> int:
+        return hash((self.archive, self.member))
+
+
+def archive_members(path: str | os.PathLike) -> list[ArchiveMember]:
+    """Return the tables of an archive: every file member of a zip, or the single table of a compressed file."""
+    path = os.fspath(path)
+    if not path.lower().endswith(".zip"):
+        return [ArchiveMember(path)]
+    with zipfile.ZipFile(path) as zf:
+        return [ArchiveMember(path, info.filename, info.file_size) for info in zf.infolist() if not info.is_dir()]
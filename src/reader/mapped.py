@@ -0,0 +1,211 @@
+"""Memory-mapped, parallel parsing of one large local CSV.
+
+The file is mapped once and split into byte ranges that start on row
+boundaries; each range is parsed by pandas in its own thread (the C tokenizer
+releases the GIL) straight from the mapping, and the parts are concatenated.
+A boundary is a newline preceded by an even number of quote characters. That
+only holds for standard quoting, so the whole file is checked first (every
+opening quote starts a field, every closing quote ends one) and anything else
+is left to the regular reader, as are encodings in which a newline byte can
+occur inside a character.
+"""
+
+import io
+import mmap
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from .sources import ReadAborted, ReadProgress, TableSource, _MemoryviewReader
+
+MAPPED_MIN_BYTES = 64 << 20
+MAPPED_PART_BYTES = 16 << 20
+MAPPED_SCAN_BYTES = 16 << 20
+# Encodings where b"\n" and b'"' always stand for themselves.
+MAPPED_ENCODINGS = ("utf-8", "utf-8-sig", "latin-1", "cp1252")
+
+_QUOTE = ord('"')
+_LF = ord("\n")
+_CR = ord("\r")
+_BOM = b"\xef\xbb\xbf"
+
+
+def _row_boundaries(data: np.ndarray, sep: int, parts: int) -> list[int] | None:
+    """
+    Return part start offsets (0 first, len(data) last) at row boundaries near
+    equal splits, or None if the quoting is not standard (quote parity then
+    does not track the parser's quote state).
+    """
+    size = len(data)
+    start = len(_BOM) if data[: len(_BOM)].tobytes() == _BOM else 0
+    targets = [size * i // parts for i in range(1, parts)]
+    bounds = [0]
+    quotes = 0
+    for offset in range(0, size, MAPPED_SCAN_BYTES):
+        block = data[offset : offset + MAPPED_SCAN_BYTES]
+        q = np.flatnonzero(block == _QUOTE) + offset
+        if len(q):
+            opening = (quotes + np.arange(len(q))) % 2 == 0
+            before = data[np.maximum(q - 1, 0)]
+            after = data[np.minimum(q + 1, size - 1)]
+            starts_field = (before == sep) | (before == _LF) | (before == _CR) | (before == _QUOTE) | (q == start)
+            ends_field = (after == sep) | (after == _LF) | (after == _CR) | (after == _QUOTE) | (q == size - 1)
+            if not (starts_field[opening].all() and ends_field[~opening].all()):
+                return None
+        newlines = np.flatnonzero(block == _LF) + offset
+        outside = newlines[(quotes + np.searchsorted(q, newlines)) % 2 == 0]
+        quotes += len(q)
+        while targets and len(outside):
+            i = np.searchsorted(outside, max(targets[0], bounds[-1]))
+            if i == len(outside):
+                break
+            bounds.append(int(outside[i]) + 1)
+            targets.pop(0)
+    if quotes % 2:
+        return None
+    return sorted(set(b for b in bounds if b < size)) + [size]
+
+
+def _parse_part(
+    view: memoryview,
+    sep: str,
+    encoding: str,
+    dtype: dict | None,
+    columns: list | None,
+) -> pd.DataFrame:
+    """Parse one byte range; columns=None for the range holding the header."""
+    stream = io.BufferedReader(_MemoryviewReader(view), buffer_size=1 << 20)
+    if columns is None:
+        return pd.read_csv(stream, sep=sep, encoding=encoding, dtype=dtype, low_memory=False)
+    return pd.read_csv(
+        stream, sep=sep, encoding=encoding, dtype=dtype, low_memory=False, header=None, names=columns
+    )
+
+
+def _parse_ranges(
+    view: memoryview,
+    ranges: list[tuple[int, int]],
+    sep: str,
+    encoding: str,
+    dtype: dict | None,
+    columns: list,
+    workers: int,
+    on_read: ReadProgress | None,
+) -> list[pd.DataFrame] | None:
+    """Parse byte ranges on a thread pool, in order; None if any range fails to parse."""
+    frames: list[pd.DataFrame | None] = [None] * len(ranges)
+    done_bytes = 0
+    with ThreadPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        pending = {
+            pool.submit(_parse_part, view[start:stop], sep, encoding, dtype, None if start == 0 else columns): i
+            for i, (start, stop) in enumerate(ranges)
+        }
+        try:
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = pending.pop(future)
+                    frame = future.result()
+                    if not isinstance(frame.index, pd.RangeIndex) or list(frame.columns) != columns:
+                        # More fields than header names: pandas made an index of them.
+                        raise ValueError("Part does not match the header.")
+                    frames[i] = frame
+                    start, stop = ranges[i]
+                    done_bytes += stop - start
+                    if on_read is not None:
+                        on_read(done_bytes)
+        except ReadAborted:
+            pool.shutdown(cancel_futures=True)
+            raise
+        except Exception:
+            pool.shutdown(cancel_futures=True)
+            return None
+    return frames
+
+
+def _common_dtypes(frames: list[pd.DataFrame]) -> dict[str, str] | None:
+    """
+    For columns inferred differently across parts, return the dtype a single
+    parse of the whole file infers: float64 for int/float mixes, str when any
+    part holds text. None when that cannot be decided from the parts.
+    """
+    resolved = {}
+    for col in frames[0].columns:
+        dtypes = {f[col].dtype for f in frames}
+        if len(dtypes) == 1:
+            continue
+        if all(pd.api.types.is_integer_dtype(d) or pd.api.types.is_float_dtype(d) for d in dtypes):
+            resolved[col] = "float64"
+        elif any(isinstance(d, pd.StringDtype) for d in dtypes) and all(
+            isinstance(d, pd.StringDtype) or pd.api.types.is_numeric_dtype(d) for d in dtypes
+        ):
+            resolved[col] = "str"
+        else:
+            return None
+    return resolved
+
+
+def read_csv_mapped(
+    path: TableSource,
+    sep: str,
+    encoding: str,
+    dtypes: dict | None = None,
+    on_read: ReadProgress | None = None,
+    workers: int | None = None,
+) -> pd.DataFrame | None:
+    """
+    Parse a local CSV in parallel byte ranges of a memory map; the result equals a
+    single pd.read_csv with the same sep, encoding and dtypes. Returns None when the
+    file cannot be split safely (encoding, quoting, too few rows, a part that fails
+    to parse) or fewer than two workers are available (the split then only adds
+    work), so the caller falls back to the regular reader.
+    on_read(bytes_consumed) is called as parts finish; it may raise ReadAborted.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or encoding.lower() not in MAPPED_ENCODINGS or len(sep) != 1 or not sep.isascii():
+        return None
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return None
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mm)
+    try:
+        data = np.frombuffer(view, dtype=np.uint8)
+        parts = max(workers, -(-size // MAPPED_PART_BYTES))
+        bounds = _row_boundaries(data, ord(sep), parts)
+        del data
+        if bounds is None or len(bounds) < 3:
+            return None
+        try:
+            header = pd.read_csv(
+                io.BufferedReader(_MemoryviewReader(view[: bounds[1]])), sep=sep, encoding=encoding, nrows=0
+            )
+            columns = list(header.columns)
+            ranges = list(zip(bounds[:-1], bounds[1:]))
+            frames = _parse_ranges(view, ranges, sep, encoding, dtypes, columns, workers, on_read)
+            if frames is None:
+                return None
+            nonempty = [f for f in frames if len(f)] or frames[:1]
+            resolved = _common_dtypes(nonempty)
+            if resolved is None:
+                return None
+            if resolved:
+                redo = [i for i, f in enumerate(frames) if any(f[c].dtype != resolved[c] for c in resolved)]
+                typed = {**(dtypes or {}), **resolved}
+                again = _parse_ranges(view, [ranges[i] for i in redo], sep, encoding, typed, columns, workers, None)
+                if again is None:
+                    return None
+                for i, frame in zip(redo, again):
+                    frames[i] = frame
+            df = pd.concat(frames, ignore_index=True)
+        except ReadAborted:
+            raise
+        except Exception:
+            return None
+        return df
+    finally:
+        view.release()
+        mm.close()
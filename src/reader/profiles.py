@@ -0,0 +1,111 @@
+"""Learned ingest profiles: remember the dialect of each known export format.
+
+Exports from the same tool always share a header line, encoding, separator and
+date format. A profile is keyed by a hash of the header line (including any BOM),
+so later files with the same fingerprint skip detection entirely.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+try:
+    from ..constants import READER_PROFILES_FILENAME
+except ImportError:
+    from constants import READER_PROFILES_FILENAME
+
+PROFILE_SAMPLE_BYTES = 65536
+
+_lock = threading.Lock()
+# profiles file -> profiles, each loaded once per process
+_profiles: dict[Path, dict[str, dict]] = {}
+
+
+def _get_base_dir() -> str:
+    """Return project root directory."""
+    return str(Path(__file__).resolve().parent.parent.parent)
+
+
+def get_profiles_path(base_dir: str | None = None) -> Path:
+    """Return path to the reader profiles JSON file."""
+    root = base_dir if base_dir is not None else _get_base_dir()
+    return Path(root) / READER_PROFILES_FILENAME
+
+
+def header_fingerprint(head: bytes) -> str | None:
+    """Hash the header line (BOM and separators included); None if no full line in sample."""
+    if not head:
+        return None
+    end = head.find(b"\n")
+    if end < 0:
+        return None
+    return hashlib.blake2b(head[: end + 1], digest_size=16).hexdigest()
+
+
+def _load_profiles(path: Path) -> dict[str, dict]:
+    """Load the profiles at path once per process; {} if missing or invalid."""
+    profiles = _profiles.get(path)
+    if profiles is None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            data = {}
+        profiles = _profiles[path] = data if isinstance(data, dict) else {}
+    return profiles
+
+
+def _save_profiles(path: Path) -> None:
+    """Write profiles atomically; failures are ignored (profiles are only a cache)."""
+    profiles = _profiles.get(path)
+    if profiles is None:
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(profiles, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def get_profile(fingerprint: str | None, base_dir: str | None = None) -> dict | None:
+    """Return the learned profile for a fingerprint (in base_dir's profiles), or None if unknown."""
+    if not fingerprint:
+        return None
+    with _lock:
+        profile = _load_profiles(get_profiles_path(base_dir)).get(fingerprint)
+        return dict(profile) if isinstance(profile, dict) else None
+
+
+def update_profile(fingerprint: str | None, base_dir: str | None = None, **fields) -> None:
+    """Merge fields (encoding, sep, date_format, roles) into a profile and persist."""
+    if not fingerprint:
+        return
+    fields = {k: v for k, v in fields.items() if v is not None}
+    if not fields:
+        return
+    path = get_profiles_path(base_dir)
+    with _lock:
+        profiles = _load_profiles(path)
+        profile = profiles.get(fingerprint)
+        if not isinstance(profile, dict):
+            profile = {}
+        if all(profile.get(k) == v for k, v in fields.items()):
+            return
+        profile.update(fields)
+        profiles[fingerprint] = profile
+        _save_profiles(path)
+
+
+def forget_profile(fingerprint: str | None, base_dir: str | None = None) -> None:
+    """Drop a profile that no longer matches its files."""
+    if not fingerprint:
+        return
+    path = get_profiles_path(base_dir)
+    with _lock:
+        if _load_profiles(path).pop(fingerprint, None) is not None:
+            _save_profiles(path)
@@ -0,0 +1,195 @@
+"""Table sources: local paths, in-memory buffers, file-like objects and archive members.
+
+Buffers (bytes, memoryview, Streamlit uploads) are read through a memoryview, so
+parsing an upload never copies the whole payload or round-trips through a temp file.
+Archive members (see archives) are decompressed as they are read.
+"""
+
+import hashlib
+import io
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Iterator, Union
+
+from .archives import ARCHIVE_ERRORS, ArchiveMember
+
+TableSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO, ArchiveMember]
+# Called with the number of bytes of the current source consumed so far.
+ReadProgress = Callable[[int], None]
+
+
+class ReadAborted(Exception):
+    """Raised by a read-progress hook to stop a read in progress (e.g. a cancelled job)."""
+
+
+class _MemoryviewReader(io.RawIOBase):
+    """Seekable raw stream over a memoryview; reads copy only the requested slice."""
+
+    def __init__(self, view: memoryview):
+        self._view = view.cast("B") if view.ndim != 1 or view.format != "B" else view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = min(len(b), len(self._view) - self._pos)
+        if n <= 0:
+            return 0
+        b[:n] = self._view[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+class _ProgressReader(io.RawIOBase):
+    """Raw stream that reports its position to a hook after every read."""
+
+    def __init__(self, inner, on_read: ReadProgress):
+        self._inner = inner
+        self._on_read = on_read
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        data = self._inner.read(len(b))
+        n = len(data)
+        b[:n] = data
+        self._pos += n
+        self._on_read(self._pos)
+        return n
+
+
+def is_path(source: TableSource) -> bool:
+    """Return True if source is a filesystem path."""
+    return isinstance(source, (str, os.PathLike))
+
+
+def source_name(source: TableSource, name: str | None = None) -> str:
+    """Return the filename used for extension and keyword detection."""
+    if name:
+        return str(name)
+    if is_path(source):
+        return os.fspath(source)
+    return str(getattr(source, "name", "") or "")
+
+
+def _buffer_of(source: TableSource) -> memoryview | None:
+    """Return a zero-copy memoryview for bytes-like or BytesIO-like sources."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source)
+    getbuffer = getattr(source, "getbuffer", None)
+    if callable(getbuffer):
+        try:
+            return getbuffer()
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def open_owned(source: TableSource) -> BinaryIO | None:
+    """Return a new binary stream the caller must close for a path or archive member; None otherwise."""
+    if is_path(source):
+        return open(source, "rb")
+    if isinstance(source, ArchiveMember):
+        return source.open()
+    return None
+
+
+def open_source(source: TableSource):
+    """Return something pandas can read: the path itself, or a fresh stream at offset 0."""
+    if is_path(source):
+        return os.fspath(source)
+    if isinstance(source, ArchiveMember):
+        return source.open()
+    view = _buffer_of(source)
+    if view is not None:
+        return io.BufferedReader(_MemoryviewReader(view), buffer_size=1 << 20)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def source_size(source: TableSource) -> int | None:
+    """Return the size in bytes of a source, or None if unknown."""
+    try:
+        if is_path(source):
+            return os.path.getsize(source)
+        view = _buffer_of(source)
+        if view is not None:
+            return view.nbytes
+        size = getattr(source, "size", None)
+        return int(size) if size is not None else None
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+@contextmanager
+def source_stream(source: TableSource, on_read: ReadProgress | None = None) -> Iterator:
+    """
+    Yield a readable for pandas; with on_read, every read reports progress through it.
+    Paths without a hook are yielded as-is so pandas opens them natively.
+    """
+    if on_read is None and not isinstance(source, ArchiveMember):
+        yield open_source(source)
+        return
+    owned = open_owned(source)
+    inner = owned if owned is not None else open_source(source)
+    try:
+        yield inner if on_read is None else io.BufferedReader(_ProgressReader(inner, on_read), buffer_size=1 << 20)
+    finally:
+        if owned is not None:
+            owned.close()
+
+
+def read_head(source: TableSource, size: int) -> bytes:
+    """Return the first bytes of a source (b"" on failure)."""
+    try:
+        owned = open_owned(source)
+        if owned is not None:
+            with owned as f:
+                return f.read(size)
+        view = _buffer_of(source)
+        if view is not None:
+            return bytes(view[:size])
+        source.seek(0)
+        head = source.read(size)
+        source.seek(0)
+        return head
+    except (AttributeError, ValueError, *ARCHIVE_ERRORS):
+        return b""
+
+
+def content_digest(source: TableSource) -> str:
+    """Hash a source's full content (blake2b, hex; zero-copy for buffers, decompressed for archive members)."""
+    h = hashlib.blake2b(digest_size=16)
+    view = None if is_path(source) else _buffer_of(source)
+    if view is not None:
+        h.update(view)
+        return h.hexdigest()
+    f = open_owned(source) or source
+    try:
+        f.seek(0)
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    finally:
+        if f is not source:
+            f.close()
+        else:
+            f.seek(0)
+    return h.hexdigest()
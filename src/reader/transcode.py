@@ -0,0 +1,142 @@
+"""Incremental transcoding of UTF-16/UTF-32 and legacy-codepage CSVs to UTF-8.
+
+pandas parses UTF-8 bytes directly; any other encoding is decoded here in
+fixed-size blocks (strictly, so invalid bytes fail the read at the block where
+they occur) and re-encoded as UTF-8, holding one block at a time. The encoding
+and separator are sniffed once from the first bytes, so the retry loop starts
+with the right dialect instead of finding it by failed full parses.
+"""
+
+import codecs
+import io
+from contextlib import contextmanager
+from typing import Iterator
+
+from .sources import ReadProgress, TableSource, _ProgressReader, open_owned, open_source, source_stream
+
+TRANSCODE_BLOCK_BYTES = 1 << 20
+# Encodings pandas reads without a decoding layer.
+NATIVE_ENCODINGS = ("utf-8", "utf-8-sig")
+
+# Longest first: the UTF-32-LE BOM starts with the UTF-16-LE one.
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+class TranscodeError(ValueError):
+    """Raised when a source does not decode in the encoding it is read with."""
+
+
+def sniff_encoding(head: bytes) -> str | None:
+    """
+    Return the encoding given by a BOM, or UTF-16/UTF-32 (LE/BE) recognized by the
+    NUL bytes of mostly-ASCII text without a BOM; None if neither applies.
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    sample = head[: len(head) // 4 * 4]
+    if len(sample) < 8 or b"\x00" not in sample:
+        return None
+    # (encoding, code unit width, low byte position, positions that are NUL for ASCII)
+    for encoding, width, low, padding in (
+        ("utf-32-le", 4, 0, (2, 3)),
+        ("utf-32-be", 4, 3, (0, 1)),
+        ("utf-16-le", 2, 0, (1,)),
+        ("utf-16-be", 2, 1, (0,)),
+    ):
+        nul_ratio = [sample[i::width].count(0) * width / len(sample) for i in range(width)]
+        if nul_ratio[low] < 0.1 and all(nul_ratio[i] > 0.7 for i in padding):
+            return encoding
+    return None
+
+
+def decode_head(head: bytes, encoding: str) -> str | None:
+    """Decode the first bytes of a source (a cut-off last character is fine); None if invalid."""
+    try:
+        return codecs.getincrementaldecoder(encoding)("strict").decode(head)
+    except (UnicodeDecodeError, LookupError):
+        return None
+
+
+def sniff_separators(text: str | None) -> tuple[str, ...]:
+    """Return the separators to try, the one used more in the header line first."""
+    line = (text or "").split("\n", 1)[0]
+    return ("\t", ",") if line.count("\t") > line.count(",") else (",", "\t")
+
+
+def is_native(encoding: str) -> bool:
+    """Return True if pandas parses the encoding without transcoding."""
+    return codecs.lookup(encoding).name in NATIVE_ENCODINGS
+
+
+class TranscodingReader(io.RawIOBase):
+    """Raw UTF-8 stream over a binary stream in another encoding, decoded block by block."""
+
+    def __init__(self, inner, encoding: str, block_size: int = TRANSCODE_BLOCK_BYTES):
+        self._inner = inner
+        self._encoding = encoding
+        self._decoder = codecs.getincrementaldecoder(encoding)("strict")
+        self._block_size = block_size
+        self._out = bytearray()
+        self._consumed = 0
+        self._started = False
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self) -> None:
+        block = self._inner.read(self._block_size)
+        try:
+            text = self._decoder.decode(block, final=not block)
+        except UnicodeDecodeError as e:
+            raise TranscodeError(
+                f"Invalid {self._encoding} data near byte {self._consumed + e.start}: {e.reason}"
+            ) from e
+        self._consumed += len(block)
+        self._eof = not block
+        if not self._started and text:
+            # A BOM kept by an explicit-endianness codec is not part of the header.
+            text = text.removeprefix("\ufeff")
+            self._started = True
+        self._out += text.encode("utf-8")
+
+    def readinto(self, b) -> int:
+        while len(self._out) < len(b) and not self._eof:
+            self._fill()
+        n = min(len(b), len(self._out))
+        b[:n] = self._out[:n]
+        del self._out[:n]
+        return n
+
+
+@contextmanager
+def csv_stream(
+    source: TableSource,
+    encoding: str,
+    on_read: ReadProgress | None = None,
+) -> Iterator[tuple[object, str]]:
+    """
+    Yield (readable, encoding to parse it with) for pandas: native encodings are
+    read as-is, others through a TranscodingReader as UTF-8. on_read reports
+    bytes of the source itself.
+    """
+    if is_native(encoding):
+        with source_stream(source, on_read) as f:
+            yield f, encoding
+        return
+    owned = open_owned(source)
+    inner = owned if owned is not None else open_source(source)
+    if on_read is not None:
+        inner = _ProgressReader(inner, on_read)
+    try:
+        yield io.BufferedReader(TranscodingReader(inner, encoding), buffer_size=1 << 20), "utf-8"
+    finally:
+        if owned is not None:
+            owned.close()
@@ -0,0 +1,34 @@
+"""Merge results for the app: result cache, on-demand download files, paged preview, rollups."""
+
+from .cache import clear_results, get_result, keep_result, put_result, result_key, source_digest
+from .exports import EXPORT_FORMATS, export_path, get_export, remove_exports
+from .pager import (
+    PREVIEW_FILTER_COLUMNS,
+    PREVIEW_PAGE_SIZE,
+    build_preview_index,
+    drop_preview_index,
+    get_preview_index,
+    query_preview,
+)
+from .rollups import drop_rollup, get_rollup
+
+__all__ = [
+    "EXPORT_FORMATS",
+    "PREVIEW_FILTER_COLUMNS",
+    "PREVIEW_PAGE_SIZE",
+    "build_preview_index",
+    "drop_preview_index",
+    "drop_rollup",
+    "export_path",
+    "get_export",
+    "get_preview_index",
+    "clear_results",
+    "get_result",
+    "get_rollup",
+    "keep_result",
+    "put_result",
+    "query_preview",
+    "remove_exports",
+    "result_key",
+    "source_digest",
+]
@@ -0,0 +1,210 @@
+"""Merge result cache keyed by upload content, shared across reruns and sessions.
+
+Entries live in process memory up to a byte budget (least recently used first
+out) and expire after a TTL. Results too large for memory are spilled to disk;
+each put sweeps spilled results past the TTL, then the oldest ones above a disk
+budget, so results of sessions that never return do not pile up.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+try:
+    from ..constants import (
+        RESULT_CACHE_DIR,
+        RESULT_CACHE_DISK_MAX_BYTES,
+        RESULT_CACHE_MAX_BYTES,
+        RESULT_CACHE_SPILL_BYTES,
+        RESULT_CACHE_TTL_SECONDS,
+    )
+    from ..reader import TableSource, content_digest
+    from .exports import remove_exports
+    from .pager import drop_preview_index
+    from .rollups import drop_rollup
+except ImportError:
+    from constants import (
+        RESULT_CACHE_DIR,
+        RESULT_CACHE_DISK_MAX_BYTES,
+        RESULT_CACHE_MAX_BYTES,
+        RESULT_CACHE_SPILL_BYTES,
+        RESULT_CACHE_TTL_SECONDS,
+    )
+    from reader import TableSource, content_digest
+    from results.exports import remove_exports
+    from results.pager import drop_preview_index
+    from results.rollups import drop_rollup
+
+_lock = threading.Lock()
+# key -> {"df": DataFrame, "nbytes": int, "expires": float}
+_memory: "OrderedDict[str, dict]" = OrderedDict()
+_memory_bytes = 0
+# upload file_id -> content digest, so reruns do not rehash unchanged uploads;
+# least recently used first out past DIGEST_CACHE_SIZE
+DIGEST_CACHE_SIZE = 4096
+_digest_by_file_id: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _get_base_dir() -> str:
+    """Return project root directory."""
+    return str(Path(__file__).resolve().parent.parent.parent)
+
+
+def _spill_path(key: str) -> Path:
+    """Return on-disk location for a spilled result."""
+    return Path(_get_base_dir()) / RESULT_CACHE_DIR / f"{key}.pkl"
+
+
+def source_digest(source: TableSource) -> str:
+    """Hash a source's content (zero-copy for uploads; memoized by upload file_id)."""
+    file_id = getattr(source, "file_id", None)
+    if file_id:
+        with _lock:
+            digest = _digest_by_file_id.get(file_id)
+            if digest is not None:
+                _digest_by_file_id.move_to_end(file_id)
+                return digest
+    digest = content_digest(source)
+    if file_id:
+        with _lock:
+            _digest_by_file_id[file_id] = digest
+            _digest_by_file_id.move_to_end(file_id)
+            while len(_digest_by_file_id) > DIGEST_CACHE_SIZE:
+                _digest_by_file_id.popitem(last=False)
+    return digest
+
+
+def result_key(sources: Iterable[TableSource], *extra: str) -> str:
+    """Cache key from source content hashes (order-insensitive) and extra version tokens."""
+    h = hashlib.blake2b(digest_size=16)
+    for digest in sorted(source_digest(s) for s in sources):
+        h.update(digest.encode())
+    for token in extra:
+        h.update(b"\0" + str(token).encode())
+    return h.hexdigest()
+
+
+def _forget(key: str) -> None:
+    """Drop everything derived from a result (download files, preview index, rollup)."""
+    remove_exports(key)
+    drop_preview_index(key)
+    drop_rollup(key)
+
+
+def _evict_locked(now: float) -> None:
+    """Drop expired entries, then least recently used ones until under budget."""
+    global _memory_bytes
+    for key in [k for k, e in _memory.items() if e["expires"] <= now]:
+        _memory_bytes -= _memory.pop(key)["nbytes"]
+        _forget(key)
+    while _memory and _memory_bytes > RESULT_CACHE_MAX_BYTES:
+        key, entry = _memory.popitem(last=False)
+        _memory_bytes -= entry["nbytes"]
+        _forget(key)
+
+
+def _sweep_spilled(now: float) -> None:
+    """Delete spilled results past the TTL, then the oldest until under the disk budget."""
+    entries = []
+    for path in (Path(_get_base_dir()) / RESULT_CACHE_DIR).glob("*.pkl"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in sorted(entries):
+        if mtime + RESULT_CACHE_TTL_SECONDS > now and total <= RESULT_CACHE_DISK_MAX_BYTES:
+            break
+        path.unlink(missing_ok=True)
+        _forget(path.stem)
+        total -= size
+
+
+def get_result(key: str | None) -> pd.DataFrame | None:
+    """Return a cached result (memory first, then disk), or None if missing or expired."""
+    if not key:
+        return None
+    now = time.time()
+    with _lock:
+        _evict_locked(now)
+        entry = _memory.get(key)
+        if entry is not None:
+            _memory.move_to_end(key)
+            return entry["df"]
+    path = _spill_path(key)
+    try:
+        if path.stat().st_mtime + RESULT_CACHE_TTL_SECONDS <= now:
+            path.unlink(missing_ok=True)
+            _forget(key)
+            return None
+        return pd.read_pickle(path)
+    except (OSError, ValueError, EOFError):
+        return None
+
+
+def put_result(key: str | None, df: pd.DataFrame) -> None:
+    """Cache a result: in memory if small enough, otherwise spilled to disk."""
+    global _memory_bytes
+    if not key or df is None:
+        return
+    nbytes = int(df.memory_usage(deep=True).sum())
+    if nbytes > RESULT_CACHE_SPILL_BYTES:
+        path = _spill_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            df.to_pickle(tmp)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+    else:
+        with _lock:
+            old = _memory.pop(key, None)
+            if old is not None:
+                _memory_bytes -= old["nbytes"]
+            _memory[key] = {"df": df, "nbytes": nbytes, "expires": time.time() + RESULT_CACHE_TTL_SECONDS}
+            _memory_bytes += nbytes
+            _evict_locked(time.time())
+    _sweep_spilled(time.time())
+
+
+def keep_result(key: str | None, df: pd.DataFrame) -> None:
+    """
+    Re-cache df if its entry has been evicted, so what is built from it while it is
+    still shown (preview index, rollup, download files) is dropped with the entry.
+    """
+    if not key:
+        return
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return
+    try:
+        if _spill_path(key).stat().st_mtime + RESULT_CACHE_TTL_SECONDS > time.time():
+            return
+    except OSError:
+        pass
+    put_result(key, df)
+
+
+def clear_results() -> None:
+    """Drop every cached result from memory and disk."""
+    global _memory_bytes
+    with _lock:
+        keys = list(_memory)
+        _memory.clear()
+        _memory_bytes = 0
+    for key in keys:
+        _forget(key)
+    cache_dir = Path(_get_base_dir()) / RESULT_CACHE_DIR
+    if cache_dir.is_dir():
+        for p in cache_dir.glob("*.pkl"):
+            _forget(p.stem)
+            p.unlink(missing_ok=True)
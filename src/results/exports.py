@@ -0,0 +1,42 @@
+"""Download files generated once per result and format, then served from disk.
+
+Nothing is serialized until a format is requested; files are dropped together
+with their cached result.
+"""
+
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+try:
+    from ..constants import EXPORT_CACHE_DIR
+    from ..quarterly_csv_merger.output import EXPORT_FORMATS, write_table
+except ImportError:
+    from constants import EXPORT_CACHE_DIR
+    from quarterly_csv_merger.output import EXPORT_FORMATS, write_table
+
+
+def _get_base_dir() -> str:
+    """Return project root directory."""
+    return str(Path(__file__).resolve().parent.parent.parent)
+
+
+def export_path(key: str, fmt: str) -> Path:
+    """Return the on-disk location of a result's export in the given format."""
+    suffix = EXPORT_FORMATS[fmt][0]
+    return Path(_get_base_dir()) / EXPORT_CACHE_DIR / f"{key}{suffix}"
+
+
+def get_export(key: str, fmt: str, build_df: Callable[[], pd.DataFrame]) -> Path:
+    """Return the export file for (key, fmt), writing it from build_df() on first request."""
+    path = export_path(key, fmt)
+    if not path.exists():
+        write_table(build_df(), path, fmt)
+    return path
+
+
+def remove_exports(key: str) -> None:
+    """Delete every export of a result (called when the result is evicted)."""
+    for fmt in EXPORT_FORMATS:
+        export_path(key, fmt).unlink(missing_ok=True)
@@ -0,0 +1,118 @@
+"""Paged, filtered and sorted preview of a merged result without full-frame scans.
+
+An index is built once per result: for each filter column, category codes, the
+row positions in sorted order, and where each value's run of positions starts.
+A page request then touches only the positions of the selected values and the
+rows shown.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+PREVIEW_FILTER_COLUMNS = ("Country", "Market", "Brand", "Media Type", "Quarter")
+PREVIEW_PAGE_SIZE = 100
+
+_lock = threading.Lock()
+_indexes: dict[str, dict] = {}
+
+
+def build_preview_index(df: pd.DataFrame, columns=PREVIEW_FILTER_COLUMNS) -> dict:
+    """
+    Index the filter columns of df. Per column: "values" (sorted distinct values),
+    "order" (row positions sorted by value, stable), "starts" (offset of each value's
+    run in order; missing values sort last) and "rank" (each row's place in order).
+    """
+    index: dict = {"n_rows": len(df), "columns": {}}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        cat = pd.Categorical(df[col])
+        codes = cat.codes.astype(np.int64)
+        n_values = len(cat.categories)
+        codes[codes < 0] = n_values
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=n_values + 1)
+        starts = np.concatenate(([0], np.cumsum(counts)))
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        index["columns"][col] = {
+            "values": list(cat.categories),
+            "order": order,
+            "starts": starts,
+            "rank": rank,
+        }
+    return index
+
+
+def get_preview_index(key: str, df: pd.DataFrame) -> dict:
+    """Return the index for a result, building it on first use."""
+    with _lock:
+        index = _indexes.get(key)
+    if index is None or index["n_rows"] != len(df):
+        index = build_preview_index(df)
+        with _lock:
+            _indexes[key] = index
+    return index
+
+
+def drop_preview_index(key: str) -> None:
+    """Forget a result's index (called when the result is evicted)."""
+    with _lock:
+        _indexes.pop(key, None)
+
+
+def _positions_for(entry: dict, selected: list) -> np.ndarray:
+    """Return ascending row positions whose value is one of selected."""
+    lookup = {v: i for i, v in enumerate(entry["values"])}
+    runs = [
+        entry["order"][entry["starts"][lookup[v]] : entry["starts"][lookup[v] + 1]]
+        for v in selected
+        if v in lookup
+    ]
+    if not runs:
+        return np.empty(0, dtype=np.int64)
+    return runs[0] if len(runs) == 1 else np.sort(np.concatenate(runs))
+
+
+def query_preview(
+    df: pd.DataFrame,
+    index: dict,
+    filters: dict[str, list] | None = None,
+    sort_by: str | None = None,
+    descending: bool = False,
+    page: int = 0,
+    page_size: int = PREVIEW_PAGE_SIZE,
+) -> tuple[pd.DataFrame, int]:
+    """
+    Return (rows of the requested page, total matching rows).
+    filters maps an indexed column to the values to keep; empty selections are ignored.
+    """
+    columns = index["columns"]
+    positions: np.ndarray | None = None
+    for col, selected in (filters or {}).items():
+        if not selected or col not in columns:
+            continue
+        matched = _positions_for(columns[col], list(selected))
+        positions = matched if positions is None else np.intersect1d(positions, matched, assume_unique=True)
+
+    sort_entry = columns.get(sort_by) if sort_by else None
+    if positions is None:
+        total = index["n_rows"]
+        if sort_entry is not None:
+            order = sort_entry["order"]
+            if descending:
+                order = order[::-1]
+            page_positions = order[page * page_size : (page + 1) * page_size]
+        else:
+            start = page * page_size
+            page_positions = np.arange(start, min(start + page_size, total))
+    else:
+        total = len(positions)
+        if sort_entry is not None:
+            positions = positions[np.argsort(sort_entry["rank"][positions], kind="stable")]
+            if descending:
+                positions = positions[::-1]
+        page_positions = positions[page * page_size : (page + 1) * page_size]
+    return df.iloc[page_positions], total
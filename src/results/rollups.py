@@ -0,0 +1,36 @@
+"""Rollup cube per merged result, so the summary reads kilobytes, not the full frame."""
+
+import threading
+from typing import Callable
+
+import pandas as pd
+
+try:
+    from ..quarterly_csv_merger.output import build_rollup, iter_chunks
+except ImportError:
+    from quarterly_csv_merger.output import build_rollup, iter_chunks
+
+_lock = threading.Lock()
+_cubes: dict[str, pd.DataFrame] = {}
+
+
+def get_rollup(
+    key: str,
+    df: pd.DataFrame,
+    to_output: Callable[[pd.DataFrame], pd.DataFrame] | None = None,
+) -> pd.DataFrame:
+    """Return the rollup cube of a result, building it chunk by chunk on first use."""
+    with _lock:
+        cube = _cubes.get(key)
+    if cube is None:
+        chunks = iter_chunks(df)
+        cube = build_rollup(map(to_output, chunks) if to_output is not None else chunks)
+        with _lock:
+            _cubes[key] = cube
+    return cube
+
+
+def drop_rollup(key: str) -> None:
+    """Forget a result's cube (called when the result is evicted)."""
+    with _lock:
+        _cubes.pop(key, None)
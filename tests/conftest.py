@@ -0,0 +1,24 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.constants import BRAND_JSON_FILENAME  # noqa: E402
+
+
+@pytest.fixture
+def base_dir(tmp_path: Path) -> str:
+    """Scratch project folder with the repository's brand.json (outputs and profiles go here)."""
+    brand_json = tmp_path / BRAND_JSON_FILENAME
+    brand_json.parent.mkdir(parents=True)
+    shutil.copyfile(ROOT / BRAND_JSON_FILENAME, brand_json)
+    return str(tmp_path)
+
+
+def csv_bytes(*rows: str) -> bytes:
+    """CSV content from header and row lines."""
+    return ("\n".join(rows) + "\n").encode()
@@ -0,0 +1,50 @@
+"""Duplicate mentions (normalized URL + Date + Influencer) are dropped across files."""
+
+import numpy as np
+import pandas as pd
+
+from conftest import csv_bytes
+from src.quarterly_csv_merger import merge_sources
+from src.quarterly_csv_merger.cleaning import DuplicateIndex, drop_duplicate_mentions
+
+
+def test_index_marks_repeats_within_and_across_batches(tmp_path):
+    index = DuplicateIndex()
+    assert index.mark(np.array([1, 2, 1], dtype=np.uint64)).tolist() == [False, False, True]
+    assert index.mark(np.array([3, 2], dtype=np.uint64)).tolist() == [False, True]
+    assert len(index) == 3
+
+    path = tmp_path / "index.npz"
+    index.save(path, tag="3")
+    assert DuplicateIndex.load(path, tag="other") is None
+    loaded = DuplicateIndex.load(path, tag="3")
+    assert loaded.mark(np.array([3, 4], dtype=np.uint64)).tolist() == [True, False]
+
+
+def test_first_occurrence_is_kept():
+    df = pd.DataFrame(
+        {
+            "URL": ["http://www.a.com/1?utm_source=x", "https://a.com/1/", "https://a.com/1", "", " "],
+            "Date": pd.to_datetime(["2024-01-05 10:00"] * 3 + ["2024-01-05 00:00"] * 2),
+            "Influencer": ["Someone", " someone ", "other", "", ""],
+            "Source File": ["SG_a.csv", "SG_b.csv", "SG_b.csv", "SG_b.csv", "SG_b.csv"],
+        }
+    )
+    kept, report = drop_duplicate_mentions(df)
+    # Only the re-spelled URL with the same date and influencer is a duplicate;
+    # rows without a URL are never keyed.
+    assert kept["Influencer"].tolist() == ["Someone", "other", "", ""]
+    assert report == {"SG_b.csv": 1}
+
+
+def test_merge_sources_dedupe(base_dir):
+    header = "Date,URL,Name,Influencer"
+    sources = [
+        csv_bytes(header, "2024-01-05,http://a.com/1,SG test,x", "2024-01-06,http://a.com/2,SG test,x"),
+        csv_bytes(header, "2024-01-05,https://www.a.com/1/,SG test,X", "2024-01-07,http://a.com/3,SG test,x"),
+    ]
+    names = ["SG_a.csv", "SG_b.csv"]
+    assert len(merge_sources(sources, base_dir, names=names)) == 4
+    df = merge_sources(sources, base_dir, names=names, dedupe=True)
+    assert df["URL"].tolist() == ["http://a.com/1", "http://a.com/2", "http://a.com/3"]
+    assert df.attrs["duplicates"] == {"SG_b.csv": 1}
@@ -0,0 +1,67 @@
+"""The polars engine gives the pandas engine's frame and quality profile; the
+DuckDB out-of-core merge writes the pandas merge's output files."""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from conftest import ROOT, csv_bytes
+from src.constants import BRAND_JSON_FILENAME
+from src.quarterly_csv_merger import merge_data, run_merge_and_save, run_out_of_core_and_save
+from src.quarterly_csv_merger.output import ROLLUP_FILENAME
+
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from engines import _comparable, write_synthetic  # noqa: E402
+
+
+@pytest.fixture
+def input_dir(tmp_path: Path) -> Path:
+    """Messy synthetic exports plus files without a (text) name column."""
+    folder = tmp_path / "input"
+    folder.mkdir()
+    write_synthetic(folder, 2_000)
+    (folder / "SG_no_name.csv").write_bytes(csv_bytes("Date,URL,Source", "2024-01-05,http://a.com/1,news"))
+    (folder / "TH_numeric_name.csv").write_bytes(
+        csv_bytes("Date,URL,Input Name,Source", "2024-01-05,http://t.com/1,7,blog", "2024-01-06,http://t.com/2,8,blog")
+    )
+    return folder
+
+
+def test_polars_matches_pandas(base_dir, input_dir):
+    pytest.importorskip("polars")
+    expected = merge_data(str(input_dir), base_dir=base_dir, profile=True)
+    df = merge_data(str(input_dir), base_dir=base_dir, profile=True, engine="polars")
+    assert {"SG_no_name.csv", "TH_numeric_name.csv"} <= set(df["Source File"])
+    pd.testing.assert_frame_equal(expected, df)
+    assert _comparable(expected.attrs["quality"]) == _comparable(df.attrs["quality"])
+
+
+def _parts(manifest: Path) -> list[tuple]:
+    """Manifest parts without their folder (it differs by base_dir)."""
+    with open(manifest, encoding="utf-8") as f:
+        return [(Path(p["path"]).name, p["rows"], p["bytes"]) for p in json.load(f)["parts"]]
+
+
+@pytest.mark.parametrize("options", [{}, {"max_rows": 700}])
+def test_out_of_core_matches_pandas(base_dir, input_dir, tmp_path, options):
+    pytest.importorskip("duckdb")
+    out_of_core = tmp_path / "duckdb"
+    (out_of_core / BRAND_JSON_FILENAME).parent.mkdir(parents=True)
+    shutil.copyfile(ROOT / BRAND_JSON_FILENAME, out_of_core / BRAND_JSON_FILENAME)
+
+    expected = run_merge_and_save(str(input_dir), base_dir=base_dir, **options)
+    path, summary = run_out_of_core_and_save(str(input_dir), base_dir=str(out_of_core), **options)
+
+    assert summary["rows"] == len(merge_data(str(input_dir), base_dir=base_dir))
+    names = [p.name for p in sorted(expected.parent.iterdir()) if p.name.startswith("data.")]
+    assert ROLLUP_FILENAME in names and path.name in names
+    for name in names:
+        if name.endswith(".json"):
+            assert _parts(path.parent / name) == _parts(expected.parent / name)
+        else:
+            assert (path.parent / name).read_bytes() == (expected.parent / name).read_bytes(), name
@@ -0,0 +1,57 @@
+"""External sort and group-by give what pandas gives on the whole frame, spilled or not."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.quarterly_csv_merger.output import external_groupby, external_sort, iter_chunks
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 5_000
+    df = pd.DataFrame(
+        {
+            "Country": rng.choice(["Singapore", "Thailand", "Malaysia", None], n),
+            "Quarter": rng.integers(1, 5, n),
+            "Reach": rng.integers(0, 5, n).astype(float),
+            "URL": [f"http://a.com/{i}" for i in range(n)],
+        }
+    )
+    df.loc[rng.choice(n, 200, replace=False), "Reach"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("run_rows", [1_000, 100_000])  # spilled runs, in memory
+def test_external_sort_is_a_stable_sort(frame, tmp_path, ascending, run_rows):
+    by = ["Country", "Reach"]
+    chunks = external_sort(
+        iter_chunks(frame, 700), by, ascending=ascending, run_rows=run_rows, block_rows=300, spill_dir=str(tmp_path)
+    )
+    expected = frame.sort_values(by, ascending=ascending, kind="stable").reset_index(drop=True)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+    assert not list(tmp_path.iterdir())
+
+
+def test_external_sort_rejects_missing_columns(frame):
+    with pytest.raises(ValueError, match="missing column"):
+        list(external_sort(iter_chunks(frame), ["Brand"]))
+
+
+@pytest.mark.parametrize("memory_rows", [4, 1_000_000])  # partitioned to disk, in memory
+def test_external_groupby_matches_pandas(frame, tmp_path, memory_rows):
+    aggs = {"Mentions": ("URL", "size"), "Reach": ("Reach", "sum"), "Best": ("Reach", "max"), "Mean": ("Reach", "mean")}
+    result = external_groupby(
+        iter_chunks(frame, 700), ["Country", "Quarter"], aggs, memory_rows=memory_rows, partitions=4, spill_dir=str(tmp_path)
+    )
+    expected = (
+        frame.groupby(["Country", "Quarter"], dropna=False)
+        .agg(Mentions=("URL", "size"), Reach=("Reach", "sum"), Best=("Reach", "max"), Mean=("Reach", "mean"))
+        .reset_index()
+    )
+    expected["Quarter"] = expected["Quarter"].astype("Int64")
+    expected = expected.sort_values(["Country", "Quarter"], kind="stable").reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,72 @@
+"""Incremental merge: new files are appended, changed and removed files rewritten out."""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from conftest import csv_bytes
+from src.quarterly_csv_merger import run_incremental
+from src.quarterly_csv_merger.output import ROLLUP_FILENAME, read_rollup
+
+HEADER = "Date,URL,Name,Source"
+
+
+def _write(folder: Path, name: str, *urls: str) -> None:
+    path = folder / name
+    path.write_bytes(csv_bytes(HEADER, *(f"2024-01-05,{url},{name[:2]} test,news" for url in urls)))
+    # A later mtime even on coarse-grained filesystems.
+    stamp = path.stat().st_mtime_ns + 10**9 * (len(list(folder.iterdir())) + 1)
+    os.utime(path, ns=(stamp, stamp))
+
+
+def _urls(summary: dict) -> list[str]:
+    return pd.read_csv(summary["output"], encoding="utf-8-sig")["URL"].tolist()
+
+
+def _counts(summary: dict) -> tuple:
+    return tuple(summary[k] for k in ("files_added", "files_changed", "files_removed", "rows_appended", "rows_removed"))
+
+
+def test_append_change_and_remove(base_dir, tmp_path):
+    folder = tmp_path / "input"
+    folder.mkdir()
+    _write(folder, "SG_a.csv", "http://a.com/1", "http://a.com/2")
+    _write(folder, "TH_b.csv", "http://b.com/1")
+
+    summary = run_incremental(str(folder), base_dir=base_dir)
+    assert _counts(summary) == (2, 0, 0, 3, 0)
+    assert _urls(summary) == ["http://a.com/1", "http://a.com/2", "http://b.com/1"]
+
+    summary = run_incremental(str(folder), base_dir=base_dir)
+    assert _counts(summary) == (0, 0, 0, 0, 0) and summary["files_unchanged"] == 2
+
+    _write(folder, "MY_c.csv", "http://c.com/1")
+    summary = run_incremental(str(folder), base_dir=base_dir)
+    assert _counts(summary) == (1, 0, 0, 1, 0)
+    assert _urls(summary)[-1] == "http://c.com/1"
+
+    _write(folder, "SG_a.csv", "http://a.com/3")
+    summary = run_incremental(str(folder), base_dir=base_dir)
+    assert _counts(summary) == (1, 1, 0, 1, 2)
+    assert _urls(summary) == ["http://b.com/1", "http://c.com/1", "http://a.com/3"]
+
+    (folder / "TH_b.csv").unlink()
+    summary = run_incremental(str(folder), base_dir=base_dir)
+    assert _counts(summary) == (0, 0, 1, 0, 1)
+    assert _urls(summary) == ["http://c.com/1", "http://a.com/3"]
+    assert summary["rows_total"] == 2
+    cube = read_rollup(Path(summary["output"]).with_name(ROLLUP_FILENAME))
+    assert int(cube["Mentions"].sum()) == 2
+
+
+def test_dedupe_skips_mentions_already_in_the_output(base_dir, tmp_path):
+    folder = tmp_path / "input"
+    folder.mkdir()
+    _write(folder, "SG_a.csv", "http://a.com/1")
+    run_incremental(str(folder), base_dir=base_dir, dedupe=True)
+
+    _write(folder, "SG_b.csv", "http://a.com/1", "http://a.com/2")
+    summary = run_incremental(str(folder), base_dir=base_dir, dedupe=True)
+    assert summary["rows_appended"] == 1 and summary["duplicates"] == {"SG_b.csv": 1}
+    assert _urls(summary) == ["http://a.com/1", "http://a.com/2"]
@@ -0,0 +1,64 @@
+"""pipelined_ingest: a source that fails to read must not stall the sources after it."""
+
+import io
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.quarterly_csv_merger.ingest import pipelined_ingest  # noqa: E402
+
+
+class _ReadFailed(Exception):
+    pass
+
+
+class _Unreadable:
+    """An upload whose first read fails with an error read_head does not swallow."""
+
+    name = "SG_unreadable.csv"
+
+    def seek(self, *args):
+        raise _ReadFailed("unreadable")
+
+    read = seek
+
+
+def _run(sources: list, timeout: float = 30) -> list:
+    results: list = []
+
+    def consume() -> None:
+        results.extend(
+            pipelined_ingest(
+                sources,
+                [None] * len(sources),
+                lambda i, source, name: pd.read_csv(io.BytesIO(bytes(source))),
+                read_workers=2,
+                parse_workers=2,
+                prefetch_bytes=1 << 20,
+            )
+        )
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "pipelined_ingest hung after a failed read"
+    return results
+
+
+def test_failed_read_is_reported_and_later_sources_are_parsed():
+    sources = [b"a,b\n1,2\n", _Unreadable(), b"a,b\n3,4\n", b"a,b\n5,6\n"]
+    results = _run(sources)
+    assert [i for i, _, _ in results] == [0, 1, 2, 3]
+    _, df, error = results[1]
+    assert df is None and isinstance(error, _ReadFailed)
+    assert [df["a"].tolist() for i, df, error in results if i != 1] == [[1], [3], [5]]
+
+
+def test_first_source_failing_does_not_block_the_rest():
+    results = _run([_Unreadable(), b"a,b\n1,2\n", b"a,b\n3,4\n"])
+    assert isinstance(results[0][2], _ReadFailed)
+    assert [df["a"].tolist() for _, df, _ in results[1:]] == [[1], [3]]
@@ -0,0 +1,26 @@
+"""Reader profiles are learned in the merge's base_dir, not the repository's data/."""
+
+import json
+from pathlib import Path
+
+from conftest import ROOT, csv_bytes
+from src.constants import READER_PROFILES_FILENAME
+from src.quarterly_csv_merger import merge_data
+from src.reader.profiles import get_profiles_path
+
+
+def test_profiles_are_kept_under_base_dir(base_dir, tmp_path):
+    repo_profiles = ROOT / READER_PROFILES_FILENAME
+    before = repo_profiles.read_bytes() if repo_profiles.exists() else None
+    folder = tmp_path / "input"
+    folder.mkdir()
+    (folder / "SG_export.csv").write_bytes(csv_bytes("Date,URL,Name", "2024-01-05,http://a.com/1,SG test"))
+
+    df = merge_data(str(folder), base_dir=base_dir)
+
+    assert len(df) == 1
+    path = get_profiles_path(base_dir)
+    assert path == Path(base_dir) / READER_PROFILES_FILENAME
+    [profile] = json.loads(path.read_text(encoding="utf-8")).values()
+    assert profile["sep"] == "," and profile["roles"]["date"] == "Date"
+    assert (repo_profiles.read_bytes() if repo_profiles.exists() else None) == before
@@ -0,0 +1,23 @@
+"""The Source File label must not be mistaken for an input Source column."""
+
+import pytest
+
+from conftest import csv_bytes
+from src.quarterly_csv_merger import merge_sources
+
+# The first file has no Source column, so "Source File" comes first after concat.
+SOURCES = [
+    csv_bytes("Date,URL,Name,Keywords", "2024-01-05,http://a.com/1,SG test,CGS"),
+    csv_bytes("Date,URL,Source,Name,Keywords", "2024-01-06,http://b.com/2,Facebook,SG test,CGS"),
+]
+NAMES = ["SG_facebook_export.csv", "SG_news.csv"]
+
+
+@pytest.mark.parametrize("engine", ["pandas", "polars"])
+def test_media_tags_come_from_the_source_column(base_dir, engine):
+    if engine == "polars":
+        pytest.importorskip("polars")
+    df = merge_sources(SOURCES, base_dir, names=NAMES, engine=engine)
+    assert df["Source File"].tolist() == NAMES
+    assert df["Media Platform"].tolist() == ["News", "Facebook"]
+    assert df["Media Type"].tolist() == ["News", "Earned"]
@@ -0,0 +1,47 @@
+"""Mention store: rows are upserted by normalized URL + Date, files ingested once."""
+
+import pytest
+
+from conftest import csv_bytes
+from src.quarterly_csv_merger import open_store, query_store, sync_store
+from src.quarterly_csv_merger.cleaning.url_normalizer import normalize_url
+
+HEADER = "Date,URL,Name,Source,Reach"
+
+
+@pytest.mark.parametrize(
+    "url, key",
+    [
+        ("http://www.Example.com/a/?utm_source=x&b=2&fbclid=1&a=1#top", "https://example.com/a?a=1&b=2"),
+        ("example.com/a", "https://example.com/a"),
+        ("  HTTPS://EXAMPLE.com  ", "https://example.com"),
+        ("http://[::1", "http://[::1"),
+        ("", ""),
+        (None, ""),
+        (float("nan"), ""),
+    ],
+)
+def test_normalize_url(url, key):
+    assert normalize_url(url) == key
+
+
+def test_sync_store_upserts_by_url_key(base_dir):
+    first = csv_bytes(HEADER, "2024-01-05,http://www.a.com/1?utm_source=x,SG test,news,10")
+    # Same mention under another spelling of its URL, plus a new one.
+    second = csv_bytes(HEADER, "2024-01-05,https://a.com/1/,SG test,news,20", "2024-01-06,https://a.com/2,SG test,news,5")
+
+    summary = sync_store([first], base_dir, names=["SG_first.csv"])
+    assert (summary["files_new"], summary["rows_upserted"], summary["rows_total"]) == (1, 1, 1)
+
+    summary = sync_store([first, second], base_dir, names=["SG_first.csv", "SG_second.csv"])
+    assert (summary["files_seen"], summary["files_new"], summary["rows_total"]) == (1, 1, 2)
+
+    conn = open_store(base_dir=base_dir)
+    try:
+        df = query_store(conn, columns=["URL", "Reach"])
+        assert df["URL"].tolist() == ["https://a.com/1/", "https://a.com/2"]
+        assert df["Reach"].tolist() == [20, 5]
+        assert len(query_store(conn, filters={"Country": ["Singapore"]})) == 2
+        assert query_store(conn, filters={"Country": ["Thailand"]}).empty
+    finally:
+        conn.close()